@@ -1,10 +1,8 @@
 import os
 import threading
 import time
-import requests
-from flask import Flask, render_template, request, session, redirect, g
+from flask import Flask, render_template, request, session, redirect, g, current_app
 from flask_cors import CORS
-from flask_migrate import Migrate
 from flask_wtf.csrf import CSRFProtect, generate_csrf
 from flask_login import LoginManager
 from flask_compress import Compress  # Add compression
@@ -45,8 +43,22 @@ from .api.post_routes import post_routes
 from .api.comment_routes import comment_routes
 from .api.partnership_routes import partnership_routes
 from .api.contact_routes import contact_routes
-from .seeds import seed_commands
+from .counters import counter_commands
 from .config import Config
+from .utilities.user_cache import user_cache
+from .utilities.session_bootstrap import bootstrap_cache
+from .utilities.tag_catalog import tag_catalog, top_tags
+from .utilities.response_cache import response_cache, make_backend
+from .utilities.single_flight import single_flight
+from .utilities.password_hashing import password_hasher, HashingBusy, CURRENT_METHOD
+from .utilities.lazy_imports import LazyGroup, LazyCommand, warm_imports
+from .utilities.response_policy import (
+    response_policies,
+    csrf_cookie_needs_refresh,
+    SECURITY_HEADERS,
+)
+
+compress = Compress()
 
 
 def keep_render_alive():
@@ -54,6 +66,8 @@ def keep_render_alive():
     if os.environ.get("FLASK_ENV") == "production":
         render_url = os.environ.get("RENDER_EXTERNAL_URL")
         if render_url:
+            import requests
+
             while True:
                 try:
                     time.sleep(14 * 60)  # 14 minutes
@@ -63,6 +77,12 @@ def keep_render_alive():
                     print(f"Keep-alive ping failed: {e}")
 
 
+def _init_migrate():
+    from flask_migrate import Migrate
+
+    Migrate(current_app, db)
+
+
 def create_app(config_class=Config):
     """Application factory pattern for better testing and deployment"""
     app = Flask(__name__, static_folder="../react-vite/dist", static_url_path="/")
@@ -70,8 +90,9 @@ def create_app(config_class=Config):
     # Load configuration
     app.config.from_object(config_class)
 
-    # Enable compression for better performance
-    Compress(app)
+    # Enable compression for better performance. COMPRESS_REGISTER is off so
+    # after_request can skip endpoints whose policy opts out.
+    compress.init_app(app)
 
     # Trust proxy headers for production deployment
     if app.config.get("FLASK_ENV") == "production":
@@ -79,7 +100,17 @@ def create_app(config_class=Config):
 
     # Initialize extensions
     db.init_app(app)
-    Migrate(app, db)
+
+    # Flask-Migrate pulls in alembic, which only `flask db` needs, so web
+    # workers skip it and the db group sets it up when it's first used
+    app.cli.add_command(
+        LazyGroup(
+            "db",
+            "flask_migrate.cli:db",
+            help="Perform database migrations.",
+            on_load=_init_migrate,
+        )
+    )
     CORS(
         app,
         origins=[
@@ -96,13 +127,56 @@ def create_app(config_class=Config):
     login = LoginManager(app)
     login.login_view = "auth.unauthorized"
 
+    # Per-worker cache of user snapshots, so most requests skip the user query
+    user_cache.max_size = app.config["USER_CACHE_SIZE"]
+    user_cache.ttl = app.config["USER_CACHE_TTL"]
+    tag_catalog.check_interval = app.config["TAG_CATALOG_CHECK_INTERVAL"]
+    top_tags.ttl = app.config["POPULAR_TAGS_TTL"]
+    response_cache.configure(
+        make_backend(app.config, app.instance_path), app.config["CACHE_DEFAULT_TTL"]
+    )
+    single_flight.grace = app.config["SINGLE_FLIGHT_GRACE"]
+    single_flight.wait_timeout = app.config["SINGLE_FLIGHT_TIMEOUT"]
+
+    password_hasher.configure(
+        workers=app.config["PASSWORD_HASH_WORKERS"],
+        max_pending=app.config["PASSWORD_HASH_MAX_PENDING"],
+        timeout=app.config["PASSWORD_HASH_TIMEOUT"],
+        method=app.config["PASSWORD_HASH_METHOD"] or CURRENT_METHOD,
+    )
+
     @login.user_loader
     def load_user(id):
-        """User loader with minimal data fetching"""
-        return db.session.get(User, int(id))
+        """User loader served from the snapshot cache"""
+        return user_cache.get(int(id))
+
+    # Add seed commands. The seed package is CLI-only, so it's imported
+    # when a seed command runs rather than in every web worker.
+    app.cli.add_command(
+        LazyGroup("seed", "app.seeds:seed_commands", help="Seed and undo seed data")
+    )
+    app.cli.add_command(counter_commands)
 
-    # Add seed commands
-    app.cli.add_command(seed_commands)
+    # The benchmarks are CLI-only too
+    app.cli.add_command(
+        LazyGroup(
+            "bench", "app.benchmarks:bench_commands", help="Performance benchmarks"
+        )
+    )
+    app.cli.add_command(
+        LazyCommand(
+            "startup-profile",
+            "app.benchmarks:startup_profile",
+            help="Import and create_app time, broken down by module",
+        )
+    )
+
+    # With lazy imports off, pay for boto3, the OAuth stack and the seeds
+    # up front instead of on first use
+    if not app.config["LAZY_IMPORTS"]:
+        warm_imports()
+        with app.app_context():
+            _init_migrate()
 
     # Register blueprints with prefixes
     app.register_blueprint(auth_routes, url_prefix="/api/auth")
@@ -142,45 +216,40 @@ def create_app(config_class=Config):
 
     @app.after_request
     def after_request(response):
-        """Post-request optimizations and security headers"""
-        # CSRF token injection
-        response.set_cookie(
-            "csrf_token",
-            generate_csrf(),
-            secure=app.config.get("FLASK_ENV") == "production",
-            samesite="Strict" if app.config.get("FLASK_ENV") == "production" else "Lax",
-            httponly=True,
-            max_age=3600,  # 1 hour
-        )
+        """Apply the endpoint's response policy (see utilities/response_policy)"""
+        policy = response_policies.for_endpoint(request.endpoint)
+        production = app.config.get("FLASK_ENV") == "production"
+
+        # CSRF token injection, only when the cookie is missing or near expiry
+        if policy.csrf and csrf_cookie_needs_refresh(
+            request.cookies.get("csrf_token"),
+            app.config.get("WTF_CSRF_TIME_LIMIT", 3600),
+            app.config.get("CSRF_REFRESH_MARGIN", 300),
+        ):
+            response.set_cookie(
+                "csrf_token",
+                generate_csrf(),
+                secure=production,
+                samesite="Strict" if production else "Lax",
+                httponly=True,
+                max_age=3600,  # 1 hour
+            )
 
         # Security headers for production
-        if app.config.get("FLASK_ENV") == "production":
-            response.headers["X-Content-Type-Options"] = "nosniff"
-            response.headers["X-Frame-Options"] = "DENY"
-            response.headers["X-XSS-Protection"] = "1; mode=block"
-            response.headers["Strict-Transport-Security"] = (
-                "max-age=31536000; includeSubDomains"
-            )
+        if production and policy.security_headers:
+            response.headers.update(SECURITY_HEADERS)
 
-        # Enhanced caching headers
-        if request.endpoint == "static":
-            response.headers["Cache-Control"] = "public, max-age=31536000"  # 1 year
-        elif request.endpoint and "api" in request.endpoint:
-            # Different cache times for different endpoints
-            if "auth" in request.endpoint:
-                response.headers["Cache-Control"] = (
-                    "private, max-age=30"  # 30 seconds for auth
-                )
-            else:
-                response.headers["Cache-Control"] = (
-                    "private, max-age=60"  # 1 minute for other APIs
-                )
+        if policy.cache_control:
+            response.headers["Cache-Control"] = policy.cache_control
 
         # Add request timing header in development
         if hasattr(g, "start_time") and app.config.get("FLASK_ENV") != "production":
             duration = time.time() - g.start_time
             response.headers["X-Response-Time"] = f"{duration:.3f}s"
 
+        if policy.compress:
+            response = compress.after_request(response)
+
         return response
 
     # API documentation route
@@ -251,6 +320,16 @@ def create_app(config_class=Config):
         """Handle file upload size limit errors"""
         return {"errors": {"message": "File too large. Maximum size is 5MB."}}, 413
 
+    @app.errorhandler(HashingBusy)
+    def hashing_busy(e):
+        """Shed login/signup load when the password hashing pool is saturated"""
+        db.session.rollback()
+        return (
+            {"errors": {"message": "Server is busy. Please try again shortly."}},
+            503,
+            {"Retry-After": "1"},
+        )
+
     @app.errorhandler(429)
     def rate_limit_exceeded(e):
         """Handle rate limiting errors"""
@@ -268,6 +347,11 @@ def create_app(config_class=Config):
             return {
                 "status": "healthy",
                 "database": "connected",
+                "userCache": user_cache.stats(),
+                "bootstrapCache": bootstrap_cache.stats(),
+                "tagCatalog": tag_catalog.stats(),
+                "responseCache": response_cache.stats(),
+                "singleFlight": single_flight.stats(),
                 "timestamp": time.time(),
             }, 200
         except Exception as e:
@@ -1,19 +1,19 @@
-from flask import Blueprint, request, abort, redirect, session
-from app.models import User, db, Tag, Event, Attendance, Group, Membership, Post, Comment
+from flask import Blueprint, request, abort, redirect, session, current_app
+from app.models import User, db, Tag, Event, Attendance, Membership
 from app.forms import LoginForm
 from app.forms import SignUpForm
 from flask_login import current_user, login_user, logout_user, login_required
 from app.aws import get_unique_filename, upload_file_to_s3
+from app.utilities.user_similarity import refresh_user_similarity
+from app.utilities.session_bootstrap import build_bootstrap
+from app.utilities.google_oauth import (
+    OAuthNotConfigured,
+    make_flow,
+    verify_id_token,
+)
 from sqlalchemy.orm import selectinload, joinedload, load_only
-from sqlalchemy import func
 import os
 import pathlib
-import requests
-from google.oauth2 import id_token
-from google_auth_oauthlib.flow import Flow
-from pip._vendor import cachecontrol
-import google.auth.transport.requests
-from tempfile import NamedTemporaryFile
 import json
 
 auth_routes = Blueprint("auth", __name__)
@@ -24,83 +24,19 @@ def authenticate():
     """
     Authenticates a user with response handling.
     Returns 200 with user data for authenticated users, 200 with null for unauthenticated.
+
+    The body carries a "version" token. Passing it back as ?since=<version>
+    returns 304 when nothing changed, or only the changed sections.
     """
     if not current_user.is_authenticated:
         # Return structured response instead of 401 error
         return {"user": None, "authenticated": False}, 200
 
     try:
-        # Load user with ALL groups and events relationships
-        user = (
-            db.session.query(User)
-            .options(
-                # Load user tags
-                selectinload(User.users_tags).load_only("id", "name"),
-                # Load groups where user is a MEMBER
-                selectinload(User.memberships)
-                .joinedload(Membership.group)
-                .options(
-                    load_only(
-                        "id",
-                        "name",
-                        "about",
-                        "image",
-                        "city",
-                        "state",
-                        "type",
-                        "organizer_id",
-                    ),
-                    selectinload(Group.memberships).load_only("id"),  # For member count
-                ),
-                # Load groups where user is ORGANIZER
-                selectinload(User.groups).options(
-                    load_only(
-                        "id",
-                        "name",
-                        "about",
-                        "image",
-                        "city",
-                        "state",
-                        "type",
-                        "organizer_id",
-                    ),
-                    selectinload(Group.memberships).load_only("id"),  # For member count
-                ),
-                # Load events user is ATTENDING
-                selectinload(User.attendances)
-                .joinedload(Attendance.event)
-                .options(
-                    load_only(
-                        "id",
-                        "name",
-                        "description",
-                        "type",
-                        "capacity",
-                        "image",
-                        "start_date",
-                        "end_date",
-                        "group_id",
-                        "venue_id",
-                    ),
-                    # Load group info for each event
-                    joinedload(Event.groups).load_only("name"),
-                    # Load venue info for each event
-                    joinedload(Event.venues).load_only("address", "city", "state"),
-                    # Load attendee count
-                    selectinload(Event.attendances).load_only("id"),
-                ),
-            )
-            .filter(User.id == current_user.id)
-            .first()
-        )
-
-        if user:
-            return {
-                "user": user.to_dict_auth_with_complete_data(),
-                "authenticated": True,
-            }
-        else:
-            return {"user": None, "authenticated": False}, 200
+        status, body = build_bootstrap(current_user.id, request.args.get("since"))
+        if status == 304:
+            return "", 304
+        return body, status
 
     except Exception as e:
         print(f"Auth error: {str(e)}")
@@ -119,6 +55,12 @@ def login():
     if form.validate_on_submit():
         # Add the user to the session, we are logged in!
         user = User.query.filter(User.email == form.data["email"]).first()
+
+        # The password just verified, so re-hash it if the parameters moved on
+        if user.password_needs_rehash():
+            user.password = form.data["password"]
+            db.session.commit()
+
         login_user(user)
 
         # Return only essential data for login
@@ -135,6 +77,67 @@ def logout():
     return {"message": "User logged out"}
 
 
+@auth_routes.route("/oauth/login")
+def oauth_login():
+    """
+    Redirects to Google's sign-in page
+    """
+    try:
+        flow = make_flow()
+    except OAuthNotConfigured:
+        return {"errors": {"message": "Google sign-in is not configured"}}, 404
+
+    authorization_url, state = flow.authorization_url(prompt="select_account")
+    session["oauth_state"] = state
+    return redirect(authorization_url)
+
+
+@auth_routes.route("/oauth/callback")
+def oauth_callback():
+    """
+    Completes Google sign-in, creating the user on their first visit
+    """
+    state = session.pop("oauth_state", None)
+    if not state or request.args.get("state") != state:
+        return {"errors": {"message": "Invalid OAuth state"}}, 401
+
+    try:
+        flow = make_flow(state=state)
+        flow.fetch_token(authorization_response=request.url)
+        claims = verify_id_token(flow.credentials.id_token)
+    except OAuthNotConfigured:
+        return {"errors": {"message": "Google sign-in is not configured"}}, 404
+    except Exception as e:
+        print(f"OAuth error: {str(e)}")
+        return {"errors": {"message": "Google sign-in failed"}}, 401
+
+    if not claims.get("email") or not claims.get("email_verified"):
+        return {"errors": {"message": "Google account email is not verified"}}, 401
+
+    user = User.query.filter(User.email == claims["email"]).first()
+    if not user:
+        base_username = claims["email"].split("@")[0][:34]
+        username = base_username
+        suffix = 1
+        while User.query.filter(User.username == username).first():
+            suffix += 1
+            username = f"{base_username}{suffix}"
+
+        user = User(
+            first_name=(claims.get("given_name") or base_username)[:20],
+            last_name=(claims.get("family_name") or "")[:20],
+            username=username,
+            email=claims["email"],
+            password="OAUTH",
+            profile_image_url=(claims.get("picture") or "")[:500],
+        )
+        db.session.add(user)
+        db.session.commit()
+
+    login_user(user)
+    return redirect(current_app.config["OAUTH_SUCCESS_REDIRECT"])
+
+
 @auth_routes.route("/signup", methods=["POST"])
 def sign_up():
     """
@@ -180,6 +183,13 @@ def sign_up():
             user.users_tags = tags_to_add
 
         db.session.add(user)
+
+        if user.users_tags:
+            # Pair the new user with everyone sharing their tags
+            db.session.flush()
+            refresh_user_similarity(user.id)
+            Tag.adjust_user_counts([tag.id for tag in user.users_tags], 1)
+
         db.session.commit()
         login_user(user)
 
@@ -215,8 +225,8 @@ def get_profile():
                         "state",
                         "type",
                         "organizer_id",
+                        "member_count",
                     ),
-                    selectinload(Group.memberships).load_only("id"),  # For count
                 ),
                 # Load groups where user is ORGANIZER
                 selectinload(User.groups).options(
@@ -229,8 +239,8 @@ def get_profile():
                         "state",
                         "type",
                         "organizer_id",
+                        "member_count",
                     ),
-                    selectinload(Group.memberships).load_only("id"),  # For count
                 ),
                 # Load events user is ATTENDING
                 selectinload(User.attendances)
@@ -247,23 +257,22 @@ def get_profile():
                         "end_date",
                         "group_id",
                         "venue_id",
+                        "attendee_count",
                     ),
                     joinedload(Event.groups).load_only("id", "name"),
                     joinedload(Event.venues).load_only("address", "city", "state"),
-                    selectinload(Event.attendances).load_only("id"),  # For count
                 ),
-                # Load posts WITHOUT automatic comment loading to avoid N+1
-                selectinload(User.posts).options(
-                    load_only(
-                        "id",
-                        "title",
-                        "caption",
-                        "image",
-                        "creator",
-                        "created_at",
-                        "updated_at",
-                    ),
-                    selectinload(Post.post_likes).load_only("id"),  # For count
+                # Load posts WITHOUT likes/comments - counts come from counters
+                selectinload(User.posts).load_only(
+                    "id",
+                    "title",
+                    "caption",
+                    "image",
+                    "creator",
+                    "like_count",
+                    "comment_count",
+                    "created_at",
+                    "updated_at",
                 ),
                 # Load recent comments (limited for performance)
                 selectinload(User.user_comments).load_only(
@@ -281,42 +290,8 @@ def get_profile():
         )
 
         if user:
-            # Get comment counts for all user's posts in a single query
-            post_ids = [post.id for post in user.posts]
-            comment_counts = {}
-
-            if post_ids:
-                # Efficient bulk query for comment counts
-                comment_count_results = (
-                    db.session.query(
-                        Comment.post_id, func.count(Comment.id).label("comment_count")
-                    )
-                    .filter(Comment.post_id.in_(post_ids))
-                    .group_by(Comment.post_id)
-                    .all()
-                )
-
-                comment_counts = {
-                    result.post_id: result.comment_count
-                    for result in comment_count_results
-                }
-
-            # Create the profile dict with post data
-            profile_data = user.to_dict_profile()
-
-            # Posts with comment counts
-            if "posts" in profile_data and profile_data["posts"]:
-                for post_data in profile_data["posts"]:
-                    post_id = post_data.get("id")
-                    if post_id:
-                        comment_count = comment_counts.get(post_id, 0)
-                        # Add the comment count to each post
-                        post_data["comments"] = comment_counts.get(post_id, 0)
-                        post_data["numComments"] = (
-                            comment_count  # For backward compatibility
-                        )
-
-            return profile_data
+            # Post like/comment counts are read from the counter columns
+            return user.to_dict_profile()
 
     return {"errors": {"message": "Unauthorized"}}, 401
 
@@ -1,8 +1,14 @@
 from flask import Blueprint, request, abort, jsonify
 from flask_login import login_required, current_user
 from app.models import db, User, Post, Likes, Comment, CommentLike
-from sqlalchemy.orm import joinedload, selectinload
-from sqlalchemy import and_, desc, func, text
+from app.utilities.comment_threads import (
+    comment_load_options,
+    load_reply_windows,
+    serialize_comment_thread,
+)
+from app.utilities.pagination import cursor_paginate
+from sqlalchemy.orm import joinedload
+from sqlalchemy import and_, desc, text
 import logging
 
 comment_routes = Blueprint("comments", __name__)
@@ -22,7 +28,6 @@ def get_comment(commentId):
                 joinedload(Comment.commenter).load_only(
                     "id", "username", "first_name", "last_name", "profile_image_url"
                 ),
-                selectinload(Comment.comment_likes),
             )
             .filter(Comment.id == commentId)
             .first()
@@ -42,6 +47,9 @@ def get_comment(commentId):
 def get_comment_replies(commentId):
     """
     Get replies to a specific comment with pagination and threading
+
+    Pass ?cursor= (a moreRepliesCursor from the comments endpoint, or empty
+    for the first page) to continue a reply list by cursor instead of page.
     """
     try:
         page = request.args.get("page", 1, type=int)
@@ -53,22 +61,49 @@ def get_comment_replies(commentId):
 
         replies_query = (
             db.session.query(Comment)
-            .options(
-                joinedload(Comment.commenter).load_only(
-                    "id", "username", "first_name", "last_name", "profile_image_url"
-                ),
-                selectinload(Comment.comment_likes),
-            )
+            .options(*comment_load_options())
             .filter(Comment.parent_id == commentId)
-            .order_by(Comment.created_at.asc())
         )
 
-        replies = replies_query.paginate(page=page, per_page=per_page, error_out=False)
+        # Cursor mode: oldest first, seeking past the last reply already shown
+        if "cursor" in request.args:
+            try:
+                replies = cursor_paginate(
+                    replies_query,
+                    Comment,
+                    request.args.get("cursor"),
+                    per_page,
+                    descending=False,
+                )
+            except ValueError:
+                return jsonify({"errors": {"message": "Invalid cursor"}}), 400
+
+            liked_comment_ids = CommentLike.liked_comment_ids(
+                current_user.id, [reply.id for reply in replies.items]
+            )
+
+            return jsonify(
+                {
+                    "replies": [
+                        reply.to_dict_with_likes(liked_comment_ids=liked_comment_ids)
+                        for reply in replies.items
+                    ],
+                    "pagination": replies.pagination(),
+                }
+            )
+
+        replies = replies_query.order_by(Comment.created_at.asc()).paginate(
+            page=page, per_page=per_page, error_out=False
+        )
+
+        liked_comment_ids = CommentLike.liked_comment_ids(
+            current_user.id, [reply.id for reply in replies.items]
+        )
 
         return jsonify(
             {
                 "replies": [
-                    reply.to_dict_with_likes(current_user_id=current_user.id)
+                    reply.to_dict_with_likes(liked_comment_ids=liked_comment_ids)
                     for reply in replies.items
                 ],
                 "pagination": {
@@ -125,7 +160,6 @@ def edit_comment(commentId):
                 joinedload(Comment.commenter).load_only(
                     "id", "username", "first_name", "last_name", "profile_image_url"
                 ),
-                selectinload(Comment.comment_likes),
             )
             .filter(Comment.id == commentId)
             .first()
@@ -157,33 +191,15 @@ def toggle_comment_like(commentId):
     Toggle like on a comment (like if not liked, unlike if already liked)
     """
     try:
-        # Check if comment exists
-        comment = Comment.query.get(commentId)
-        if not comment:
+        # Insert-or-delete and counter update, no COUNT
+        result = CommentLike.toggle(current_user.id, commentId)
+        if result is None:
+            db.session.rollback()
             return jsonify({"errors": {"message": "Comment not found"}}), 404
 
-        # Check current like status
-        existing_like = CommentLike.query.filter_by(
-            user_id=current_user.id, comment_id=commentId
-        ).first()
-
-        if existing_like:
-            # Unlike the comment
-            db.session.delete(existing_like)
-            action = "unliked"
-            is_liked = False
-        else:
-            # Like the comment
-            new_like = CommentLike(user_id=current_user.id, comment_id=commentId)
-            db.session.add(new_like)
-            action = "liked"
-            is_liked = True
-
-        # Commit the changes
+        is_liked, like_count = result
         db.session.commit()
-
-        # Get updated like count
-        like_count = CommentLike.query.filter_by(comment_id=commentId).count()
+        action = "liked" if is_liked else "unliked"
 
         # Return consistent response format
         return jsonify(
@@ -210,21 +226,22 @@ def get_comment_like_status(commentId):
     Get like status for current user and total count
     """
     try:
-        # Check if comment exists
-        comment = Comment.query.get(commentId)
-        if not comment:
-            return jsonify({"errors": {"message": "Comment not found"}}), 404
-
-        # Check if current user liked this comment
-        is_liked = (
-            CommentLike.query.filter_by(
-                user_id=current_user.id, comment_id=commentId
-            ).first()
-            is not None
+        # Counter and the current user's like row in one query
+        row = (
+            db.session.query(Comment.like_count, CommentLike.id)
+            .outerjoin(
+                CommentLike,
+                (CommentLike.comment_id == Comment.id)
+                & (CommentLike.user_id == current_user.id),
+            )
+            .filter(Comment.id == commentId)
+            .first()
         )
+        if not row:
+            return jsonify({"errors": {"message": "Comment not found"}}), 404
 
-        # Get total like count
-        like_count = CommentLike.query.filter_by(comment_id=commentId).count()
+        like_count, like_id = row
+        is_liked = like_id is not None
 
         return jsonify(
             {"isLiked": is_liked, "likeCount": like_count, "commentId": commentId}
@@ -303,7 +320,6 @@ def get_recent_comments():
                     "id", "username", "first_name", "last_name", "profile_image_url"
                 ),
                 joinedload(Comment.post).load_only("id", "title", "image"),
-                selectinload(Comment.comment_likes),
             )
             .filter(Comment.parent_id.is_(None))
             .order_by(Comment.created_at.desc())
@@ -339,109 +355,60 @@ def get_recent_comments():
 @login_required
 def get_post_comments(postId):
     """
-    Get all comments for a post with like data included by default
+    Get comments for a post with like data included by default
+
+    Root comments are paginated in SQL. With include_replies, each comment
+    on the page carries its oldest ?replies_per_parent= replies (default 10)
+    and a moreRepliesCursor for the rest.
     """
     try:
         page = request.args.get("page", 1, type=int)
         per_page = min(request.args.get("per_page", 20, type=int), 50)
         include_replies = request.args.get("include_replies", "true").lower() == "true"
+        replies_per_parent = max(
+            1, min(request.args.get("replies_per_parent", 10, type=int), 50)
+        )
 
         # Check if post exists
         post = Post.query.get(postId)
         if not post:
             return jsonify({"errors": {"message": "Post not found"}}), 404
 
-        # Load comments with like data by default
-        comments_query = (
+        # Page of root comments, newest first
+        root_comments = (
             db.session.query(Comment)
-            .options(
-                joinedload(Comment.commenter).load_only(
-                    "id", "username", "first_name", "last_name", "profile_image_url"
-                ),
-                selectinload(Comment.comment_likes),
-            )
-            .filter(Comment.post_id == postId)
+            .options(*comment_load_options())
+            .filter(Comment.post_id == postId, Comment.parent_id.is_(None))
+            .order_by(Comment.created_at.desc())
+            .paginate(page=page, per_page=per_page, error_out=False)
         )
 
-        if include_replies:
-            # Get all comments with their user and like data
-            all_comments = comments_query.order_by(Comment.created_at.desc()).all()
-
-            # Organize into hierarchical structure
-            comment_dict = {comment.id: comment for comment in all_comments}
-            root_comments = []
-
-            # First pass: identify root comments and attach replies
-            for comment in all_comments:
-                if comment.parent_id is None:
-                    root_comments.append(comment)
-                    comment.replies = []
-                else:
-                    parent = comment_dict.get(comment.parent_id)
-                    if parent:
-                        if not hasattr(parent, "replies"):
-                            parent.replies = []
-                        parent.replies.append(comment)
-
-            # Sort replies chronologically
-            def sort_replies(comment):
-                if hasattr(comment, "replies") and comment.replies:
-                    comment.replies.sort(key=lambda x: x.created_at)
-                    for reply in comment.replies:
-                        sort_replies(reply)
-
-            for comment in root_comments:
-                sort_replies(comment)
-
-            # Apply pagination to root comments
-            total_root = len(root_comments)
-            start_idx = (page - 1) * per_page
-            end_idx = start_idx + per_page
-            paginated_comments = root_comments[start_idx:end_idx]
-
-            # Convert to dict with like data
-            comments_data = [
-                comment.to_dict_with_likes(
-                    include_replies=True, current_user_id=current_user.id
-                )
-                for comment in paginated_comments
-            ]
-
-            pagination = {
-                "page": page,
-                "pages": (total_root + per_page - 1) // per_page,
-                "per_page": per_page,
-                "total": total_root,
-                "has_next": end_idx < total_root,
-                "has_prev": page > 1,
-            }
+        # Reply windows for this page only; reply counts alone without replies
+        threads = load_reply_windows(
+            root_comments.items,
+            replies_per_parent,
+            max_depth=5 if include_replies else 0,
+        )
 
-        else:
-            # Get only root comments
-            root_comments_query = comments_query.filter(Comment.parent_id.is_(None))
-            comments = root_comments_query.order_by(Comment.created_at.desc()).paginate(
-                page=page, per_page=per_page, error_out=False
-            )
+        # Like counts are on the rows; the user's likes come from one IN query
+        liked_comment_ids = CommentLike.liked_comment_ids(current_user.id, threads)
 
-            # Convert to dict with like data
-            comments_data = [
-                comment.to_dict_with_likes(current_user_id=current_user.id)
-                for comment in comments.items
-            ]
-
-            pagination = {
-                "page": page,
-                "pages": comments.pages,
-                "per_page": per_page,
-                "total": comments.total,
-                "has_next": comments.has_next,
-                "has_prev": comments.has_prev,
-            }
+        comments_data = [
+            serialize_comment_thread(comment, threads, liked_comment_ids)
+            for comment in root_comments.items
+        ]
 
         return jsonify(
             {
                 "comments": comments_data,
-                "pagination": pagination,
+                "pagination": {
+                    "page": page,
+                    "pages": root_comments.pages,
+                    "per_page": per_page,
+                    "total": root_comments.total,
+                    "has_next": root_comments.has_next,
+                    "has_prev": root_comments.has_prev,
+                },
             }
         )
 
@@ -512,6 +479,7 @@ def add_comment(postId):
         )
 
         db.session.add(comment)
+        Post.adjust_counters(postId, comments=1)
         db.session.commit()
 
         # Reload with user and like data
@@ -521,7 +489,6 @@ def add_comment(postId):
                 joinedload(Comment.commenter).load_only(
                     "id", "username", "first_name", "last_name", "profile_image_url"
                 ),
-                selectinload(Comment.comment_likes),
             )
             .filter(Comment.id == comment.id)
             .first()
@@ -564,31 +531,11 @@ def delete_comment(postId, commentId):
         if comment.user_id != current_user.id:
             return jsonify({"errors": {"message": "Unauthorized"}}), 403
 
-        # Delete all nested replies recursively
-        def delete_comment_tree(comment_id):
-            # Get all child comments
-            child_comments = db.session.execute(
-                text("SELECT id FROM comments WHERE parent_id = :parent_id"),
-                {"parent_id": comment_id},
-            ).fetchall()
-
-            # Recursively delete children
-            for child in child_comments:
-                delete_comment_tree(child[0])
-
-            # Delete comment likes first
-            db.session.execute(
-                text("DELETE FROM comment_likes WHERE comment_id = :comment_id"),
-                {"comment_id": comment_id},
-            )
-
-            # Delete the comment itself
-            db.session.execute(
-                text("DELETE FROM comments WHERE id = :comment_id"),
-                {"comment_id": comment_id},
-            )
+        # Whole subtree from the closure table, likes included
+        Comment.delete_threads([commentId])
 
-        delete_comment_tree(commentId)
+        # The tree size is not known up front, so recount the post
+        Post.refresh_counters([postId])
         db.session.commit()
 
         return jsonify({"message": "Comment deleted successfully"}), 200
@@ -612,35 +559,27 @@ def get_batch_comment_like_status():
         if not comment_ids:
             return jsonify({"statuses": {}})
 
-        # Get like statuses for all comments
-        like_data = (
-            db.session.query(
-                CommentLike.comment_id,
-                func.count(CommentLike.id).label("like_count"),
-                func.sum(
-                    func.case((CommentLike.user_id == current_user.id, 1), else_=0)
-                ).label("is_liked_by_user"),
+        # Counters plus the current user's like rows in one query
+        rows = (
+            db.session.query(Comment.id, Comment.like_count, CommentLike.id)
+            .outerjoin(
+                CommentLike,
+                (CommentLike.comment_id == Comment.id)
+                & (CommentLike.user_id == current_user.id),
             )
-            .filter(CommentLike.comment_id.in_(comment_ids))
-            .group_by(CommentLike.comment_id)
+            .filter(Comment.id.in_(comment_ids))
             .all()
         )
+        found = {
+            comment_id: {"isLiked": like_id is not None, "likeCount": like_count or 0}
+            for comment_id, like_count, like_id in rows
+        }
 
         # Format response
-        statuses = {}
-        for comment_id in comment_ids:
-            # Find data for this comment
-            comment_data = next(
-                (item for item in like_data if item.comment_id == comment_id), None
-            )
-
-            if comment_data:
-                statuses[comment_id] = {
-                    "isLiked": bool(comment_data.is_liked_by_user),
-                    "likeCount": comment_data.like_count,
-                }
-            else:
-                statuses[comment_id] = {"isLiked": False, "likeCount": 0}
+        statuses = {
+            comment_id: found.get(comment_id, {"isLiked": False, "likeCount": 0})
+            for comment_id in comment_ids
+        }
 
         return jsonify({"statuses": statuses})
 
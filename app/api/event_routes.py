@@ -9,25 +9,56 @@ from app.models import (
     Venue,
     Event,
     EventImage,
+    EventWaitlist,
 )
 
 from app.forms import EventForm, EventImageForm
 from app.aws import get_unique_filename, upload_file_to_s3, remove_file_from_s3
+from app.utilities.session_bootstrap import bump_event_versions
+from app.utilities import event_attendance as attendance
+from app.utilities.response_cache import response_cache, cached
+from app.utilities.single_flight import coalesced
+from app.utilities.geo import parse_near, order_by_distance, near_info, NEAR_PARAMS
 from sqlalchemy.orm import joinedload, selectinload
 from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
 
 event_routes = Blueprint("events", __name__)
 
 
+# Query arguments the list reads, and so the cache key
+EVENT_LIST_PARAMS = ("page", "per_page") + NEAR_PARAMS
+
+
+def _event_list_tags(body):
+    """Cache tags for a page of events: the list, each event and its group"""
+    yield "events:list"
+    # Near searches depend on where every venue is
+    if "near" in body:
+        yield "venues:list"
+    for event in body["events"]:
+        yield f"event:{event['id']}"
+        if event["groupInfo"]["id"] is not None:
+            yield f"group:{event['groupInfo']['id']}"
+
+
 # ! EVENTS
 @event_routes.route("")
+@cached(_event_list_tags, EVENT_LIST_PARAMS)
 def all_events():
     """
     For all events and returns them in a list of event dictionaries
+    ?near=lat,lng&radius= (miles) keeps events at a venue within radius,
+    nearest first, then by start date.
     """
     page = request.args.get("page", 1, type=int)
     per_page = min(request.args.get("per_page", 20, type=int), 50)
 
+    try:
+        near = parse_near(request.args)
+    except ValueError as e:
+        return jsonify({"errors": {"message": str(e)}}), 400
+
     # Query with selective loading
     events_query = (
         db.session.query(Event)
@@ -41,30 +72,39 @@ def all_events():
             joinedload(Event.venues).load_only(
                 "id", "address", "city", "state", "latitude", "longitude"
             ),
-            selectinload(Event.attendances).load_only("id", "user_id"),
             selectinload(Event.event_images).load_only("id", "event_image"),
         )
-        .order_by(Event.start_date)
     )
+    if near:
+        distances = {hit[0]: hit[2] for hit in Venue.within(*near)}
+        events_query = order_by_distance(events_query, Event.venue_id, distances)
+    events_query = events_query.order_by(Event.start_date)
 
     events = events_query.paginate(page=page, per_page=per_page, error_out=False)
 
-    return jsonify(
-        {
-            "events": [event.to_dict_minimal() for event in events.items],
-            "pagination": {
-                "page": page,
-                "pages": events.pages,
-                "per_page": per_page,
-                "total": events.total,
-                "has_next": events.has_next,
-                "has_prev": events.has_prev,
-            },
-        }
-    )
+    event_dicts = [event.to_dict_minimal() for event in events.items]
+    if near:
+        for event, event_dict in zip(events.items, event_dicts):
+            event_dict["distance"] = round(distances[event.venue_id], 2)
+
+    body = {
+        "events": event_dicts,
+        "pagination": {
+            "page": page,
+            "pages": events.pages,
+            "per_page": per_page,
+            "total": events.total,
+            "has_next": events.has_next,
+            "has_prev": events.has_prev,
+        },
+    }
+    if near:
+        body["near"] = near_info(near)
+    return jsonify(body)
 
 
 @event_routes.route("/<int:eventId>")
+@coalesced()
 def event(eventId):
     """
     Query for event by id and returns that event in a dictionary
@@ -124,6 +164,9 @@ def delete_event(eventId):
         return {"errors": {"message": "Unauthorized"}}, 401
 
     try:
+        # Bump attendees while their rows still exist
+        bump_event_versions([eventId])
+
         # Batch delete operations for better performance
         db.session.execute(
             EventImage.__table__.delete().where(EventImage.event_id == eventId)
@@ -131,6 +174,9 @@ def delete_event(eventId):
         db.session.execute(
             Attendance.__table__.delete().where(Attendance.event_id == eventId)
         )
+        db.session.execute(
+            EventWaitlist.__table__.delete().where(EventWaitlist.event_id == eventId)
+        )
 
         # Remove image from S3 if it exists
         if event_to_delete.image:
@@ -138,6 +184,9 @@ def delete_event(eventId):
 
         db.session.delete(event_to_delete)
         db.session.commit()
+        response_cache.invalidate(
+            f"event:{eventId}", f"group:{group.id}", "events:list"
+        )
 
         return {"message": "Event deleted successfully"}, 200
 
@@ -151,15 +200,12 @@ def delete_event(eventId):
 @login_required
 def attend_event(eventId):
     """
-    Attend an event
+    Attend an event, or join its waitlist when it is full
     """
     # Get event and group data in one query
     event = (
         db.session.query(Event)
-        .options(
-            joinedload(Event.groups).load_only("organizer_id"),
-            selectinload(Event.attendances).load_only("user_id"),
-        )
+        .options(joinedload(Event.groups).load_only("organizer_id"))
         .filter(Event.id == eventId)
         .first()
     )
@@ -169,56 +215,82 @@ def attend_event(eventId):
 
     # Check if the user is the organizer
     if event.groups.organizer_id == current_user.id:
-        # Organizer is automatically attending - check if attendance record exists
-        organizer_already_attending = any(
-            attendance.user_id == current_user.id for attendance in event.attendances
-        )
-
-        if not organizer_already_attending:
-            # Create attendance record for organizer if it doesn't exist
-            try:
-                new_attendance = Attendance(event_id=eventId, user_id=current_user.id)
-                db.session.add(new_attendance)
-                db.session.commit()
-
+        # Organizer is automatically attending - the organizer never waits in line
+        try:
+            status, _ = attendance.attend(eventId, current_user.id, waitlist=False)
+            if status == attendance.ALREADY_ATTENDING:
+                db.session.rollback()
                 return {
-                    "message": "As the organizer, you are automatically attending this event",
+                    "message": "You are the organizer and are already attending this event",
                     "isOrganizer": True,
                     "attending": True,
                 }, 200
-            except Exception as e:
+            if status != attendance.ATTENDING:
                 db.session.rollback()
                 return {
-                    "errors": {"message": "Error setting organizer attendance"}
-                }, 500
-        else:
+                    "errors": {"message": "Event is at capacity"},
+                    "isOrganizer": True,
+                    "attending": False,
+                }, 409
+
+            bump_event_versions([eventId])
+            db.session.commit()
+            response_cache.invalidate(f"event:{eventId}")
+
+            return {
+                "message": "As the organizer, you are automatically attending this event",
+                "isOrganizer": True,
+                "attending": True,
+            }, 200
+        except IntegrityError:
+            db.session.rollback()
             return {
                 "message": "You are the organizer and are already attending this event",
                 "isOrganizer": True,
                 "attending": True,
             }, 200
-
-    # Check if the user is already attending using in-memory check
-    user_already_attending = any(
-        attendance.user_id == current_user.id for attendance in event.attendances
-    )
-
-    if user_already_attending:
-        return {"message": "You are already attending this event"}, 400
+        except Exception as e:
+            db.session.rollback()
+            return {"errors": {"message": "Error setting organizer attendance"}}, 500
 
     # Parse JSON request body
     data = request.get_json() if request.is_json else {}
     user_id = data.get("user_id", current_user.id)
-    event_id = data.get("event_id", eventId)
 
     # Ensure data is valid
     if user_id != current_user.id:
         return {"message": "Invalid user ID"}, 400
 
     try:
-        new_attendance = Attendance(event_id=event_id, user_id=user_id)
-        db.session.add(new_attendance)
+        status, position = attendance.attend(eventId, user_id)
+        if status == attendance.ALREADY_ATTENDING:
+            db.session.rollback()
+            return {"message": "You are already attending this event"}, 400
+
+        if status == attendance.ALREADY_WAITLISTED:
+            db.session.rollback()
+            return {
+                "message": "You are already on the waitlist for this event",
+                "attending": False,
+                "waitlisted": True,
+                "position": position,
+                "isOrganizer": False,
+            }, 200
+
+        if status == attendance.WAITLISTED:
+            db.session.commit()
+            response_cache.invalidate(f"event:{eventId}")
+            return {
+                "message": "The event is full - you have been added to the waitlist",
+                "attending": False,
+                "waitlisted": True,
+                "position": position,
+                "isOrganizer": False,
+            }, 202
+
+        bump_event_versions([eventId])
         db.session.commit()
+        response_cache.invalidate(f"event:{eventId}")
 
         return {
             "message": "Successfully joined the event",
@@ -226,6 +298,10 @@ def attend_event(eventId):
             "isOrganizer": False,
         }, 200
 
+    except IntegrityError:
+        # A concurrent request for the same user got the seat first
+        db.session.rollback()
+        return {"message": "You are already attending this event"}, 400
     except Exception as e:
         db.session.rollback()
         return {"errors": {"message": "Error attending event"}}, 500
@@ -235,9 +311,9 @@ def attend_event(eventId):
 @login_required
 def leave_event(eventId, attendeeId):
     """
-    Leave an event
+    Leave an event or its waitlist. The freed seat goes to the first
+    user on the waitlist.
     """
-    # Get event and attendance data in one query
     event = (
         db.session.query(Event)
         .options(joinedload(Event.groups).load_only("organizer_id"))
@@ -248,11 +324,6 @@ def leave_event(eventId, attendeeId):
     if not event:
         return {"errors": {"message": "Event not found"}}, 404
 
-    # Check if the attendee exists
-    attendee = Attendance.query.filter_by(event_id=eventId, user_id=attendeeId).first()
-    if not attendee:
-        return {"message": "User is not an attendee of this event"}, 400
-
     # If the current user is trying to leave the event
     if attendeeId == current_user.id:
         if event.groups.organizer_id == current_user.id:
@@ -260,35 +331,47 @@ def leave_event(eventId, attendeeId):
                 "message": "As the organizer, you must attend the event. Transfer organizer role to someone else if you cannot attend.",
                 "isOrganizer": True,
             }, 403
-
-        try:
-            db.session.delete(attendee)
-            db.session.commit()
-            return {
-                "message": "You have successfully left the event",
-                "attending": False,
-            }, 200
-        except Exception as e:
-            db.session.rollback()
-            return {"errors": {"message": "Error leaving event"}}, 500
+        messages = {
+            attendance.ATTENDING: "You have successfully left the event",
+            attendance.WAITLISTED: "You have left the waitlist for this event",
+        }
+        error = "Error leaving event"
 
     # If the current user is trying to remove another attendee
-    if event.groups.organizer_id != current_user.id:
+    elif event.groups.organizer_id != current_user.id:
         return {"message": "Only the organizer can remove attendees"}, 403
 
-    if attendeeId == event.groups.organizer_id:
+    elif attendeeId == event.groups.organizer_id:
         return {
             "message": "The organizer cannot be removed from the event",
             "isOrganizer": True,
         }, 400
 
+    else:
+        messages = {
+            attendance.ATTENDING: "Attendee successfully removed from the event",
+            attendance.WAITLISTED: "User successfully removed from the waitlist",
+        }
+        error = "Error removing attendee"
+
     try:
-        db.session.delete(attendee)
+        bump_event_versions([eventId])
+        status, promoted = attendance.leave(eventId, attendeeId)
+        if status is None:
+            db.session.rollback()
+            return {"message": "User is not an attendee of this event"}, 400
+
         db.session.commit()
-        return {"message": "Attendee successfully removed from the event"}, 200
+        response_cache.invalidate(f"event:{eventId}")
+
+        body = {"message": messages[status], "promoted": promoted}
+        if attendeeId == current_user.id:
+            body["attending"] = False
+            body["waitlisted"] = False
+        return body, 200
     except Exception as e:
         db.session.rollback()
-        return {"errors": {"message": "Error removing attendee"}}, 500
+        return {"errors": {"message": error}}, 500
 
 
 # ! EVENT IMAGES
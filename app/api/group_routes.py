@@ -19,17 +19,58 @@ from app.forms import (
     EditEventForm,
 )
 from app.aws import get_unique_filename, upload_file_to_s3, remove_file_from_s3
-from sqlalchemy.orm import joinedload, selectinload
+from app.utilities.session_bootstrap import bump_group_versions, bump_event_versions
+from app.utilities import event_attendance as attendance
+from app.utilities.response_cache import response_cache, cached
+from app.utilities.single_flight import coalesced
+from app.utilities.group_search import search_groups
+from app.utilities.geo import parse_near, order_by_distance, near_info, NEAR_PARAMS
+from app.utilities.group_sections import (
+    SECTION_KEYS,
+    PREVIEW_SIZE,
+    MAX_PAGE_SIZE,
+    parse_include,
+    group_header,
+    section_preview,
+    section_page,
+)
+from sqlalchemy.orm import joinedload
 from sqlalchemy import func, and_, text
 
 group_routes = Blueprint("groups", __name__)
 
 
+# Query arguments the list reads, and so the cache key
+GROUP_LIST_PARAMS = (
+    "page",
+    "per_page",
+    "search",
+    "type",
+    "city",
+    "state",
+) + NEAR_PARAMS
+
+
+def _group_list_tags(body):
+    """Cache tags for a page of groups: the list, each group and organizer"""
+    yield "groups:list"
+    # Near searches depend on where every venue is
+    if "near" in body:
+        yield "venues:list"
+    for group in body["groups"]:
+        yield f"group:{group['id']}"
+        yield f"user:{group['organizerId']}"
+
+
 # ! GROUPS
 @group_routes.route("")
+@cached(_group_list_tags, GROUP_LIST_PARAMS)
 def all_groups():
     """
-    Query for all groups with pagination and minimal data loading
+    Query for all groups with pagination and minimal data loading.
+    ?search= is a full-text search over name and about, ranked by relevance.
+    ?near=lat,lng&radius= (miles) keeps groups with a venue within radius,
+    nearest first.
     """
     page = request.args.get("page", 1, type=int)
     per_page = min(request.args.get("per_page", 20, type=int), 50)
@@ -40,6 +81,11 @@ def all_groups():
     city = request.args.get("city", "").strip()
     state = request.args.get("state", "").strip()
 
+    try:
+        near = parse_near(request.args)
+    except ValueError as e:
+        return jsonify({"errors": {"message": str(e)}}), 400
+
     # Build query with loading
     groups_query = db.session.query(Group).options(
         joinedload(Group.organizer).load_only(
@@ -49,11 +95,6 @@ def all_groups():
     )
 
     # Apply filters
-    if search:
-        groups_query = groups_query.filter(
-            db.or_(Group.name.ilike(f"%{search}%"), Group.about.ilike(f"%{search}%"))
-        )
-
     if group_type:
         groups_query = groups_query.filter(Group.type == group_type)
 
@@ -63,8 +104,18 @@ def all_groups():
     if state:
         groups_query = groups_query.filter(Group.state.ilike(f"%{state}%"))
 
-    # Order by created date for consistency
-    groups_query = groups_query.order_by(Group.created_at.desc())
+    # A group is as near as its nearest venue
+    if near:
+        distances = {}
+        for _, group_id, distance in Venue.within(*near):
+            distances.setdefault(group_id, distance)
+        groups_query = order_by_distance(groups_query, Group.id, distances)
+
+    # Search results come best match first, everything else newest first
+    if search:
+        groups_query = search_groups(groups_query, search)
+    else:
+        groups_query = groups_query.order_by(Group.created_at.desc())
 
     # Paginate
     groups = groups_query.paginate(page=page, per_page=per_page, error_out=False)
@@ -84,16 +135,8 @@ def all_groups():
             }
         )
 
-    # Get member counts efficiently in batch
+    # Get event counts efficiently in batch - member counts are a column
     group_ids = [group.id for group in groups.items]
-    member_counts = dict(
-        db.session.query(Membership.group_id, func.count(Membership.id))
-        .filter(Membership.group_id.in_(group_ids))
-        .group_by(Membership.group_id)
-        .all()
-    )
-
-    # Get event counts efficiently in batch
     event_counts = dict(
         db.session.query(Event.group_id, func.count(Event.id))
         .filter(Event.group_id.in_(group_ids))
@@ -124,59 +167,115 @@ def all_groups():
                 if group.organizer
                 else None
             ),
-            "numMembers": member_counts.get(group.id, 0),
+            "numMembers": group.member_count,
             "numEvents": event_counts.get(group.id, 0),
             "createdAt": group.created_at.isoformat(),
         }
+        if near:
+            group_dict["distance"] = round(distances[group.id], 2)
         group_data.append(group_dict)
 
-    return jsonify(
-        {
-            "groups": group_data,
-            "pagination": {
-                "page": page,
-                "pages": groups.pages,
-                "per_page": per_page,
-                "total": groups.total,
-                "has_next": groups.has_next,
-                "has_prev": groups.has_prev,
-            },
-        }
-    )
+    body = {
+        "groups": group_data,
+        "pagination": {
+            "page": page,
+            "pages": groups.pages,
+            "per_page": per_page,
+            "total": groups.total,
+            "has_next": groups.has_next,
+            "has_prev": groups.has_prev,
+        },
+    }
+    if near:
+        body["near"] = near_info(near)
+    return jsonify(body)
 
 
 @group_routes.route("/<int:groupId>")
+@coalesced(("include", "limit"))
 def group(groupId):
     """
-    Query for group by id with loading
+    Query for group by id: the group, its organizer and the size of each
+    section, plus the first ?limit= (default 10) members, events, venues
+    and images. ?include=members,events picks the embedded sections (empty
+    for none); the rest are paged through /members, /events, /venues and
+    /images.
     """
-    group = (
-        db.session.query(Group)
-        .options(
-            joinedload(Group.organizer).load_only(
-                "id", "username", "first_name", "last_name", "profile_image_url"
-            ),
-            selectinload(Group.events).options(
-                selectinload(Event.attendances)
-                .joinedload(Attendance.user)
-                .load_only("id", "username", "profile_image_url")
-            ),
-            selectinload(Group.venues),
-            selectinload(Group.memberships)
-            .joinedload(Membership.user)
-            .load_only(
-                "id", "username", "first_name", "last_name", "profile_image_url"
-            ),
-            selectinload(Group.group_images),
-        )
-        .filter(Group.id == groupId)
-        .first()
-    )
+    try:
+        include = parse_include(request.args.get("include"))
+    except ValueError as e:
+        return jsonify({"errors": {"message": str(e)}}), 400
+    limit = request.args.get("limit", PREVIEW_SIZE, type=int)
+    limit = min(max(limit, 0), MAX_PAGE_SIZE)
+
+    group, counts = group_header(groupId)
+
+    if not group:
+        return jsonify({"errors": {"message": "Group not found"}}), 404
+
+    group_dict = group.to_dict_header(counts)
+    for section in include:
+        group_dict[SECTION_KEYS[section]] = section_preview(group, section, limit)
+
+    return jsonify(group_dict)
+
+
+# Query arguments every section page reads
+SECTION_PARAMS = ("page", "per_page")
+
+
+def _group_section(groupId, section, **filters):
+    """One page of a group's section, for the sub-resource routes below"""
+    page = request.args.get("page", 1, type=int)
+    per_page = min(request.args.get("per_page", 20, type=int), MAX_PAGE_SIZE)
+
+    group = Group.query.get(groupId)
 
     if not group:
         return jsonify({"errors": {"message": "Group not found"}}), 404
 
-    return jsonify(group.to_dict())
+    items, pagination = section_page(group, section, page, per_page, **filters)
+    return jsonify({section: items, "pagination": pagination})
+
+
+@group_routes.route("/<int:groupId>/members")
+@coalesced(SECTION_PARAMS)
+def group_members(groupId):
+    """
+    A page of a group's members, organizer first then by first name
+    """
+    return _group_section(groupId, "members")
+
+
+@group_routes.route("/<int:groupId>/events")
+@coalesced(SECTION_PARAMS + ("upcoming",))
+def group_events(groupId):
+    """
+    A page of a group's events by start date. ?upcoming=true keeps the
+    ones that haven't ended, ?upcoming=false the past ones (latest first).
+    """
+    upcoming = request.args.get("upcoming")
+    if upcoming is not None:
+        upcoming = upcoming.lower() == "true"
+    return _group_section(groupId, "events", upcoming=upcoming)
+
+
+@group_routes.route("/<int:groupId>/venues")
+@coalesced(SECTION_PARAMS)
+def group_venues(groupId):
+    """
+    A page of a group's venues
+    """
+    return _group_section(groupId, "venues")
+
+
+@group_routes.route("/<int:groupId>/images")
+@coalesced(SECTION_PARAMS)
+def group_images(groupId):
+    """
+    A page of a group's images
+    """
+    return _group_section(groupId, "images")
 
 
 @group_routes.route("/new", methods=["POST"])
@@ -229,9 +328,13 @@ def create_group():
                 group_id=new_group.id, user_id=current_user.id
             )
             db.session.add(organizer_membership)
+            db.session.flush()
+            Group.adjust_member_counts([new_group.id], 1)
+            bump_group_versions([new_group.id])
 
             # Commit both the group and membership
             db.session.commit()
+            response_cache.invalidate("groups:list")
 
             # Return the created group with proper member count
             return {
@@ -302,7 +405,10 @@ def edit_group(groupId):
         group_to_edit.city = form.data["city"] or group_to_edit.city
         group_to_edit.state = form.data["state"] or group_to_edit.state
 
+        # Members see the group, attendees see its name on their events
+        bump_group_versions([groupId], events=True)
         db.session.commit()
+        response_cache.invalidate(f"group:{groupId}")
 
         # Return minimal updated data
         return {
@@ -336,6 +442,9 @@ def delete_group(groupId):
         return {"errors": {"message": "Unauthorized"}}, 401
 
     try:
+        # Bump members and attendees while their rows still exist
+        bump_group_versions([groupId], events=True)
+
         # Use proper transaction handling
         # Delete all related data in correct order using raw SQL for efficiency
 
@@ -347,6 +456,14 @@ def delete_group(groupId):
             {"group_id": groupId},
         )
 
+        # Delete waitlists for events in this group
+        db.session.execute(
+            text(
+                "DELETE FROM event_waitlist WHERE event_id IN (SELECT id FROM events WHERE group_id = :group_id)"
+            ),
+            {"group_id": groupId},
+        )
+
         # Delete event images for events in this group
         db.session.execute(
             text(
@@ -390,6 +507,9 @@ def delete_group(groupId):
 
         # Commit the transaction
         db.session.commit()
+        response_cache.invalidate(
+            f"group:{groupId}", "groups:list", "events:list", "venues:list"
+        )
 
         return {"message": "Group deleted successfully"}, 200
 
@@ -426,7 +546,11 @@ def join_group(groupId):
     try:
         new_membership = Membership(group_id=groupId, user_id=current_user.id)
         db.session.add(new_membership)
+        db.session.flush()
+        Group.adjust_member_counts([groupId], 1)
+        bump_group_versions([groupId])
         db.session.commit()
+        response_cache.invalidate(f"group:{groupId}")
 
         return {"message": "Successfully joined the group"}, 200
 
@@ -461,8 +585,11 @@ def leave_group(groupId, memberId):
     # If the current user is trying to leave the group
     if memberId == current_user.id:
         try:
+            bump_group_versions([groupId])
             db.session.delete(member)
+            Group.adjust_member_counts([groupId], -1)
             db.session.commit()
+            response_cache.invalidate(f"group:{groupId}")
             return {"message": "You have successfully left the group"}, 200
         except Exception as e:
             db.session.rollback()
@@ -473,8 +600,11 @@ def leave_group(groupId, memberId):
         return {"message": "Only the organizer can remove members"}, 403
 
     try:
+        bump_group_versions([groupId])
         db.session.delete(member)
+        Group.adjust_member_counts([groupId], -1)
         db.session.commit()
+        response_cache.invalidate(f"group:{groupId}")
         return {"message": "Member successfully removed from the group"}, 200
     except Exception as e:
         db.session.rollback()
@@ -631,9 +761,13 @@ def create_event(groupId):
                 event_id=new_event.id, user_id=current_user.id
             )
             db.session.add(organizer_attendance)
+            db.session.flush()
+            Event.adjust_attendee_counts([new_event.id], 1)
+            bump_event_versions([new_event.id])
 
             # Commit both the event and attendance
             db.session.commit()
+            response_cache.invalidate("events:list", f"group:{groupId}")
 
             # Return complete event data with attendance count
             return {
@@ -693,6 +827,14 @@ def edit_event(groupId, eventId):
     form["csrf_token"].data = request.cookies["csrf_token"]
 
     if form.validate_on_submit():
+        # Seats already given out can't be taken back
+        if form.data["capacity"] < event_to_edit.attendee_count:
+            return {
+                "capacity": [
+                    f"Capacity can't be below the {event_to_edit.attendee_count} people attending"
+                ]
+            }, 400
+
         try:
             # Handle image upload if provided
             image = form.image.data
@@ -720,8 +862,15 @@ def edit_event(groupId, eventId):
             event_to_edit.start_date = form.data["startDate"]
             event_to_edit.end_date = form.data["endDate"]
 
+            bump_event_versions([eventId])
+
+            # Seats added by a bigger capacity go to the waitlist
+            db.session.flush()
+            attendance.promote(eventId)
+
             # Commit the changes
             db.session.commit()
+            response_cache.invalidate(f"event:{eventId}")
 
             # Return updated event data
             return {
@@ -776,6 +925,7 @@ def create_venue(groupId):
 
         db.session.add(new_venue)
         db.session.commit()
+        response_cache.invalidate("venues:list")
 
         return new_venue.to_dict(), 201
 
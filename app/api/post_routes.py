@@ -1,28 +1,65 @@
 from flask import Blueprint, request, redirect, jsonify
 from flask_login import login_required, current_user
-from app.models import db, User, Post, Comment, Likes, UserTags, Tag
+from app.models import db, User, Post, Comment, CommentLike, Likes, UserTags, Tag
 from app.forms import PostForm, CommentForm
 from app.aws import get_unique_filename, upload_file_to_s3, remove_file_from_s3
-from sqlalchemy.orm import joinedload, selectinload, load_only
+from app.utilities.feed_batch import (
+    FeedBatch,
+    similar_posts_query,
+    similar_users_count,
+)
+from app.utilities.feed_hydration import serialize_feed_posts
+from app.utilities.pagination import cursor_paginate
+from sqlalchemy.orm import joinedload, selectinload, load_only, lazyload
 from sqlalchemy import desc, func, text
 import logging
 
 post_routes = Blueprint("posts", __name__)
 logger = logging.getLogger(__name__)
 
+# Upper bound on ids accepted by /batch-like-status in one request
+MAX_BATCH_LIKE_STATUS_IDS = 300
+
 # ! POSTS
 @post_routes.route("/feed/all")
 @login_required
 def all_posts_feed():
     """
     ALL posts with pagination and loading
+
+    Pass ?cursor= (empty for the first page) to page by cursor instead of
+    page number; add ?include_total=true to also get the total count.
     """
     try:
         page = request.args.get("page", 1, type=int)
         per_page = min(request.args.get("per_page", 20, type=int), 50)
+        use_cursor = "cursor" in request.args
+
+        posts_query = Post.query.options(lazyload(Post.user))
+
+        # Cursor mode: keyset seek on (created_at, id), no COUNT unless asked
+        if use_cursor:
+            try:
+                posts = cursor_paginate(
+                    posts_query,
+                    Post,
+                    request.args.get("cursor"),
+                    per_page,
+                    with_total=request.args.get("include_total", "").lower()
+                    == "true",
+                )
+            except ValueError:
+                return jsonify({"errors": {"message": "Invalid cursor"}}), 400
+
+            return jsonify(
+                {
+                    "posts": serialize_feed_posts(posts.items),
+                    "pagination": posts.pagination(),
+                }
+            )
 
         # Get posts with pagination
-        posts = Post.query.order_by(desc(Post.created_at)).paginate(
+        posts = posts_query.order_by(desc(Post.created_at)).paginate(
             page=page, per_page=per_page, error_out=False
         )
 
@@ -41,61 +78,8 @@ def all_posts_feed():
                 }
             )
 
-        # Build response
-        posts_data = []
-        for post in posts.items:
-            try:
-                # Load user
-                user_data = None
-                if post.creator:
-                    user = User.query.get(post.creator)
-                    if user:
-                        user_data = {
-                            "id": user.id,
-                            "username": user.username,
-                            "firstName": user.first_name or "",
-                            "lastName": user.last_name or "",
-                            "profileImage": user.profile_image_url or "",
-                        }
-
-                # Get counts
-                like_count = (
-                    db.session.execute(
-                        text("SELECT COUNT(*) FROM likes WHERE post_id = :post_id"),
-                        {"post_id": post.id},
-                    ).scalar()
-                    or 0
-                )
-
-                comment_count = (
-                    db.session.execute(
-                        text("SELECT COUNT(*) FROM comments WHERE post_id = :post_id"),
-                        {"post_id": post.id},
-                    ).scalar()
-                    or 0
-                )
-
-                post_dict = {
-                    "id": post.id,
-                    "title": post.title or "",
-                    "caption": post.caption or "",
-                    "creator": post.creator,
-                    "image": post.image or "",
-                    "likes": like_count,
-                    "comments": comment_count,
-                    "createdAt": (
-                        post.created_at.isoformat() if post.created_at else None
-                    ),
-                    "updatedAt": (
-                        post.updated_at.isoformat() if post.updated_at else None
-                    ),
-                    "user": user_data,
-                }
-                posts_data.append(post_dict)
-
-            except Exception as post_error:
-                logger.warning(f"Error processing post {post.id}: {post_error}")
-                continue
+        # Creators and counts for the whole page in grouped queries
+        posts_data = serialize_feed_posts(posts.items)
 
         return jsonify(
             {
@@ -121,104 +105,70 @@ def all_posts_feed():
 def similar_posts_feed():
     """
     Posts from users with similar tags
+
+    Supports the same ?cursor= / ?include_total= mode as /feed/all.
     """
     try:
         page = request.args.get("page", 1, type=int)
         per_page = min(request.args.get("per_page", 20, type=int), 50)
+        use_cursor = "cursor" in request.args
+
+        if use_cursor:
+            empty_pagination = {
+                "per_page": per_page,
+                "next_cursor": None,
+                "has_next": False,
+            }
+        else:
+            empty_pagination = {
+                "page": page,
+                "pages": 0,
+                "per_page": per_page,
+                "total": 0,
+                "has_next": False,
+                "has_prev": False,
+            }
 
         # Check if user has tags
         if not current_user.users_tags:
             return jsonify(
                 {
                     "posts": [],
-                    "pagination": {
-                        "page": 1,
-                        "pages": 0,
-                        "per_page": per_page,
-                        "total": 0,
-                        "has_next": False,
-                        "has_prev": False,
-                    },
+                    "pagination": (
+                        empty_pagination
+                        if use_cursor
+                        else {**empty_pagination, "page": 1}
+                    ),
                     "message": "Add tags to your profile to discover posts from similar users!",
                 }
             )
 
-        # Get user's tag IDs
-        user_tag_ids = [tag.id for tag in current_user.users_tags]
-
-        # Find users with similar tags
         try:
-            similar_user_ids = []
-
-            if len(user_tag_ids) == 1:
-                # Single tag case
-                result = db.session.execute(
-                    text(
-                        """
-                        SELECT DISTINCT user_id 
-                        FROM user_tags 
-                        WHERE tag_id = :tag_id 
-                        AND user_id != :current_user_id
-                    """
-                    ),
-                    {"tag_id": user_tag_ids[0], "current_user_id": current_user.id},
-                ).fetchall()
-                similar_user_ids = [row[0] for row in result]
+            posts_query = similar_posts_query(current_user.id)
+
+            if use_cursor:
+                posts = cursor_paginate(
+                    posts_query,
+                    Post,
+                    request.args.get("cursor"),
+                    per_page,
+                    with_total=request.args.get("include_total", "").lower()
+                    == "true",
+                )
             else:
-                # Multiple tags case
-                tag_conditions = []
-                params = {"current_user_id": current_user.id}
-
-                for i, tag_id in enumerate(user_tag_ids):
-                    tag_conditions.append(f"tag_id = :tag_id_{i}")
-                    params[f"tag_id_{i}"] = tag_id
-
-                query = f"""
-                    SELECT DISTINCT user_id 
-                    FROM user_tags 
-                    WHERE ({' OR '.join(tag_conditions)})
-                    AND user_id != :current_user_id
-                """
-
-                result = db.session.execute(text(query), params).fetchall()
-                similar_user_ids = [row[0] for row in result]
-
-            if not similar_user_ids:
-                return jsonify(
-                    {
-                        "posts": [],
-                        "pagination": {
-                            "page": page,
-                            "pages": 0,
-                            "per_page": per_page,
-                            "total": 0,
-                            "has_next": False,
-                            "has_prev": False,
-                        },
-                        "message": "No posts found from users with similar interests.",
-                    }
+                posts = posts_query.order_by(desc(Post.created_at)).paginate(
+                    page=page, per_page=per_page, error_out=False
                 )
 
-            # Get posts from these users
-            posts = (
-                Post.query.filter(Post.creator.in_(similar_user_ids))
-                .order_by(desc(Post.created_at))
-                .paginate(page=page, per_page=per_page, error_out=False)
-            )
+        except ValueError:
+            return jsonify({"errors": {"message": "Invalid cursor"}}), 400
 
         except Exception as query_error:
             logger.error(f"Error finding similar users: {query_error}")
             return jsonify(
                 {
                     "posts": [],
-                    "pagination": {
-                        "page": page,
-                        "pages": 0,
-                        "per_page": per_page,
-                        "total": 0,
-                        "has_next": False,
-                        "has_prev": False,
-                    },
+                    "pagination": empty_pagination,
                     "message": "Error finding similar users.",
                 }
             )
@@ -227,73 +177,18 @@ def similar_posts_feed():
             return jsonify(
                 {
                     "posts": [],
-                    "pagination": {
-                        "page": page,
-                        "pages": 0,
-                        "per_page": per_page,
-                        "total": 0,
-                        "has_next": False,
-                        "has_prev": False,
-                    },
+                    "pagination": (
+                        posts.pagination() if use_cursor else empty_pagination
+                    ),
                     "message": "No posts found from users with similar interests.",
                 }
             )
 
-        # Build response
-        posts_data = []
-        for post in posts.items:
-            try:
-                # Load user
-                user_data = None
-                if post.creator:
-                    user = User.query.get(post.creator)
-                    if user:
-                        user_data = {
-                            "id": user.id,
-                            "username": user.username,
-                            "firstName": user.first_name or "",
-                            "lastName": user.last_name or "",
-                            "profileImage": user.profile_image_url or "",
-                        }
-
-                # Get counts
-                like_count = (
-                    db.session.execute(
-                        text("SELECT COUNT(*) FROM likes WHERE post_id = :post_id"),
-                        {"post_id": post.id},
-                    ).scalar()
-                    or 0
-                )
+        # Creators and counts for the whole page in grouped queries
+        posts_data = serialize_feed_posts(posts.items)
 
-                comment_count = (
-                    db.session.execute(
-                        text("SELECT COUNT(*) FROM comments WHERE post_id = :post_id"),
-                        {"post_id": post.id},
-                    ).scalar()
-                    or 0
-                )
-
-                post_dict = {
-                    "id": post.id,
-                    "title": post.title or "",
-                    "caption": post.caption or "",
-                    "creator": post.creator,
-                    "image": post.image or "",
-                    "likes": like_count,
-                    "comments": comment_count,
-                    "createdAt": (
-                        post.created_at.isoformat() if post.created_at else None
-                    ),
-                    "updatedAt": (
-                        post.updated_at.isoformat() if post.updated_at else None
-                    ),
-                    "user": user_data,
-                }
-                posts_data.append(post_dict)
-
-            except Exception as post_error:
-                logger.warning(f"Error processing similar post {post.id}: {post_error}")
-                continue
+        if use_cursor:
+            return jsonify({"posts": posts_data, "pagination": posts.pagination()})
 
         return jsonify(
             {
@@ -325,105 +220,28 @@ def posts_feed_stats():
         total_posts = db.session.query(func.count(Post.id)).scalar() or 0
 
         # Get similar users and posts count
-        similar_users_count = 0
+        similar_users = 0
         similar_posts_count = 0
 
         if current_user.users_tags:
-            user_tag_ids = [tag.id for tag in current_user.users_tags]
-
             try:
-                if len(user_tag_ids) == 1:
-                    # Single tag case
-                    similar_users_count = (
-                        db.session.execute(
-                            text(
-                                """
-                            SELECT COUNT(DISTINCT user_id) 
-                            FROM user_tags 
-                            WHERE tag_id = :tag_id 
-                            AND user_id != :current_user_id
-                        """
-                            ),
-                            {
-                                "tag_id": user_tag_ids[0],
-                                "current_user_id": current_user.id,
-                            },
-                        ).scalar()
-                        or 0
-                    )
-                else:
-                    # Multiple tags case
-                    tag_conditions = []
-                    params = {"current_user_id": current_user.id}
-
-                    for i, tag_id in enumerate(user_tag_ids):
-                        tag_conditions.append(f"tag_id = :tag_id_{i}")
-                        params[f"tag_id_{i}"] = tag_id
-
-                    query = f"""
-                        SELECT COUNT(DISTINCT user_id) 
-                        FROM user_tags 
-                        WHERE ({' OR '.join(tag_conditions)})
-                        AND user_id != :current_user_id
-                    """
-
-                    similar_users_count = (
-                        db.session.execute(text(query), params).scalar() or 0
-                    )
+                similar_users = similar_users_count(current_user.id)
 
                 # Count posts from similar users if any exist
-                if similar_users_count > 0:
-                    if len(user_tag_ids) == 1:
-                        similar_user_ids_result = db.session.execute(
-                            text(
-                                """
-                                SELECT DISTINCT user_id 
-                                FROM user_tags 
-                                WHERE tag_id = :tag_id 
-                                AND user_id != :current_user_id
-                            """
-                            ),
-                            {
-                                "tag_id": user_tag_ids[0],
-                                "current_user_id": current_user.id,
-                            },
-                        ).fetchall()
-                    else:
-                        similar_user_ids_result = db.session.execute(
-                            text(query), params
-                        ).fetchall()
-
-                    similar_user_ids = [row[0] for row in similar_user_ids_result]
-
-                    if similar_user_ids:
-                        posts_count_query = "SELECT COUNT(*) FROM posts WHERE "
-                        posts_count_conditions = []
-                        posts_params = {}
-
-                        for i, user_id in enumerate(similar_user_ids):
-                            posts_count_conditions.append(f"creator = :user_id_{i}")
-                            posts_params[f"user_id_{i}"] = user_id
-
-                        posts_count_query += (
-                            "(" + " OR ".join(posts_count_conditions) + ")"
-                        )
-
-                        similar_posts_count = (
-                            db.session.execute(
-                                text(posts_count_query), posts_params
-                            ).scalar()
-                            or 0
-                        )
+                if similar_users > 0:
+                    similar_posts_count = (
+                        similar_posts_query(current_user.id).order_by(None).count()
+                    )
 
             except Exception as stats_error:
                 logger.warning(f"Error calculating similar stats: {stats_error}")
-                similar_users_count = 0
+                similar_users = 0
                 similar_posts_count = 0
 
         return jsonify(
             {
                 "totalPosts": total_posts,
-                "similarUsers": similar_users_count,
+                "similarUsers": similar_users,
                 "similarPosts": similar_posts_count,
                 "userTags": (
                     len(current_user.users_tags) if current_user.users_tags else 0
@@ -441,75 +259,22 @@ def posts_feed_stats():
 def batch_posts_feed():
     """
     Returns both all posts and similar posts data in a single API call
+
+    Built in one pass by FeedBatch: the pages, creators and stats share
+    their queries instead of calling the three feed endpoints.
     """
     try:
         page = request.args.get("page", 1, type=int)
         per_page = min(request.args.get("per_page", 20, type=int), 50)
 
-        # Get stats safely
-        try:
-            stats_response = posts_feed_stats()
-            stats_data = (
-                stats_response.get_json() if hasattr(stats_response, "get_json") else {}
-            )
-        except Exception:
-            stats_data = {
-                "totalPosts": 0,
-                "similarUsers": 0,
-                "similarPosts": 0,
-                "userTags": 0,
-            }
-
-        # Get all posts safely
-        try:
-            all_posts_response = all_posts_feed()
-            if isinstance(all_posts_response, tuple) and all_posts_response[1] != 200:
-                all_posts_data = {"posts": [], "pagination": {}}
-            else:
-                all_posts_data = (
-                    all_posts_response.get_json()
-                    if hasattr(all_posts_response, "get_json")
-                    else {"posts": [], "pagination": {}}
-                )
-        except Exception:
-            all_posts_data = {"posts": [], "pagination": {}}
-
-        # Get similar posts safely
-        try:
-            similar_posts_response = similar_posts_feed()
-            if (
-                isinstance(similar_posts_response, tuple)
-                and similar_posts_response[1] != 200
-            ):
-                similar_posts_data = {
-                    "posts": [],
-                    "pagination": {},
-                    "message": "Error loading similar posts",
-                }
-            else:
-                similar_posts_data = (
-                    similar_posts_response.get_json()
-                    if hasattr(similar_posts_response, "get_json")
-                    else {"posts": [], "pagination": {}}
-                )
-        except Exception:
-            similar_posts_data = {
-                "posts": [],
-                "pagination": {},
-                "message": "Error loading similar posts",
-            }
-
-        return jsonify(
-            {
-                "allPosts": all_posts_data.get("posts", []),
-                "similarPosts": similar_posts_data.get("posts", []),
-                "allPostsPagination": all_posts_data.get("pagination", {}),
-                "similarPostsPagination": similar_posts_data.get("pagination", {}),
-                "stats": stats_data,
-                "message": similar_posts_data.get("message"),
-                "activeTab": "all",
-            }
+        batch = FeedBatch(
+            current_user,
+            page,
+            per_page,
+            cursor=request.args.get("cursor"),
+            include_total=request.args.get("include_total", "").lower() == "true",
         )
+        return jsonify(batch.build())
 
     except Exception as e:
         logger.error(f"Error in batch_posts_feed: {str(e)}")
@@ -550,14 +315,12 @@ def post(postId):
                 joinedload(Post.user).load_only(
                     "id", "username", "first_name", "last_name", "profile_image_url"
                 ),
-                # Load ALL comments with their respective user data AND like data
+                # Load ALL comments with their respective user data
                 selectinload(Post.post_comments).options(
                     # Load commenter for EVERY comment
                     joinedload(Comment.commenter).load_only(
                         "id", "username", "first_name", "last_name", "profile_image_url"
                     ),
-                    # Load like data for comments
-                    selectinload(Comment.comment_likes),
                 ),
             )
             .filter(Post.id == postId)
@@ -567,13 +330,12 @@ def post(postId):
         if not post:
             return jsonify({"errors": {"message": "Not Found"}}), 404
 
-        # Get like count
-        like_count = (
-            db.session.execute(
-                text("SELECT COUNT(*) FROM likes WHERE post_id = :post_id"),
-                {"post_id": postId},
-            ).scalar()
-            or 0
+        # Like count from the denormalized counter
+        like_count = post.like_count or 0
+
+        # Comment like counts are on the rows; the user's likes in one IN query
+        liked_comment_ids = CommentLike.liked_comment_ids(
+            current_user.id, [comment.id for comment in post.post_comments]
         )
 
         # Build response with PROPER commenter data AND like data for ALL comments
@@ -631,20 +393,8 @@ def post(postId):
                         }
                     ),
                     # Include like data for EVERY comment
-                    "likes": (
-                        len(comment.comment_likes)
-                        if hasattr(comment, "comment_likes") and comment.comment_likes
-                        else 0
-                    ),
-                    "isLiked": any(
-                        like.user_id == current_user.id
-                        for like in (
-                            comment.comment_likes
-                            if hasattr(comment, "comment_likes")
-                            and comment.comment_likes
-                            else []
-                        )
-                    ),
+                    "likes": comment.like_count or 0,
+                    "isLiked": comment.id in liked_comment_ids,
                 }
                 for comment in post.post_comments
             ],
@@ -782,6 +532,13 @@ def delete_post(postId):
             return {"errors": {"message": "Unauthorized"}}, 401
 
         # Use efficient bulk delete operations with raw SQL
+        db.session.execute(
+            text(
+                "DELETE FROM comment_closure WHERE descendant_id IN "
+                "(SELECT id FROM comments WHERE post_id = :post_id)"
+            ),
+            {"post_id": postId},
+        )
         db.session.execute(
             text("DELETE FROM comments WHERE post_id = :post_id"), {"post_id": postId}
         )
@@ -833,6 +590,7 @@ def add_comment(postId):
             )
 
             db.session.add(comment)
+            Post.adjust_counters(postId, comments=1)
             db.session.commit()
 
             # Return minimal comment data for faster response
@@ -883,13 +641,11 @@ def delete_comment(postId, commentId):
         if comment.user_id != current_user.id:
             return jsonify({"errors": {"message": "Unauthorized"}}), 403
 
-        # Delete nested replies efficiently using raw SQL
-        db.session.execute(
-            text("DELETE FROM comments WHERE parent_id = :comment_id"),
-            {"comment_id": commentId},
-        )
+        # Delete the comment and every nested reply via the closure table
+        Comment.delete_threads([commentId])
 
-        db.session.delete(comment)
+        # Replies were removed in bulk, so recount instead of decrementing
+        Post.refresh_counters([postId])
         db.session.commit()
 
         return jsonify({"message": "Comment deleted successfully"}), 200
@@ -972,62 +728,86 @@ def get_post_like_status(postId):
         return jsonify({"errors": {"message": "Internal server error"}}), 500
 
 
-@post_routes.route("/<int:postId>/like", methods=["POST"])
+@post_routes.route("/batch-like-status", methods=["POST"])
 @login_required
-def like_post(postId):
+def get_batch_post_like_status():
     """
-    Toggle post like - like if not liked, unlike if already liked
+    Get like status and count for multiple posts at once
     """
     try:
-        # Check if post exists
-        post_exists = db.session.execute(
-            text("SELECT 1 FROM posts WHERE id = :post_id"), {"post_id": postId}
-        ).fetchone()
+        data = request.get_json(silent=True) or {}
+        post_ids = data.get("postIds", [])
 
-        if not post_exists:
-            return jsonify({"errors": {"message": "Post not found"}}), 404
+        if not isinstance(post_ids, list) or not all(
+            isinstance(post_id, int) for post_id in post_ids
+        ):
+            return jsonify({"errors": {"message": "postIds must be a list of ids"}}), 400
 
-        # Check current like status
-        is_currently_liked = db.session.execute(
-            text("SELECT 1 FROM likes WHERE user_id = :user_id AND post_id = :post_id"),
-            {"user_id": current_user.id, "post_id": postId},
-        ).fetchone()
-
-        if is_currently_liked:
-            # Unlike the post
-            db.session.execute(
-                text(
-                    "DELETE FROM likes WHERE user_id = :user_id AND post_id = :post_id"
-                ),
-                {"user_id": current_user.id, "post_id": postId},
-            )
-            action = "unliked"
-        else:
-            # Like the post
-            db.session.execute(
-                text(
-                    "INSERT INTO likes (user_id, post_id) VALUES (:user_id, :post_id)"
+        if len(post_ids) > MAX_BATCH_LIKE_STATUS_IDS:
+            return (
+                jsonify(
+                    {
+                        "errors": {
+                            "message": f"At most {MAX_BATCH_LIKE_STATUS_IDS} posts per request"
+                        }
+                    }
                 ),
-                {"user_id": current_user.id, "post_id": postId},
+                400,
             )
-            action = "liked"
 
-        db.session.commit()
+        if not post_ids:
+            return jsonify({"statuses": {}})
 
-        # Get updated like count
-        new_like_count = (
-            db.session.execute(
-                text("SELECT COUNT(*) FROM likes WHERE post_id = :post_id"),
-                {"post_id": postId},
-            ).scalar()
-            or 0
+        # Counter plus the current user's like row, one query for every post
+        rows = (
+            db.session.query(Post.id, Post.like_count, Likes.c.user_id)
+            .outerjoin(
+                Likes,
+                (Likes.c.post_id == Post.id) & (Likes.c.user_id == current_user.id),
+            )
+            .filter(Post.id.in_(set(post_ids)))
+            .all()
         )
+        found = {
+            post_id: {"isLiked": user_id is not None, "likeCount": like_count or 0}
+            for post_id, like_count, user_id in rows
+        }
+
+        statuses = {
+            post_id: found.get(post_id, {"isLiked": False, "likeCount": 0})
+            for post_id in post_ids
+        }
+
+        return jsonify({"statuses": statuses})
+
+    except Exception as e:
+        logger.error(f"Error getting batch post like status: {str(e)}")
+        return jsonify({"errors": {"message": "Internal server error"}}), 500
+
+
+@post_routes.route("/<int:postId>/like", methods=["POST"])
+@login_required
+def like_post(postId):
+    """
+    Toggle post like - like if not liked, unlike if already liked
+    """
+    try:
+        # Existence check, insert-or-delete and new count in one round trip
+        result = Post.toggle_like(postId, current_user.id)
+
+        if result is None:
+            db.session.rollback()
+            return jsonify({"errors": {"message": "Post not found"}}), 404
+
+        is_liked, new_like_count = result
+        db.session.commit()
+        action = "liked" if is_liked else "unliked"
 
         return jsonify(
             {
                 "success": True,
                 "action": action,
-                "isLiked": action == "liked",
+                "isLiked": is_liked,
                 "likeCount": new_like_count,
                 "postId": postId,
             }
@@ -1,6 +1,8 @@
 from flask import Blueprint, jsonify, request
 from flask_login import login_required, current_user
 from app.models import db, User, Tag
+from app.utilities.tag_catalog import tag_catalog, top_tags
+from app.utilities.response_policy import etag_response
 from sqlalchemy.orm import load_only
 
 tag_routes = Blueprint("tags", __name__)
@@ -9,59 +11,43 @@ tag_routes = Blueprint("tags", __name__)
 @tag_routes.route("")
 def tags():
     """
-    Query for all tags and returns them in a list of tag dictionaries - with caching consideration
+    Returns all tags in a list of tag dictionaries, from the in-memory tag
+    catalog. Sends an ETag and answers If-None-Match with 304.
     """
-    # Since tags are relatively static, we can load them efficiently
-    # Consider adding Redis caching here in production for even better performance
-    tags = Tag.query.options(load_only("id", "name")).order_by(Tag.name).all()
-
-    return jsonify({"tags": [tag.to_dict() for tag in tags]})
+    index = tag_catalog.get()
+    return etag_response(index.body, index.etag)
 
 
 @tag_routes.route("/<int:tagId>")
 def tag_detail(tagId):
     """
-    Query for a tag by id and returns that tag in a dictionary - with selective loading
+    Returns a tag by id in a dictionary, from the in-memory tag catalog
     """
-    tag = Tag.query.options(load_only("id", "name")).filter_by(id=tagId).first()
+    tag = tag_catalog.get().by_id.get(tagId)
 
     if not tag:
         return jsonify({"errors": {"message": "Tag not found"}}), 404
 
-    return jsonify(tag.to_dict())
+    return jsonify(tag)
 
 
 @tag_routes.route("/popular")
 def popular_tags():
     """
-    Get most popular tags based on user usage - query
+    Get most popular tags by how many users hold them, from the in-memory
+    top list (refreshed from the tags' user_count every few seconds)
     """
     limit = request.args.get("limit", 10, type=int)
     limit = min(limit, 50)  # Cap at 50 for performance
 
-    # Get popular tags by counting users
-    popular_tags = (
-        db.session.query(Tag, db.func.count(Tag.tags_users).label("user_count"))
-        .join(Tag.tags_users)
-        .group_by(Tag.id)
-        .order_by(db.func.count(Tag.tags_users).desc())
-        .limit(limit)
-        .all()
-    )
-
-    result = []
-    for tag, count in popular_tags:
-        tag_dict = tag.to_dict()
-        tag_dict["user_count"] = count
-        result.append(tag_dict)
-
-    return jsonify({"popular_tags": result})
+    return jsonify({"popular_tags": top_tags.top(max(limit, 0))})
 
 
 @tag_routes.route("/search")
 def search_tags():
     """
-    Search tags by name - with ILIKE for case-insensitive search
+    Case-insensitive tag search by name, answered from the in-memory tag
+    catalog. Names starting with q come first, then names containing it.
     """
     query = request.args.get("q", "").strip()
     limit = request.args.get("limit", 20, type=int)
@@ -70,16 +56,7 @@ def search_tags():
     if not query:
         return jsonify({"tags": []})
 
-    # Case-insensitive search
-    tags = (
-        Tag.query.options(load_only("id", "name"))
-        .filter(Tag.name.ilike(f"%{query}%"))
-        .order_by(Tag.name)
-        .limit(limit)
-        .all()
-    )
-
-    return jsonify({"tags": [tag.to_dict() for tag in tags]})
+    return jsonify({"tags": tag_catalog.get().search(query, limit)})
 
 
 @tag_routes.route("/user/<int:userId>")
@@ -6,18 +6,29 @@ from app.models import (
     Group,
     Event,
     Post,
+    Likes,
     UserTags,
     Tag,
     Attendance,
+    EventWaitlist,
     Membership,
     Comment,
     Venue,
 )
 from app.forms import UserForm, EditUserForm, PostForm, EditPostForm
 from app.aws import get_unique_filename, upload_file_to_s3, remove_file_from_s3
+from app.utilities.user_similarity import refresh_user_similarity
+from app.utilities.user_cache import user_cache
+from app.utilities.tag_catalog import tag_catalog, bump_tag_catalog_version
+from app.utilities.response_cache import response_cache
+from app.utilities.session_bootstrap import (
+    bump_profile_version,
+    bump_group_versions,
+    bump_event_versions,
+)
+from app.utilities import event_attendance as attendance
 from sqlalchemy.orm import joinedload, selectinload
-from sqlalchemy import func, and_
-import requests
+from sqlalchemy import func, and_, or_
 import json
 
 user_routes = Blueprint("users", __name__)
@@ -67,9 +78,9 @@ def user(userId):
             selectinload(User.users_tags).load_only("id", "name"),
             selectinload(User.memberships)
             .joinedload(Membership.group)
-            .load_only("id", "name", "image", "city", "state"),
+            .load_only("id", "name", "image", "city", "state", "member_count"),
             selectinload(User.attendances).load_only("id", "event_id"),
-            selectinload(User.groups).load_only("id", "name", "image"),
+            selectinload(User.groups).load_only("id", "name", "image", "member_count"),
         )
         .filter(User.id == userId)
         .first()
@@ -78,12 +89,9 @@ def user(userId):
     if not user:
         return jsonify({"errors": {"message": "User not found"}}), 404
 
-    # Load posts with pagination and minimal data
+    # Load posts with pagination and minimal data - counts come from counters
     posts = (
         db.session.query(Post)
-        .options(
-            selectinload(Post.post_likes).load_only("id"),
-        )
         .filter(Post.creator == userId)
         .order_by(Post.created_at.desc())
         .limit(20)  # Limit recent posts
@@ -206,12 +214,24 @@ def update_profile(userId):
         # Efficient tag update
         if form.userTags.data:
             # Clear existing tags and add new ones in one operation
+            old_tag_ids = {tag.id for tag in user_to_edit.users_tags}
             user_to_edit.users_tags.clear()
             selected_tags = form.userTags.data
             tags_to_add = Tag.query.filter(Tag.name.in_(selected_tags)).all()
             user_to_edit.users_tags.extend(tags_to_add)
 
+            # Re-pair this user against everyone sharing the new tags
+            db.session.flush()
+            refresh_user_similarity(user_to_edit.id)
+
+            new_tag_ids = {tag.id for tag in tags_to_add}
+            Tag.adjust_user_counts(new_tag_ids - old_tag_ids, 1)
+            Tag.adjust_user_counts(old_tag_ids - new_tag_ids, -1)
+
+        bump_profile_version(user_to_edit.id)
         db.session.commit()
+        user_cache.invalidate(user_to_edit.id)
+        response_cache.invalidate(f"user:{user_to_edit.id}")
 
         # Return minimal response for faster update
         return {"profile": user_to_edit.to_dict_auth()}, 201
@@ -234,6 +254,49 @@ def delete_profile(userId):
         return jsonify({"errors": {"message": "Unauthorized"}}), 403
 
     try:
+        # Posts whose like/comment counters change once this user's rows go
+        affected_post_ids = {
+            row[0]
+            for row in db.session.query(Likes.c.post_id)
+            .filter(Likes.c.user_id == userId)
+            .union(
+                db.session.query(Comment.post_id).filter(Comment.user_id == userId)
+            )
+            .all()
+        }
+
+        # Groups and events whose member/attendee counters drop with this user
+        joined_group_ids = [
+            group_id
+            for (group_id,) in db.session.query(Membership.group_id).filter(
+                Membership.user_id == userId
+            )
+        ]
+        attended_event_ids = [
+            event_id
+            for (event_id,) in db.session.query(Attendance.event_id).filter(
+                Attendance.user_id == userId
+            )
+        ]
+
+        # Other members and attendees see this user's groups and events change
+        organized_group_ids = db.session.query(Group.id).filter(
+            Group.organizer_id == userId
+        )
+        bump_group_versions(
+            db.session.query(Membership.group_id)
+            .filter(Membership.user_id == userId)
+            .union(organized_group_ids)
+        )
+        organized_event_ids = db.session.query(Event.id).filter(
+            Event.group_id.in_(organized_group_ids)
+        )
+        bump_event_versions(
+            db.session.query(Attendance.event_id)
+            .filter(Attendance.user_id == userId)
+            .union(organized_event_ids)
+        )
+
         # Use efficient bulk delete operations
         # Delete in correct order to avoid foreign key constraints
 
@@ -246,10 +309,23 @@ def delete_profile(userId):
         db.session.execute(
             "DELETE FROM memberships WHERE user_id = :user_id", {"user_id": userId}
         )
+        Group.refresh_member_counts(joined_group_ids)
+        Event.refresh_attendee_counts(attended_event_ids)
+
+        # Leave every waitlist, and clear the ones of events going with
+        # this user's groups, then hand the freed seats to whoever is next
+        db.session.query(EventWaitlist).filter(
+            or_(
+                EventWaitlist.user_id == userId,
+                EventWaitlist.event_id.in_(organized_event_ids),
+            )
+        ).delete(synchronize_session=False)
+        for event_id in attended_event_ids:
+            attendance.promote(event_id)
 
-        # Delete comments
-        db.session.execute(
-            "DELETE FROM comments WHERE user_id = :user_id", {"user_id": userId}
+        # Delete comments along with any replies beneath them
+        Comment.delete_threads(
+            db.session.query(Comment.id).filter(Comment.user_id == userId)
         )
 
         # Delete post likes
@@ -262,11 +338,21 @@ def delete_profile(userId):
             "DELETE FROM posts WHERE creator = :user_id", {"user_id": userId}
         )
 
-        # Delete user tags
+        # Delete user tags, taking them off their tags' user counts
+        user_tag_ids = [
+            tag_id
+            for (tag_id,) in db.session.query(UserTags.c.tag_id).filter(
+                UserTags.c.user_id == userId
+            )
+        ]
+        Tag.adjust_user_counts(user_tag_ids, -1)
         db.session.execute(
             "DELETE FROM user_tags WHERE user_id = :user_id", {"user_id": userId}
         )
 
+        # Drop this user's similarity pairs now that they have no tags
+        refresh_user_similarity(userId)
+
         # Handle groups organized by the user
         groups_to_delete = Group.query.filter_by(organizer_id=userId).all()
         for group in groups_to_delete:
@@ -275,9 +361,17 @@ def delete_profile(userId):
             Venue.query.filter_by(group_id=group.id).delete(synchronize_session=False)
             db.session.delete(group)
 
+        # Recount the other users' posts this profile had liked or commented on
+        Post.refresh_counters(affected_post_ids)
+
         # Delete the user
         db.session.delete(user)
         db.session.commit()
+        user_cache.invalidate(userId)
+        # Memberships, attendances and organized groups went with the user
+        response_cache.invalidate(
+            f"user:{userId}", "groups:list", "events:list", "venues:list"
+        )
 
         return jsonify({"message": "Profile deleted successfully"}), 200
 
@@ -312,20 +406,35 @@ def add_tags(userId):
 
         # Get or create new tags efficiently
         tags_to_add = []
+        created_tags = False
         for tag_name in new_tag_names:
             if tag_name not in existing_tag_names:
                 tag = Tag.query.filter_by(name=tag_name).first()
                 if not tag:
                     tag = Tag(name=tag_name)
                     db.session.add(tag)
+                    created_tags = True
                 tags_to_add.append(tag)
 
+        if created_tags:
+            bump_tag_catalog_version()
+
         # Flush to get IDs for new tags
         db.session.flush()
 
         # Add tags to user
         user.users_tags.extend(tags_to_add)
+
+        if tags_to_add:
+            db.session.flush()
+            refresh_user_similarity(user.id)
+            Tag.adjust_user_counts({tag.id for tag in tags_to_add}, 1)
+            bump_profile_version(user.id)
+
         db.session.commit()
+        user_cache.invalidate(user.id)
+        if created_tags:
+            tag_catalog.invalidate()
 
         return jsonify({"message": "Tags added successfully"}), 200
 
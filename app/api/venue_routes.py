@@ -9,39 +9,70 @@ from app.models import (
 )
 
 from app.forms import VenueForm
+from app.utilities.session_bootstrap import bump_venue_versions
+from app.utilities.response_cache import response_cache, cached
+from app.utilities.geo import parse_near, order_by_distance, near_info, NEAR_PARAMS
 from sqlalchemy.orm import joinedload
 
 venue_routes = Blueprint("venues", __name__)
 
 
+# Query arguments the list reads, and so the cache key
+VENUE_LIST_PARAMS = ("page", "per_page") + NEAR_PARAMS
+
+
+def _venue_list_tags(body):
+    """Cache tags for a page of venues: the list and each venue"""
+    yield "venues:list"
+    for venue in body["venues"]:
+        yield f"venue:{venue['id']}"
+
+
 @venue_routes.route("/")
+@cached(_venue_list_tags, VENUE_LIST_PARAMS)
 def all_venues():
     """
     Query for all venues and returns them in a list of venue dictionaries - with pagination
+    ?near=lat,lng&radius= (miles) returns the venues within radius, nearest first.
     """
     page = request.args.get("page", 1, type=int)
     per_page = min(request.args.get("per_page", 20, type=int), 50)
 
+    try:
+        near = parse_near(request.args)
+    except ValueError as e:
+        return jsonify({"errors": {"message": str(e)}}), 400
+
     # Paginate for better performance
-    venues_query = Venue.query.order_by(Venue.created_at.desc())
+    if near:
+        distances = {hit[0]: hit[2] for hit in Venue.within(*near)}
+        venues_query = order_by_distance(Venue.query, Venue.id, distances)
+    else:
+        venues_query = Venue.query.order_by(Venue.created_at.desc())
     venues = venues_query.paginate(page=page, per_page=per_page, error_out=False)
 
     if not venues.items:
         return jsonify({"errors": {"message": "Not Found"}}), 404
 
-    return jsonify(
-        {
-            "venues": [venue.to_dict() for venue in venues.items],
-            "pagination": {
-                "page": page,
-                "pages": venues.pages,
-                "per_page": per_page,
-                "total": venues.total,
-                "has_next": venues.has_next,
-                "has_prev": venues.has_prev,
-            },
-        }
-    )
+    venue_dicts = [venue.to_dict() for venue in venues.items]
+    if near:
+        for venue_dict in venue_dicts:
+            venue_dict["distance"] = round(distances[venue_dict["id"]], 2)
+
+    body = {
+        "venues": venue_dicts,
+        "pagination": {
+            "page": page,
+            "pages": venues.pages,
+            "per_page": per_page,
+            "total": venues.total,
+            "has_next": venues.has_next,
+            "has_prev": venues.has_prev,
+        },
+    }
+    if near:
+        body["near"] = near_info(near)
+    return jsonify(body)
 
 
 @venue_routes.route("/<int:venueId>")
@@ -99,7 +130,12 @@ def edit_venue(venueId):
         venue_to_edit.latitude = form.data["latitude"] or venue_to_edit.latitude
         venue_to_edit.longitude = form.data["longitude"] or venue_to_edit.longitude
 
+        # Attendees see the venue address on their events
+        bump_venue_versions([venueId])
         db.session.commit()
+        # Event lists show venue addresses but not venue ids, and moving a
+        # venue changes every near search (tagged venues:list)
+        response_cache.invalidate(f"venue:{venueId}", "events:list", "venues:list")
         return venue_to_edit.to_dict(), 200
 
     return form.errors, 400
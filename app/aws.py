@@ -1,16 +1,25 @@
-import boto3
-import botocore
 import os
 import uuid
+from functools import lru_cache
 from flask_wtf import FlaskForm
 from flask_wtf.file import FileField, FileAllowed, FileRequired
 from wtforms import SubmitField
 
-s3 = boto3.client(
-    "s3",
-    aws_access_key_id=os.environ.get("S3_KEY"),
-    aws_secret_access_key=os.environ.get("S3_SECRET"),
-)
+
+@lru_cache(maxsize=None)
+def get_s3_client():
+    """
+    The S3 client, created on the first upload or delete. boto3 is slow to
+    import and set up, and most workers never touch S3 before they recycle.
+    """
+    import boto3
+
+    return boto3.client(
+        "s3",
+        aws_access_key_id=os.environ.get("S3_KEY"),
+        aws_secret_access_key=os.environ.get("S3_SECRET"),
+    )
+
 
 ALLOWED_EXTENSIONS = {"pdf", "png", "jpg", "jpeg", "gif"}
 
@@ -27,7 +36,7 @@ S3_LOCATION = f"http://{BUCKET_NAME}.s3.amazonaws.com/"
 
 def upload_file_to_s3(file, acl="public-read"):
     try:
-        s3.upload_fileobj(
+        get_s3_client().upload_fileobj(
             file,
             BUCKET_NAME,
             file.filename,
@@ -45,7 +54,7 @@ def remove_file_from_s3(image_url):
     # so you split that out of the URL
     key = image_url.rsplit("/", 1)[1]
     try:
-        s3.delete_object(Bucket=BUCKET_NAME, Key=key)
+        get_s3_client().delete_object(Bucket=BUCKET_NAME, Key=key)
     except Exception as e:
         return {"errors": str(e)}
     return True
@@ -0,0 +1,124 @@
+import click
+from flask.cli import AppGroup
+from app.models import db
+from .login import benchmark_login
+from .startup import profile_startup
+from .group_search import benchmark_group_search
+from .attendance import benchmark_attendance
+
+# Creates a bench group to hold the performance benchmarks
+bench_commands = AppGroup("bench")
+
+
+@bench_commands.command("login")
+@click.option("--email", default="demo@aa.io", show_default=True)
+@click.option("--password", default="password", show_default=True)
+@click.option("--concurrency", default="1,2,4,8,16", show_default=True)
+@click.option("--requests", "requests_per_level", default=64, show_default=True)
+def bench_login(email, password, concurrency, requests_per_level):
+    """Login throughput through the password hashing pool at several concurrencies"""
+    levels = [int(level) for level in concurrency.split(",") if level.strip()]
+    rows = benchmark_login(email, password, levels, requests_per_level)
+
+    print(
+        f"{'conc':>5} {'reqs':>5} {'ok':>5} {'503':>5} {'other':>5} "
+        f"{'req/s':>8} {'p50 ms':>8} {'p95 ms':>8}"
+    )
+    for row in rows:
+        print(
+            f"{row['concurrency']:>5} {row['requests']:>5} {row['ok']:>5} "
+            f"{row['busy']:>5} {row['other']:>5} {row['throughput']:>8.1f} "
+            f"{row['p50'] * 1000:>8.1f} {row['p95'] * 1000:>8.1f}"
+        )
+
+
+@bench_commands.command("group-search")
+@click.option("--groups", "total", default=100000, show_default=True)
+@click.option(
+    "--search",
+    "searches",
+    multiple=True,
+    default=("support", "sober morning", "gui", "riverside hikers", "zzz"),
+    show_default=True,
+)
+@click.option("--repeat", default=5, show_default=True)
+def bench_group_search(total, searches, repeat):
+    """Group search latency, ILIKE vs full-text, on a table of --groups rows"""
+    rows = benchmark_group_search(total, searches, repeat)
+
+    print(
+        f"{'search':<20} {'ilike ms':>9} {'hits':>7} {'fts ms':>9} {'hits':>7}"
+    )
+    for search, old_time, old_total, new_time, new_total in rows:
+        print(
+            f"{search:<20} {old_time * 1000:>9.1f} {old_total:>7} "
+            f"{new_time * 1000:>9.1f} {new_total:>7}"
+        )
+    print("Generated groups were rolled back")
+
+
+@bench_commands.command("attendance")
+@click.option("--users", default=200, show_default=True)
+@click.option("--capacity", default=50, show_default=True)
+@click.option("--threads", default=16, show_default=True)
+@click.option("--rounds", default=3, show_default=True)
+def bench_attendance(users, capacity, threads, rounds):
+    """Concurrent attend/leave on one event; fails if capacity is ever exceeded"""
+    rows, failures = benchmark_attendance(users, capacity, threads, rounds)
+
+    print(f"{db.engine.dialect.name}: {users} users, capacity {capacity}, {threads} threads")
+    print(
+        f"{'phase':<7} {'calls':>6} {'calls/s':>8} {'peak':>5} {'seated':>7} "
+        f"{'waiting':>8} {'dupes':>6} {'retries':>8}"
+    )
+    for phase, calls, wall, peak, seated, waiting, stats in rows:
+        print(
+            f"{phase:<7} {calls:>6} {calls / wall if wall else 0.0:>8.1f} {peak:>5} "
+            f"{seated:>7} {waiting:>8} {stats.get('duplicates', 0):>6} "
+            f"{stats.get('retries', 0):>8}"
+        )
+    print("Temporary users, group and event were deleted")
+
+    if failures:
+        raise click.ClickException("; ".join(failures))
+    print("Capacity held and the waitlist was promoted in order")
+
+
+@click.command("startup-profile")
+@click.option("--top", default=15, show_default=True, help="Rows per table")
+@click.option("--eager", is_flag=True, help="Profile with LAZY_IMPORTS off")
+@click.option(
+    "--budget-ms",
+    type=float,
+    help="Exit non-zero if importing the app takes longer than this",
+)
+def startup_profile(top, eager, budget_ms):
+    """Import and create_app time, broken down by module"""
+    timings = profile_startup(lazy=not eager)
+
+    print(f"Lazy imports: {'off' if eager else 'on'}")
+    print(f"import app (incl. create_app): {timings['import'] * 1000:8.1f} ms")
+    print(f"create_app() again:            {timings['create_app'] * 1000:8.1f} ms")
+
+    print(f"\n{'package':<40} {'self ms':>9}")
+    packages = sorted(timings["packages"].items(), key=lambda p: p[1], reverse=True)
+    for name, self_time in packages[:top]:
+        print(f"{name:<40} {self_time * 1000:>9.1f}")
+
+    print(f"\n{'app module':<40} {'self ms':>9} {'cumul ms':>9}")
+    app_modules = [
+        (name, times)
+        for name, times in timings["modules"].items()
+        if name == "app" or name.startswith("app.")
+    ]
+    app_modules.sort(key=lambda m: m[1][1], reverse=True)
+    for name, (self_time, cumulative) in app_modules[:top]:
+        print(f"{name:<40} {self_time * 1000:>9.1f} {cumulative * 1000:>9.1f}")
+
+    if budget_ms is not None:
+        total_ms = timings["import"] * 1000
+        if total_ms > budget_ms:
+            raise click.ClickException(
+                f"Startup took {total_ms:.0f} ms, over the {budget_ms:.0f} ms budget"
+            )
+        print(f"\nWithin the {budget_ms:.0f} ms budget ({total_ms:.0f} ms)")
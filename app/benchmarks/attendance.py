@@ -0,0 +1,274 @@
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError, OperationalError
+from app.models import db, User, Group, Event, Attendance, EventWaitlist
+from app.utilities import event_attendance as attendance
+
+RETRIES = 20
+
+
+def _create_fixture(users, capacity, tag):
+    """Temporary users, a group and an event with the given capacity"""
+    now = datetime.now()
+    db.session.execute(
+        User.__table__.insert(),
+        [
+            {
+                "first_name": "Bench",
+                "last_name": str(number),
+                "username": f"bench_{tag}_{number}",
+                "email": f"bench_{tag}_{number}@bench.invalid",
+                "hashed_password": "-",
+                "profile_image_url": "",
+                "created_at": now,
+                "updated_at": now,
+            }
+            for number in range(users + 1)
+        ],
+    )
+    user_ids = [
+        user_id
+        for (user_id,) in db.session.query(User.id)
+        .filter(User.username.like(f"bench_{tag}_%"))
+        .order_by(User.id)
+    ]
+    organizer_id, user_ids = user_ids[0], user_ids[1:]
+
+    group = Group(
+        organizer_id=organizer_id,
+        name="Attendance bench",
+        about="Temporary group for flask bench attendance",
+        type="online",
+        city="Austin",
+        state="TX",
+    )
+    db.session.add(group)
+    db.session.flush()
+    event = Event(
+        group_id=group.id,
+        name="Attendance bench",
+        description="Temporary event for flask bench attendance",
+        type="online",
+        capacity=capacity,
+        start_date=now + timedelta(days=7),
+        end_date=now + timedelta(days=7, hours=2),
+    )
+    db.session.add(event)
+    db.session.commit()
+    return organizer_id, group.id, event.id, user_ids
+
+
+def _drop_fixture(organizer_id, group_id, event_id, user_ids):
+    db.session.rollback()
+    db.session.query(EventWaitlist).filter(EventWaitlist.event_id == event_id).delete(
+        synchronize_session=False
+    )
+    db.session.query(Attendance).filter(Attendance.event_id == event_id).delete(
+        synchronize_session=False
+    )
+    db.session.query(Event).filter(Event.id == event_id).delete(
+        synchronize_session=False
+    )
+    db.session.query(Group).filter(Group.id == group_id).delete(
+        synchronize_session=False
+    )
+    db.session.query(User).filter(User.id.in_(user_ids + [organizer_id])).delete(
+        synchronize_session=False
+    )
+    db.session.commit()
+
+
+def _in_transaction(operation, stats):
+    """
+    Run operation and commit, retrying while SQLite reports the database
+    as locked. Returns its result, or None after a unique violation.
+    """
+    for _ in range(RETRIES):
+        try:
+            result = operation()
+            db.session.commit()
+            return result
+        except IntegrityError:
+            db.session.rollback()
+            stats["duplicates"] += 1
+            return None
+        except OperationalError:
+            db.session.rollback()
+            stats["retries"] += 1
+            time.sleep(random.uniform(0.001, 0.01))
+    raise RuntimeError("Gave up after repeated lock timeouts")
+
+
+def _run_threads(app, jobs, threads, event_id, stats):
+    """
+    Split jobs (callables taking no arguments) across threads, each in its
+    own app context and session, while another thread samples the number
+    of attendances. Returns (wall time, highest sampled attendance).
+    """
+    lock = threading.Lock()
+    done = threading.Event()
+    peak = [0]
+    errors = []
+
+    def sampler():
+        with app.app_context():
+            while not done.is_set():
+                count = (
+                    db.session.query(func.count(Attendance.id))
+                    .filter(Attendance.event_id == event_id)
+                    .scalar()
+                )
+                db.session.rollback()
+                peak[0] = max(peak[0], count)
+
+    def worker(batch, thread_stats):
+        try:
+            with app.app_context():
+                ready.wait()
+                for job in batch:
+                    job(thread_stats)
+        except Exception as error:
+            with lock:
+                errors.append(error)
+        finally:
+            with lock:
+                for key, value in thread_stats.items():
+                    stats[key] = stats.get(key, 0) + value
+
+    ready = threading.Barrier(threads + 1)
+    workers = [
+        threading.Thread(
+            target=worker,
+            args=(jobs[index::threads], {"duplicates": 0, "retries": 0}),
+        )
+        for index in range(threads)
+    ]
+    watcher = threading.Thread(target=sampler)
+    watcher.start()
+    for thread in workers:
+        thread.start()
+    ready.wait()
+    started = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    wall = time.perf_counter() - started
+    done.set()
+    watcher.join()
+
+    if errors:
+        raise errors[0]
+    return wall, peak[0]
+
+
+def _attend_job(event_id, user_id):
+    def job(stats):
+        _in_transaction(lambda: attendance.attend(event_id, user_id), stats)
+
+    return job
+
+
+def _leave_job(event_id, user_id):
+    def job(stats):
+        _in_transaction(lambda: attendance.leave(event_id, user_id), stats)
+
+    return job
+
+
+def _state(event_id):
+    db.session.rollback()
+    attending = {
+        user_id
+        for (user_id,) in db.session.query(Attendance.user_id).filter(
+            Attendance.event_id == event_id
+        )
+    }
+    waiting = [
+        user_id
+        for (user_id,) in db.session.query(EventWaitlist.user_id)
+        .filter(EventWaitlist.event_id == event_id)
+        .order_by(EventWaitlist.id)
+    ]
+    counter, capacity = (
+        db.session.query(Event.attendee_count, Event.capacity)
+        .filter(Event.id == event_id)
+        .one()
+    )
+    return attending, waiting, counter, capacity
+
+
+def _check(phase, event_id, peak, failures):
+    """Invariants that must hold once every transaction has committed"""
+    attending, waiting, counter, capacity = _state(event_id)
+    if peak > capacity or len(attending) > capacity:
+        failures.append(f"{phase}: {max(peak, len(attending))} attending, capacity {capacity}")
+    if counter != len(attending):
+        failures.append(f"{phase}: attendee_count {counter} != {len(attending)} rows")
+    if attending & set(waiting):
+        failures.append(f"{phase}: users both attending and waitlisted")
+    if waiting and len(attending) < capacity:
+        failures.append(f"{phase}: free seats left while {len(waiting)} wait")
+    return attending, waiting
+
+
+def benchmark_attendance(users, capacity, threads, rounds, seed=7):
+    """
+    Stress the attendance engine on a temporary event:
+
+    rush   - every user attends twice (a double-submit) from `threads`
+             threads at once; capacity seats fill, the rest queue
+    leave  - a third of the attendees leave at once; the seats must go to
+             the front of the waitlist in order
+    churn  - `rounds` random attend/leave calls per user
+
+    A sampler thread counts attendances throughout. Returns one row per
+    phase and the list of violated invariants (empty when all held).
+    The temporary rows are deleted at the end.
+    """
+    app = current_app._get_current_object()
+    rng = random.Random(seed)
+    tag = f"{int(time.time())}_{rng.randrange(10**6)}"
+    organizer_id, group_id, event_id, user_ids = _create_fixture(users, capacity, tag)
+
+    rows = []
+    failures = []
+    try:
+        # Rush: more users than seats, each submitting twice
+        stats = {}
+        jobs = [_attend_job(event_id, user_id) for user_id in user_ids * 2]
+        rng.shuffle(jobs)
+        wall, peak = _run_threads(app, jobs, threads, event_id, stats)
+        attending, waiting = _check("rush", event_id, peak, failures)
+        if len(attending) + len(waiting) != len(user_ids):
+            failures.append("rush: some users neither attending nor waitlisted")
+        rows.append(("rush", len(jobs), wall, peak, len(attending), len(waiting), stats))
+
+        # Leave: freed seats must go to the head of the line
+        leaving = rng.sample(sorted(attending), len(attending) // 3)
+        expected = waiting[: len(leaving)]
+        stats = {}
+        jobs = [_leave_job(event_id, user_id) for user_id in leaving]
+        wall, peak = _run_threads(app, jobs, threads, event_id, stats)
+        attending, after = _check("leave", event_id, peak, failures)
+        if not set(expected) <= attending or after != waiting[len(leaving) :]:
+            failures.append("leave: waitlist was not promoted in FIFO order")
+        rows.append(("leave", len(jobs), wall, peak, len(attending), len(after), stats))
+
+        # Churn: random attends and leaves
+        stats = {}
+        jobs = [
+            (_attend_job if rng.random() < 0.5 else _leave_job)(event_id, user_id)
+            for user_id in user_ids
+            for _ in range(rounds)
+        ]
+        rng.shuffle(jobs)
+        wall, peak = _run_threads(app, jobs, threads, event_id, stats)
+        attending, waiting = _check("churn", event_id, peak, failures)
+        rows.append(("churn", len(jobs), wall, peak, len(attending), len(waiting), stats))
+    finally:
+        _drop_fixture(organizer_id, group_id, event_id, user_ids)
+
+    return rows, failures
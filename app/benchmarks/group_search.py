@@ -0,0 +1,92 @@
+import random
+import time
+from datetime import datetime, timedelta
+from app.models import db, Group, User
+from app.utilities.group_search import search_groups
+
+WORDS = (
+    "anger anxiety depression stress trauma grief recovery support circle "
+    "fathers brothers veterans sober morning evening walk talk healing hope "
+    "coffee runners hikers gamers writers artists music guitar chess books "
+    "therapy mindful breathing journal outdoors fishing cycling climbing "
+    "coming out relationships divorce loneliness burnout work students "
+    "night shift weekend downtown riverside valley north south east west"
+).split()
+CITIES = ("Austin", "Denver", "Portland", "Chicago", "Boston", "Atlanta", "Seattle")
+STATES = ("TX", "CO", "OR", "IL", "MA", "GA", "WA")
+
+
+def _fake_groups(count, organizer_id, rng):
+    now = datetime.now()
+    for _ in range(count):
+        city = rng.randrange(len(CITIES))
+        yield {
+            "organizer_id": organizer_id,
+            "name": " ".join(rng.sample(WORDS, rng.randint(2, 4))).title()[:50],
+            "about": " ".join(rng.choices(WORDS, k=rng.randint(8, 18)))[:150],
+            "type": rng.choice(("online", "in-person")),
+            "city": CITIES[city],
+            "state": STATES[city],
+            "created_at": now - timedelta(minutes=rng.randrange(500000)),
+            "updated_at": now,
+        }
+
+
+def _old_search(search):
+    """The ILIKE query all_groups ran before full-text search"""
+    return (
+        db.session.query(Group)
+        .filter(
+            db.or_(Group.name.ilike(f"%{search}%"), Group.about.ilike(f"%{search}%"))
+        )
+        .order_by(Group.created_at.desc())
+    )
+
+
+def _time_page(query, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        page = query.paginate(page=1, per_page=20, error_out=False)
+        [group.id for group in page.items]
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples[len(samples) // 2], page.total
+
+
+def benchmark_group_search(total, searches, repeat=5, seed=7):
+    """
+    Top up the groups table to `total` rows with generated groups, then
+    time the first page (count + 20 rows) of each search through the old
+    ILIKE query and through search_groups. Everything is rolled back at
+    the end, so the database is left as it was.
+
+    Returns one row per search: (search, ilike p50, ilike total, fts p50,
+    fts total).
+    """
+    rng = random.Random(seed)
+    organizer_id = db.session.query(User.id).order_by(User.id).limit(1).scalar()
+    if organizer_id is None:
+        raise RuntimeError("Seed at least one user first")
+
+    try:
+        missing = total - db.session.query(Group).count()
+        rows = _fake_groups(max(missing, 0), organizer_id, rng)
+        while True:
+            chunk = [row for _, row in zip(range(5000), rows)]
+            if not chunk:
+                break
+            db.session.execute(Group.__table__.insert(), chunk)
+
+        if db.engine.dialect.name == "postgresql":
+            db.session.execute("ANALYZE groups")
+
+        results = []
+        for search in searches:
+            old_time, old_total = _time_page(_old_search(search), repeat)
+            base = db.session.query(Group)
+            new_time, new_total = _time_page(search_groups(base, search), repeat)
+            results.append((search, old_time, old_total, new_time, new_total))
+        return results
+    finally:
+        db.session.rollback()
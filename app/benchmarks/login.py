@@ -0,0 +1,72 @@
+import threading
+import time
+from flask import current_app
+
+
+def _percentile(samples, fraction):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def benchmark_login(email, password, levels, requests_per_level):
+    """
+    POST /api/auth/login from `level` threads at once for each level.
+    Returns one row per level with throughput, latency and 503 counts.
+
+    Each client fetches /api/auth/ once before the clock starts to pick up
+    a csrf_token cookie, like the frontend does.
+    """
+    app = current_app._get_current_object()
+    payload = {"email": email, "password": password}
+
+    rows = []
+    for level in levels:
+        latencies = []
+        statuses = {}
+        lock = threading.Lock()
+        per_thread = max(1, requests_per_level // level)
+
+        ready = threading.Barrier(level + 1)
+
+        def worker():
+            # Requests run in the thread's own contexts, not the CLI's
+            client = app.test_client()
+            client.get("/api/auth/")
+            ready.wait()
+            for _ in range(per_thread):
+                started = time.perf_counter()
+                response = client.post("/api/auth/login", json=payload)
+                elapsed = time.perf_counter() - started
+                with lock:
+                    latencies.append(elapsed)
+                    statuses[response.status_code] = (
+                        statuses.get(response.status_code, 0) + 1
+                    )
+
+        threads = [threading.Thread(target=worker) for _ in range(level)]
+        for thread in threads:
+            thread.start()
+        ready.wait()
+        started = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        wall = time.perf_counter() - started
+
+        rows.append(
+            {
+                "concurrency": level,
+                "requests": len(latencies),
+                "ok": statuses.get(200, 0),
+                "busy": statuses.get(503, 0),
+                "other": len(latencies)
+                - statuses.get(200, 0)
+                - statuses.get(503, 0),
+                "throughput": len(latencies) / wall if wall else 0.0,
+                "p50": _percentile(latencies, 0.5),
+                "p95": _percentile(latencies, 0.95),
+            }
+        )
+
+    return rows
@@ -0,0 +1,63 @@
+import json
+import os
+import subprocess
+import sys
+
+# Run in a fresh interpreter so nothing is already imported. `import app`
+# builds the module level app; create_app() is then timed again on its own
+# to separate the factory from the imports.
+PROFILE_SCRIPT = """
+import json, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+app.create_app()
+created = time.perf_counter()
+print(json.dumps({"import": imported - start, "create_app": created - imported}))
+"""
+
+
+def _parse_importtime(stderr):
+    """Rows of (module, self seconds, cumulative seconds) from -X importtime"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:") :].split("|")
+            rows.append((name.strip(), int(self_us) / 1e6, int(cumulative_us) / 1e6))
+        except ValueError:
+            continue
+    return rows
+
+
+def profile_startup(lazy=True):
+    """
+    Import the app in a subprocess under -X importtime.
+
+    Returns {"import", "create_app", "modules", "packages"}: wall seconds
+    for `import app` (which includes the module level create_app), seconds
+    for a second create_app(), per-module (self, cumulative) seconds and
+    self seconds summed by top-level package.
+    """
+    env = dict(os.environ, LAZY_IMPORTS="1" if lazy else "0")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROFILE_SCRIPT],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    modules = _parse_importtime(result.stderr)
+
+    packages = {}
+    for name, self_time, _ in modules:
+        package = name.split(".", 1)[0]
+        packages[package] = packages.get(package, 0) + self_time
+
+    timings["modules"] = {name: (s, c) for name, s, c in modules}
+    timings["packages"] = packages
+    return timings
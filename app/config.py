@@ -89,6 +89,64 @@ class Config:
     SESSION_COOKIE_SAMESITE = "Lax"
     PERMANENT_SESSION_LIFETIME = 86400  # 24 hours
 
+    # Compression is applied from after_request, per response policy
+    COMPRESS_REGISTER = False
+
+    # Reissue the csrf_token cookie this many seconds before it expires
+    CSRF_REFRESH_MARGIN = 300
+
+    # Password hashing process pool (per worker). 0 workers hashes inline.
+    PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", 2))
+    PASSWORD_HASH_MAX_PENDING = int(os.environ.get("PASSWORD_HASH_MAX_PENDING", 8))
+    PASSWORD_HASH_TIMEOUT = int(os.environ.get("PASSWORD_HASH_TIMEOUT", 10))  # seconds
+    # e.g. "pbkdf2:sha256:600000"; defaults to werkzeug's current parameters
+    PASSWORD_HASH_METHOD = os.environ.get("PASSWORD_HASH_METHOD")
+
+    # Google sign-in. Unset client id/secret disables the OAuth routes.
+    # The auth/token/certs URLs and issuers can point at a local fake issuer.
+    GOOGLE_OAUTH_CLIENT_ID = os.environ.get("GOOGLE_OAUTH_CLIENT_ID")
+    GOOGLE_OAUTH_CLIENT_SECRET = os.environ.get("GOOGLE_OAUTH_CLIENT_SECRET")
+    GOOGLE_OAUTH_REDIRECT_URI = os.environ.get(
+        "GOOGLE_OAUTH_REDIRECT_URI",
+        os.environ.get("BASE_URL", "http://localhost:8000")
+        + "/api/auth/oauth/callback",
+    )
+    GOOGLE_AUTH_URI = os.environ.get("GOOGLE_AUTH_URI")
+    GOOGLE_TOKEN_URI = os.environ.get("GOOGLE_TOKEN_URI")
+    GOOGLE_CERTS_URL = os.environ.get("GOOGLE_CERTS_URL")
+    GOOGLE_CERTS_CACHE = os.environ.get("GOOGLE_CERTS_CACHE")
+    GOOGLE_ISSUERS = (
+        tuple(os.environ["GOOGLE_ISSUERS"].split(","))
+        if os.environ.get("GOOGLE_ISSUERS")
+        else None
+    )
+    OAUTH_SUCCESS_REDIRECT = os.environ.get("OAUTH_SUCCESS_REDIRECT", "/")
+
+    # Defer boto3, the Google OAuth stack and the seed package until first
+    # use. Turn off to import them all at startup.
+    LAZY_IMPORTS = os.environ.get("LAZY_IMPORTS", "1").lower() not in ("0", "false")
+
+    # Seconds between checks for tag catalog changes made by other workers
+    TAG_CATALOG_CHECK_INTERVAL = int(os.environ.get("TAG_CATALOG_CHECK_INTERVAL", 5))
+    # Seconds the in-memory popular tags list is served before a refresh
+    POPULAR_TAGS_TTL = int(os.environ.get("POPULAR_TAGS_TTL", 30))
+
+    # Server-side cache for public list endpoints: "memory" (per worker),
+    # "sqlite" (shared by the workers on a host) or "none"
+    CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "memory")
+    CACHE_SQLITE_PATH = os.environ.get("CACHE_SQLITE_PATH")
+    CACHE_MAX_ENTRIES = int(os.environ.get("CACHE_MAX_ENTRIES", 1024))
+    CACHE_DEFAULT_TTL = int(os.environ.get("CACHE_DEFAULT_TTL", 60))  # seconds
+
+    # Concurrent identical group/event detail requests share one query run.
+    # A grace period > 0 also shares the result for that many seconds after.
+    SINGLE_FLIGHT_GRACE = float(os.environ.get("SINGLE_FLIGHT_GRACE", 0))
+    SINGLE_FLIGHT_TIMEOUT = float(os.environ.get("SINGLE_FLIGHT_TIMEOUT", 30))
+
+    # Logged in user snapshot cache (per worker)
+    USER_CACHE_SIZE = int(os.environ.get("USER_CACHE_SIZE", 1024))
+    USER_CACHE_TTL = int(os.environ.get("USER_CACHE_TTL", 60))  # seconds
+
 
 # import os
 
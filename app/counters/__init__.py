@@ -0,0 +1,90 @@
+import click
+from flask.cli import AppGroup
+from .posts import repair_post_counters
+from .comments import repair_comment_counters
+from .tags import repair_tag_counters
+from .groups import repair_group_counters, repair_event_counters
+from app.utilities.user_similarity import rebuild_user_similarity
+
+from app.models.db import db
+
+# Creates a counters group to hold the reconciliation commands
+counter_commands = AppGroup("counters")
+
+
+@counter_commands.command("posts")
+@click.option("--batch-size", default=500, show_default=True)
+def repair_posts(batch_size):
+    """Recompute drifted like/comment counters on posts"""
+    try:
+        checked, repaired = repair_post_counters(batch_size=batch_size)
+        print(f"Checked {checked} posts, repaired {repaired}")
+    except Exception as e:
+        print(f"Error repairing post counters: {e}")
+        db.session.rollback()
+        raise
+
+
+@counter_commands.command("comments")
+@click.option("--batch-size", default=500, show_default=True)
+def repair_comments(batch_size):
+    """Recompute drifted like counters on comments"""
+    try:
+        checked, repaired = repair_comment_counters(batch_size=batch_size)
+        print(f"Checked {checked} comments, repaired {repaired}")
+    except Exception as e:
+        print(f"Error repairing comment counters: {e}")
+        db.session.rollback()
+        raise
+
+
+@counter_commands.command("tags")
+@click.option("--batch-size", default=500, show_default=True)
+def repair_tags(batch_size):
+    """Recompute drifted user counters on tags"""
+    try:
+        checked, repaired = repair_tag_counters(batch_size=batch_size)
+        print(f"Checked {checked} tags, repaired {repaired}")
+    except Exception as e:
+        print(f"Error repairing tag counters: {e}")
+        db.session.rollback()
+        raise
+
+
+@counter_commands.command("groups")
+@click.option("--batch-size", default=500, show_default=True)
+def repair_groups(batch_size):
+    """Recompute drifted member counters on groups"""
+    try:
+        checked, repaired = repair_group_counters(batch_size=batch_size)
+        print(f"Checked {checked} groups, repaired {repaired}")
+    except Exception as e:
+        print(f"Error repairing group counters: {e}")
+        db.session.rollback()
+        raise
+
+
+@counter_commands.command("events")
+@click.option("--batch-size", default=500, show_default=True)
+def repair_events(batch_size):
+    """Recompute drifted attendee counters on events"""
+    try:
+        checked, repaired = repair_event_counters(batch_size=batch_size)
+        print(f"Checked {checked} events, repaired {repaired}")
+    except Exception as e:
+        print(f"Error repairing event counters: {e}")
+        db.session.rollback()
+        raise
+
+
+@counter_commands.command("similarity")
+def rebuild_similarity():
+    """Rebuild the user_similarity pairs from user_tags"""
+    try:
+        rebuild_user_similarity()
+        db.session.commit()
+        print("Rebuilt user similarity pairs")
+    except Exception as e:
+        print(f"Error rebuilding user similarity: {e}")
+        db.session.rollback()
+        raise
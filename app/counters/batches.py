@@ -0,0 +1,34 @@
+from app.models.db import db
+
+
+def repair_in_batches(model, refresh, batch_size=500):
+    """
+    Run refresh(ids, only_drifted=True) over every row of model in
+    id-ordered batches, committing after each one. refresh recomputes the
+    counters with a single correlated UPDATE, so a like or membership
+    committed mid-repair is counted rather than overwritten, and returns
+    how many rows it changed. Returns (checked, repaired).
+    """
+    checked = 0
+    repaired = 0
+    last_id = 0
+
+    while True:
+        ids = [
+            row_id
+            for (row_id,) in db.session.query(model.id)
+            .filter(model.id > last_id)
+            .order_by(model.id)
+            .limit(batch_size)
+        ]
+        if not ids:
+            break
+
+        repaired += refresh(ids, only_drifted=True)
+
+        # Commit per batch to keep transactions (and row locks) short
+        db.session.commit()
+        checked += len(ids)
+        last_id = ids[-1]
+
+    return checked, repaired
@@ -0,0 +1,11 @@
+from app.models import Comment
+from .batches import repair_in_batches
+
+
+def repair_comment_counters(batch_size=500):
+    """
+    Recompute like_count for every comment, in id-ordered batches.
+    Only rows whose stored counter drifted are rewritten.
+    Returns (comments_checked, comments_repaired).
+    """
+    return repair_in_batches(Comment, Comment.refresh_like_counts, batch_size)
@@ -0,0 +1,20 @@
+from app.models import Group, Event
+from .batches import repair_in_batches
+
+
+def repair_group_counters(batch_size=500):
+    """
+    Recompute member_count for every group, in id-ordered batches.
+    Only rows whose stored counter drifted are rewritten.
+    Returns (groups_checked, groups_repaired).
+    """
+    return repair_in_batches(Group, Group.refresh_member_counts, batch_size)
+
+
+def repair_event_counters(batch_size=500):
+    """
+    Recompute attendee_count for every event, in id-ordered batches.
+    Only rows whose stored counter drifted are rewritten.
+    Returns (events_checked, events_repaired).
+    """
+    return repair_in_batches(Event, Event.refresh_attendee_counts, batch_size)
@@ -0,0 +1,11 @@
+from app.models import Post
+from .batches import repair_in_batches
+
+
+def repair_post_counters(batch_size=500):
+    """
+    Recompute like_count / comment_count for every post, in id-ordered batches.
+    Only rows whose stored counters drifted are rewritten.
+    Returns (posts_checked, posts_repaired).
+    """
+    return repair_in_batches(Post, Post.refresh_counters, batch_size)
@@ -0,0 +1,11 @@
+from app.models import Tag
+from .batches import repair_in_batches
+
+
+def repair_tag_counters(batch_size=500):
+    """
+    Recompute user_count for every tag, in id-ordered batches.
+    Only rows whose stored counter drifted are rewritten.
+    Returns (tags_checked, tags_repaired).
+    """
+    return repair_in_batches(Tag, Tag.refresh_user_counts, batch_size)
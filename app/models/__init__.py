@@ -2,10 +2,13 @@ from .db import db
 from .db import environment, SCHEMA
 from .user import User
 from .attendance import Attendance
+from .cache_version import cache_versions as CacheVersions
 from .comment import Comment
+from .comment_closure import comment_closure as CommentClosure
 from .comment_like import CommentLike
 from .event_image import EventImage
 from .event import Event
+from .event_waitlist import EventWaitlist
 from .group import Group
 from .group_image import GroupImage
 from .like import likes as Likes
@@ -13,6 +16,7 @@ from .member import Membership
 from .post import Post
 from .tag import Tag
 from .user_tag import user_tags as UserTags
+from .user_similarity import user_similarity as UserSimilarity
 from .venue import Venue
 from .partnership import Partnership
 from .contact import Contact
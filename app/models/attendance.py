@@ -4,8 +4,17 @@ from .db import db, environment, SCHEMA, add_prefix_for_prod
 class Attendance(db.Model):
     __tablename__ = "attendances"
 
+    # One attendance per user and event - concurrent attend requests for
+    # the same user can't both get a seat
     if environment == "production":
-        __table_args__ = {"schema": SCHEMA}
+        __table_args__ = (
+            db.UniqueConstraint("event_id", "user_id", name="uq_attendances_event_user"),
+            {"schema": SCHEMA},
+        )
+    else:
+        __table_args__ = (
+            db.UniqueConstraint("event_id", "user_id", name="uq_attendances_event_user"),
+        )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(
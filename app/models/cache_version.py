@@ -0,0 +1,15 @@
+from .db import db, environment, SCHEMA
+
+
+# Version counters for process-level caches of shared data (e.g. the tag
+# catalog). Writers bump a counter and every worker drops its copy the next
+# time it checks, without having to reach into the other workers.
+cache_versions = db.Table(
+    "cache_versions",
+    db.Model.metadata,
+    db.Column("name", db.String(50), primary_key=True),
+    db.Column("version", db.Integer, nullable=False, default=0),
+)
+
+if environment == "production":
+    cache_versions.schema = SCHEMA
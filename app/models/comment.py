@@ -1,5 +1,7 @@
 from .db import db, environment, SCHEMA, add_prefix_for_prod
+from .comment_closure import comment_closure
 from datetime import datetime
+from sqlalchemy import event, func, literal, select
 
 
 class Comment(db.Model):
@@ -22,6 +24,9 @@ class Comment(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.now)
     updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
 
+    # Denormalized like counter - kept in step by CommentLike.toggle
+    like_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+
     # Relationship attributes with proper lazy loading
     commenter = db.relationship("User", back_populates="user_comments", lazy="joined")
     post = db.relationship("Post", back_populates="post_comments")
@@ -46,24 +51,27 @@ class Comment(db.Model):
         return f"< Comment id: {self.id} by: {self.commenter.username if self.commenter else 'Unknown'} >"
 
     def to_dict_with_likes(
-        self, include_replies=False, max_depth=5, current_depth=0, current_user_id=None
+        self,
+        include_replies=False,
+        max_depth=5,
+        current_depth=0,
+        current_user_id=None,
+        liked_comment_ids=None,
     ):
         """
         Convert comment to dictionary with like data included and proper like count
+
+        Pass liked_comment_ids (from CommentLike.liked_comment_ids) when
+        serializing many comments; otherwise isLiked costs a query each.
         """
-        # Get like count and current user like status
-        like_count = (
-            len(self.comment_likes)
-            if hasattr(self, "comment_likes") and self.comment_likes
-            else 0
-        )
+        like_count = self.like_count or 0
 
         # Check if current user liked this comment
         is_liked = False
-        if current_user_id and hasattr(self, "comment_likes") and self.comment_likes:
-            is_liked = any(
-                like.user_id == current_user_id for like in self.comment_likes
-            )
+        if liked_comment_ids is not None:
+            is_liked = self.id in liked_comment_ids
+        elif current_user_id:
+            is_liked = self.is_liked_by_user(current_user_id)
 
         base_dict = {
             "id": self.id,
@@ -112,6 +120,7 @@ class Comment(db.Model):
                     max_depth=max_depth,
                     current_depth=current_depth + 1,
                     current_user_id=current_user_id,
+                    liked_comment_ids=liked_comment_ids,
                 )
                 for reply in sorted(self.replies, key=lambda x: x.created_at)
             ]
@@ -126,9 +135,7 @@ class Comment(db.Model):
 
     def get_like_count(self):
         """Get the current like count for this comment"""
-        from .comment_like import CommentLike
-
-        return CommentLike.query.filter_by(comment_id=self.id).count()
+        return self.like_count or 0
 
     def is_liked_by_user(self, user_id):
         """Check if a specific user has liked this comment"""
@@ -143,22 +150,7 @@ class Comment(db.Model):
         """Toggle like for a user - returns (is_liked, like_count)"""
         from .comment_like import CommentLike
 
-        existing_like = CommentLike.query.filter_by(
-            comment_id=self.id, user_id=user_id
-        ).first()
-
-        if existing_like:
-            db.session.delete(existing_like)
-            is_liked = False
-        else:
-            new_like = CommentLike(comment_id=self.id, user_id=user_id)
-            db.session.add(new_like)
-            is_liked = True
-
-        # Get updated count
-        like_count = self.get_like_count()
-
-        return is_liked, like_count
+        return CommentLike.toggle(user_id, self.id)
 
     # Keep existing methods for backwards compatibility
     def to_dict(self, include_replies=False, max_depth=5, current_depth=0):
@@ -228,17 +220,18 @@ class Comment(db.Model):
     ):
         """
         Get comments for a post with like data properly loaded
+
+        Like counts live on the comment rows; pair with
+        CommentLike.liked_comment_ids for isLiked.
         """
-        from sqlalchemy.orm import joinedload, selectinload
+        from sqlalchemy.orm import joinedload
 
-        # Build query with explicit user loading and like data
+        # Build query with explicit user loading
         query = cls.query.options(
             # Load commenter data
             joinedload(cls.commenter).load_only(
                 "id", "username", "first_name", "last_name", "profile_image_url"
             ),
-            # Load like data
-            selectinload(cls.comment_likes),
         ).filter(cls.post_id == post_id)
 
         if not include_replies:
@@ -299,50 +292,117 @@ class Comment(db.Model):
         """
         Calculate the depth of this comment in the thread
         """
-        depth = 0
-        current = self
-        while current.parent_id is not None:
-            depth += 1
-            # Avoid infinite loops
-            if depth > 10:
-                break
-            current = current.parent if hasattr(current, "parent") else None
-            if not current:
-                break
-        return depth
+        return (
+            db.session.query(func.max(comment_closure.c.depth))
+            .filter(comment_closure.c.descendant_id == self.id)
+            .scalar()
+            or 0
+        )
 
     def get_thread_root(self):
         """
         Get the root comment of this thread
         """
-        current = self
-        while current.parent_id is not None:
-            if hasattr(current, "parent") and current.parent:
-                current = current.parent
-            else:
-                break
-        return current
+        if self.parent_id is None:
+            return self
+
+        return (
+            Comment.query.join(
+                comment_closure, comment_closure.c.ancestor_id == Comment.id
+            )
+            .filter(comment_closure.c.descendant_id == self.id)
+            .order_by(comment_closure.c.depth.desc())
+            .first()
+        ) or self
 
     def get_all_replies(self):
         """
-        Get all replies in this comment's thread (recursive)
+        Get all replies in this comment's thread (recursive), oldest first
         """
-        all_replies = []
-
-        def collect_replies(comment):
-            if hasattr(comment, "replies") and comment.replies:
-                for reply in comment.replies:
-                    all_replies.append(reply)
-                    collect_replies(reply)
-
-        collect_replies(self)
-        return all_replies
+        return (
+            Comment.query.join(
+                comment_closure, comment_closure.c.descendant_id == Comment.id
+            )
+            .filter(
+                comment_closure.c.ancestor_id == self.id,
+                comment_closure.c.depth > 0,
+            )
+            .order_by(Comment.created_at, Comment.id)
+            .all()
+        )
 
     def count_total_replies(self):
         """
         Count total number of replies (including nested)
         """
-        return len(self.get_all_replies())
+        return (
+            db.session.query(func.count())
+            .select_from(comment_closure)
+            .filter(
+                comment_closure.c.ancestor_id == self.id,
+                comment_closure.c.depth > 0,
+            )
+            .scalar()
+            or 0
+        )
+
+    @classmethod
+    def delete_threads(cls, comment_ids):
+        """
+        Delete comments and every reply beneath them, with their likes.
+        comment_ids may be a list or a subquery of ids. Returns the ids
+        removed so callers can recount what depended on them.
+        """
+        from .comment_like import CommentLike
+
+        thread_ids = [
+            row[0]
+            for row in db.session.query(comment_closure.c.descendant_id)
+            .filter(comment_closure.c.ancestor_id.in_(comment_ids))
+            .distinct()
+        ]
+        if not thread_ids:
+            return []
+
+        db.session.query(CommentLike).filter(
+            CommentLike.comment_id.in_(thread_ids)
+        ).delete(synchronize_session=False)
+        db.session.execute(
+            comment_closure.delete().where(
+                comment_closure.c.descendant_id.in_(thread_ids)
+            )
+        )
+        db.session.query(cls).filter(cls.id.in_(thread_ids)).delete(
+            synchronize_session=False
+        )
+        return thread_ids
+
+    @classmethod
+    def refresh_like_counts(cls, comment_ids, only_drifted=False):
+        """
+        Recompute like_count from comment_likes for the given comments in
+        one UPDATE, leaving updated_at alone. With only_drifted, comments
+        whose counter is already right aren't rewritten. Returns the number
+        of comments changed.
+        """
+        from .comment_like import CommentLike
+
+        comment_ids = list(comment_ids)
+        if not comment_ids:
+            return 0
+
+        like_total = (
+            select(func.count(CommentLike.id))
+            .where(CommentLike.comment_id == cls.id)
+            .scalar_subquery()
+        )
+        query = db.session.query(cls).filter(cls.id.in_(comment_ids))
+        if only_drifted:
+            query = query.filter(cls.like_count != like_total)
+        return query.update(
+            {cls.like_count: like_total, cls.updated_at: cls.updated_at},
+            synchronize_session=False,
+        )
 
     def is_editable_by(self, user_id):
         """
@@ -446,3 +506,26 @@ class Comment(db.Model):
         )
 
         return query.all()
+
+
+@event.listens_for(Comment, "after_insert")
+def index_comment_thread(mapper, connection, target):
+    """
+    Add closure rows for a new comment: itself at depth 0, plus one row per
+    ancestor copied from its parent's rows one level deeper.
+    """
+    rows = select(literal(target.id), literal(target.id), literal(0))
+    if target.parent_id is not None:
+        rows = rows.union_all(
+            select(
+                comment_closure.c.ancestor_id,
+                literal(target.id),
+                comment_closure.c.depth + 1,
+            ).where(comment_closure.c.descendant_id == target.parent_id)
+        )
+
+    connection.execute(
+        comment_closure.insert().from_select(
+            ["ancestor_id", "descendant_id", "depth"], rows
+        )
+    )
@@ -0,0 +1,27 @@
+from .db import db, environment, SCHEMA, add_prefix_for_prod
+
+
+# Closure table for comment threads: one row per (ancestor, descendant) pair,
+# including each comment paired with itself at depth 0. Kept in step by the
+# after_insert listener on Comment.
+comment_closure = db.Table(
+    "comment_closure",
+    db.Model.metadata,
+    db.Column(
+        "ancestor_id",
+        db.Integer,
+        db.ForeignKey(add_prefix_for_prod("comments.id"), ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    db.Column(
+        "descendant_id",
+        db.Integer,
+        db.ForeignKey(add_prefix_for_prod("comments.id"), ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    db.Column("depth", db.Integer, nullable=False),
+    db.Index("ix_comment_closure_descendant_depth", "descendant_id", "depth"),
+)
+
+if environment == "production":
+    comment_closure.schema = SCHEMA
@@ -1,5 +1,6 @@
 from .db import db, environment, SCHEMA, add_prefix_for_prod
 from datetime import datetime
+from sqlalchemy import text
 
 
 class CommentLike(db.Model):
@@ -42,34 +43,62 @@ class CommentLike(db.Model):
             "createdAt": self.created_at.isoformat() if self.created_at else None,
         }
 
+    @classmethod
+    def toggle(cls, user_id, comment_id):
+        """
+        Like or unlike a comment inside the current transaction, keeping
+        comments.like_count in step. Returns (is_liked, like_count), or None
+        if the comment doesn't exist. A like that loses a race to an
+        identical concurrent like is treated as already liked.
+        """
+        params = {"user_id": user_id, "comment_id": comment_id}
+
+        removed = db.session.execute(
+            text(
+                "DELETE FROM comment_likes "
+                "WHERE user_id = :user_id AND comment_id = :comment_id"
+            ),
+            params,
+        ).rowcount
+
+        added = 0
+        if not removed:
+            added = db.session.execute(
+                text(
+                    """
+                    INSERT INTO comment_likes (user_id, comment_id, created_at)
+                    SELECT :user_id, :comment_id, :created_at
+                    WHERE EXISTS (SELECT 1 FROM comments WHERE id = :comment_id)
+                    ON CONFLICT (user_id, comment_id) DO NOTHING
+                """
+                ),
+                {**params, "created_at": datetime.now()},
+            ).rowcount
+
+        row = db.session.execute(
+            text(
+                """
+                UPDATE comments SET like_count = like_count + :delta
+                WHERE id = :comment_id
+                RETURNING like_count
+            """
+            ),
+            {"comment_id": comment_id, "delta": added - removed},
+        ).fetchone()
+
+        if row is None:
+            return None
+        return not removed, row.like_count
+
     @classmethod
     def toggle_like(cls, user_id, comment_id):
         """
         Toggle a like for a comment - returns (is_liked, like_count)
         """
         try:
-            # Check if like already exists
-            existing_like = cls.query.filter_by(
-                user_id=user_id, comment_id=comment_id
-            ).first()
-
-            if existing_like:
-                # Unlike - remove the like
-                db.session.delete(existing_like)
-                is_liked = False
-            else:
-                # Like - add new like
-                new_like = cls(user_id=user_id, comment_id=comment_id)
-                db.session.add(new_like)
-                is_liked = True
-
-            # Commit the changes
+            result = cls.toggle(user_id, comment_id)
             db.session.commit()
-
-            # Get updated like count
-            like_count = cls.query.filter_by(comment_id=comment_id).count()
-
-            return is_liked, like_count
+            return result
 
         except Exception as e:
             db.session.rollback()
@@ -78,7 +107,28 @@ class CommentLike(db.Model):
     @classmethod
     def get_like_count(cls, comment_id):
         """Get the total number of likes for a comment"""
-        return cls.query.filter_by(comment_id=comment_id).count()
+        from .comment import Comment
+
+        return (
+            db.session.query(Comment.like_count)
+            .filter(Comment.id == comment_id)
+            .scalar()
+            or 0
+        )
+
+    @classmethod
+    def liked_comment_ids(cls, user_id, comment_ids):
+        """Ids among comment_ids the user has liked, in one IN query"""
+        comment_ids = list(comment_ids)
+        if not user_id or not comment_ids:
+            return set()
+
+        return {
+            row[0]
+            for row in db.session.query(cls.comment_id).filter(
+                cls.user_id == user_id, cls.comment_id.in_(comment_ids)
+            )
+        }
 
     @classmethod
     def is_liked_by_user(cls, comment_id, user_id):
@@ -3,6 +3,7 @@ from datetime import datetime
 from .attendance import Attendance
 from sqlalchemy.ext.associationproxy import association_proxy
 from sqlalchemy.orm import validates
+from sqlalchemy import func, select
 
 
 class Event(db.Model):
@@ -38,6 +39,8 @@ class Event(db.Model):
     end_date = db.Column(db.DateTime, nullable=False, index=True)
     created_at = db.Column(db.DateTime, default=datetime.now, index=True)
     updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
+    # Denormalized attendance count - kept in step with attendances writes
+    attendee_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
 
     venues = db.relationship("Venue", back_populates="events", lazy="joined")
     groups = db.relationship("Group", back_populates="events", lazy="joined")
@@ -55,6 +58,46 @@ class Event(db.Model):
     )
     users = association_proxy("attendances", "user")
 
+    @classmethod
+    def adjust_attendee_counts(cls, event_ids, delta):
+        """
+        Shift attendee_count on the given events inside the current transaction.
+        Uses an atomic UPDATE so concurrent writers don't lose increments.
+        updated_at is pinned: an attendee isn't an edit of the event.
+        """
+        event_ids = list(event_ids)
+        if event_ids and delta:
+            db.session.query(cls).filter(cls.id.in_(event_ids)).update(
+                {
+                    cls.attendee_count: cls.attendee_count + delta,
+                    cls.updated_at: cls.updated_at,
+                },
+                synchronize_session=False,
+            )
+
+    @classmethod
+    def refresh_attendee_counts(cls, event_ids=None, only_drifted=False):
+        """
+        Recompute attendee_count from attendances, for the given events or
+        all of them. For bulk deletes where the per-event change isn't known.
+        With only_drifted, events whose counter is already right aren't
+        rewritten. Returns the number of events changed.
+        """
+        attendee_total = (
+            select(func.count(Attendance.id))
+            .where(Attendance.event_id == cls.id)
+            .scalar_subquery()
+        )
+        query = db.session.query(cls)
+        if event_ids is not None:
+            query = query.filter(cls.id.in_(list(event_ids)))
+        if only_drifted:
+            query = query.filter(cls.attendee_count != attendee_total)
+        return query.update(
+            {cls.attendee_count: attendee_total, cls.updated_at: cls.updated_at},
+            synchronize_session=False,
+        )
+
     @validates("start_date", "end_date")
     def validate_dates(self, key, date_value):
         if key == "end_date" and hasattr(self, "start_date") and self.start_date:
@@ -85,7 +128,7 @@ class Event(db.Model):
             "image": self.image,
             "startDate": self.start_date.isoformat(),
             "endDate": self.end_date.isoformat(),
-            "numAttendees": len(self.attendances) if self.attendances else 0,
+            "numAttendees": self.attendee_count,
             # ADD: Minimum groupInfo object using the loaded relationship data
             "groupInfo": (
                 {
@@ -234,7 +277,7 @@ class Event(db.Model):
             "startDate": self.start_date.isoformat(),
             "endDate": self.end_date.isoformat(),
             "attendees": attendees_list,
-            "numAttendees": len(attendees_list),
+            "numAttendees": self.attendee_count,
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat(),
         }
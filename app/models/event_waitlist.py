@@ -0,0 +1,43 @@
+from .db import db, environment, SCHEMA, add_prefix_for_prod
+from datetime import datetime
+
+
+class EventWaitlist(db.Model):
+    """
+    Users waiting for a seat at a full event, first come first served:
+    the lowest id is promoted to an attendance when a seat opens.
+    """
+
+    __tablename__ = "event_waitlist"
+
+    if environment == "production":
+        __table_args__ = (
+            db.UniqueConstraint("event_id", "user_id", name="uq_event_waitlist_event_user"),
+            db.Index("ix_event_waitlist_event_id_id", "event_id", "id"),
+            {"schema": SCHEMA},
+        )
+    else:
+        __table_args__ = (
+            db.UniqueConstraint("event_id", "user_id", name="uq_event_waitlist_event_user"),
+            db.Index("ix_event_waitlist_event_id_id", "event_id", "id"),
+        )
+
+    id = db.Column(db.Integer, primary_key=True)
+    event_id = db.Column(
+        db.Integer, db.ForeignKey(add_prefix_for_prod("events.id")), nullable=False
+    )
+    user_id = db.Column(
+        db.Integer,
+        db.ForeignKey(add_prefix_for_prod("users.id")),
+        nullable=False,
+        index=True,
+    )
+    created_at = db.Column(db.DateTime, default=datetime.now)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "eventId": self.event_id,
+            "userId": self.user_id,
+            "createdAt": self.created_at.isoformat() if self.created_at else None,
+        }
@@ -2,6 +2,7 @@ from .db import db, environment, SCHEMA, add_prefix_for_prod
 from datetime import datetime
 from .member import Membership
 from sqlalchemy.ext.associationproxy import association_proxy
+from sqlalchemy import func, select
 
 
 class Group(db.Model):
@@ -30,6 +31,8 @@ class Group(db.Model):
     image = db.Column(db.String(500), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.now, index=True)
     updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
+    # Denormalized membership count - kept in step with memberships writes
+    member_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
 
     organizer = db.relationship(
         "User", back_populates="groups", lazy="joined"
@@ -50,6 +53,46 @@ class Group(db.Model):
     )
     users = association_proxy("memberships", "user")
 
+    @classmethod
+    def adjust_member_counts(cls, group_ids, delta):
+        """
+        Shift member_count on the given groups inside the current transaction.
+        Uses an atomic UPDATE so concurrent writers don't lose increments.
+        updated_at is pinned: a member joining isn't an edit of the group.
+        """
+        group_ids = list(group_ids)
+        if group_ids and delta:
+            db.session.query(cls).filter(cls.id.in_(group_ids)).update(
+                {
+                    cls.member_count: cls.member_count + delta,
+                    cls.updated_at: cls.updated_at,
+                },
+                synchronize_session=False,
+            )
+
+    @classmethod
+    def refresh_member_counts(cls, group_ids=None, only_drifted=False):
+        """
+        Recompute member_count from memberships, for the given groups or all
+        of them. For bulk deletes where the per-group change isn't known.
+        With only_drifted, groups whose counter is already right aren't
+        rewritten. Returns the number of groups changed.
+        """
+        member_total = (
+            select(func.count(Membership.id))
+            .where(Membership.group_id == cls.id)
+            .scalar_subquery()
+        )
+        query = db.session.query(cls)
+        if group_ids is not None:
+            query = query.filter(cls.id.in_(list(group_ids)))
+        if only_drifted:
+            query = query.filter(cls.member_count != member_total)
+        return query.update(
+            {cls.member_count: member_total, cls.updated_at: cls.updated_at},
+            synchronize_session=False,
+        )
+
     def to_dict_minimal(self):
         """Lightweight version for lists - for performance"""
         return {
@@ -60,7 +103,7 @@ class Group(db.Model):
             "city": self.city,
             "state": self.state,
             "image": self.image,
-            "numMembers": len(self.memberships) if self.memberships else 0,
+            "numMembers": self.member_count,
             "numEvents": len(self.events) if self.events else 0,
             "organizerId": self.organizer_id,
             "organizerName": (
@@ -70,6 +113,36 @@ class Group(db.Model):
             ),
         }
 
+    def to_dict_header(self, counts):
+        """Group detail without its sections - counts come from group_header"""
+        header = {
+            "id": self.id,
+            "organizerId": self.organizer_id,
+            "name": self.name,
+            "about": self.about,
+            "type": self.type,
+            "city": self.city,
+            "state": self.state,
+            "image": self.image,
+            "numMembers": counts["members"],
+            "numEvents": counts["events"],
+            "numUpcomingEvents": counts["upcomingEvents"],
+            "numVenues": counts["venues"],
+            "numImages": counts["images"],
+            "created_at": self.created_at.isoformat(),
+            "updated_at": self.updated_at.isoformat(),
+        }
+        if self.organizer:
+            header["organizer"] = {
+                "id": self.organizer.id,
+                "username": self.organizer.username,
+                "firstName": self.organizer.first_name,
+                "lastName": self.organizer.last_name,
+                "profileImage": self.organizer.profile_image_url,
+                "email": self.organizer.email,
+            }
+        return header
+
     def to_dict(self, include_events=True, include_members=True):
         """full version - selective loading for members"""
         base_dict = {
@@ -81,7 +154,7 @@ class Group(db.Model):
             "city": self.city,
             "state": self.state,
             "image": self.image,
-            "numMembers": len(self.memberships) if self.memberships else 0,
+            "numMembers": self.member_count,
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat(),
         }
@@ -113,11 +186,7 @@ class Group(db.Model):
                     "image": event.image,
                     "startDate": event.start_date.isoformat(),
                     "endDate": event.end_date.isoformat(),
-                    "numAttendees": (
-                        len(event.attendances)
-                        if hasattr(event, "attendances") and event.attendances
-                        else 0
-                    ),
+                    "numAttendees": event.attendee_count,
                 }
                 for event in self.events
             ]
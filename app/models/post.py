@@ -2,14 +2,20 @@ from .db import db, environment, SCHEMA, add_prefix_for_prod
 from .like import likes
 from datetime import datetime
 from sqlalchemy.orm import validates
-from sqlalchemy import text, func
+from sqlalchemy import text, func, select, or_
 
 
 class Post(db.Model):
     __tablename__ = "posts"
 
+    # Composite index backs keyset (cursor) pagination of the feeds
     if environment == "production":
-        __table_args__ = {"schema": SCHEMA}
+        __table_args__ = (
+            db.Index("ix_posts_created_at_id", "created_at", "id"),
+            {"schema": SCHEMA},
+        )
+    else:
+        __table_args__ = (db.Index("ix_posts_created_at_id", "created_at", "id"),)
 
     id = db.Column(db.Integer, primary_key=True, index=True)
     title = db.Column(db.String(50), nullable=False, index=True)
@@ -24,6 +30,12 @@ class Post(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.now, index=True)
     updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
 
+    # Denormalized engagement counters - kept in step with likes/comments writes
+    like_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    comment_count = db.Column(
+        db.Integer, nullable=False, default=0, server_default="0"
+    )
+
     # Relationships with better lazy loading strategies
     user = db.relationship("User", back_populates="posts", lazy="joined")
     post_likes = db.relationship(
@@ -83,8 +95,12 @@ class Post(db.Model):
                     {"user_id": user_id, "post_id": self.id},
                 )
 
+            added = result.rowcount > 0 if hasattr(result, "rowcount") else True
+            if added:
+                Post.adjust_counters(self.id, likes=1)
+
             db.session.commit()
-            return result.rowcount > 0 if hasattr(result, "rowcount") else True
+            return added
 
         except Exception as e:
             db.session.rollback()
@@ -101,6 +117,7 @@ class Post(db.Model):
             )
 
             if result.rowcount > 0:
+                Post.adjust_counters(self.id, likes=-1)
                 db.session.commit()
                 return True
             return False
@@ -109,17 +126,146 @@ class Post(db.Model):
             db.session.rollback()
             return False
 
+    @classmethod
+    def toggle_like(cls, post_id, user_id):
+        """
+        Like or unlike a post for a user inside the current transaction.
+        Returns (is_liked, like_count), or None if the post doesn't exist.
+
+        Never raises on the likes primary key: a like that loses a race to an
+        identical concurrent like is treated as already liked.
+        """
+        params = {"user_id": user_id, "post_id": post_id}
+
+        if db.engine.dialect.name == "postgresql":
+            # Delete, insert and counter update in one statement
+            row = db.session.execute(
+                text(
+                    """
+                    WITH deleted AS (
+                        DELETE FROM likes
+                        WHERE user_id = :user_id AND post_id = :post_id
+                        RETURNING post_id
+                    ), inserted AS (
+                        INSERT INTO likes (user_id, post_id)
+                        SELECT :user_id, :post_id
+                        WHERE NOT EXISTS (SELECT 1 FROM deleted)
+                        AND EXISTS (SELECT 1 FROM posts WHERE id = :post_id)
+                        ON CONFLICT (user_id, post_id) DO NOTHING
+                        RETURNING post_id
+                    )
+                    UPDATE posts
+                    SET like_count = like_count
+                        + (SELECT COUNT(*) FROM inserted)
+                        - (SELECT COUNT(*) FROM deleted)
+                    WHERE id = :post_id
+                    RETURNING like_count, (SELECT COUNT(*) FROM deleted) AS removed
+                """
+                ),
+                params,
+            ).fetchone()
+
+            if row is None:
+                return None
+            return not row.removed, row.like_count
+
+        # SQLite has no data-modifying CTEs. Its writers are serialized, so
+        # the same steps run as separate statements in one transaction.
+        removed = db.session.execute(
+            text("DELETE FROM likes WHERE user_id = :user_id AND post_id = :post_id"),
+            params,
+        ).rowcount
+
+        added = 0
+        if not removed:
+            added = db.session.execute(
+                text(
+                    """
+                    INSERT INTO likes (user_id, post_id)
+                    SELECT :user_id, :post_id
+                    WHERE EXISTS (SELECT 1 FROM posts WHERE id = :post_id)
+                    ON CONFLICT (user_id, post_id) DO NOTHING
+                """
+                ),
+                params,
+            ).rowcount
+
+        row = db.session.execute(
+            text(
+                """
+                UPDATE posts SET like_count = like_count + :delta
+                WHERE id = :post_id
+                RETURNING like_count
+            """
+            ),
+            {"post_id": post_id, "delta": added - removed},
+        ).fetchone()
+
+        if row is None:
+            return None
+        return not removed, row.like_count
+
     def get_like_count(self):
-        """Get like count using efficient aggregation"""
-        try:
-            result = db.session.execute(
-                text("SELECT COUNT(*) FROM likes WHERE post_id = :post_id"),
-                {"post_id": self.id},
-            ).scalar()
-            return result or 0
-        except Exception:
+        """Get like count from the denormalized counter"""
+        return self.like_count or 0
+
+    @classmethod
+    def adjust_counters(cls, post_id, likes=0, comments=0):
+        """
+        Shift a post's counters inside the current transaction.
+        Uses an atomic UPDATE so concurrent writers don't lose increments.
+        updated_at is pinned: a new like or comment isn't an edit of the post.
+        """
+        values = {}
+        if likes:
+            values[cls.like_count] = cls.like_count + likes
+        if comments:
+            values[cls.comment_count] = cls.comment_count + comments
+        if values:
+            values[cls.updated_at] = cls.updated_at
+            db.session.query(cls).filter(cls.id == post_id).update(
+                values, synchronize_session=False
+            )
+
+    @classmethod
+    def refresh_counters(cls, post_ids, only_drifted=False):
+        """
+        Recompute counters from the likes/comments tables for the given posts.
+        For writes that remove an unknown number of rows (cascades, bulk deletes).
+        With only_drifted, posts whose counters are already right are left
+        alone. Returns the number of posts rewritten.
+        """
+        from .comment import Comment
+
+        post_ids = list(post_ids)
+        if not post_ids:
             return 0
 
+        like_total = (
+            select(func.count())
+            .select_from(likes)
+            .where(likes.c.post_id == cls.id)
+            .scalar_subquery()
+        )
+        comment_total = (
+            select(func.count(Comment.id))
+            .where(Comment.post_id == cls.id)
+            .scalar_subquery()
+        )
+        query = db.session.query(cls).filter(cls.id.in_(post_ids))
+        if only_drifted:
+            query = query.filter(
+                or_(cls.like_count != like_total, cls.comment_count != comment_total)
+            )
+        return query.update(
+            {
+                cls.like_count: like_total,
+                cls.comment_count: comment_total,
+                cls.updated_at: cls.updated_at,
+            },
+            synchronize_session=False,
+        )
+
     def is_liked_by_user(self, user_id):
         """Check if post is liked by specific user"""
         try:
@@ -1,5 +1,6 @@
 from .db import db, environment, SCHEMA, add_prefix_for_prod
 from .user_tag import user_tags
+from sqlalchemy import func, select
 
 
 class Tag(db.Model):
@@ -10,6 +11,10 @@ class Tag(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(30), nullable=False)
+    # Number of users holding the tag, kept current by the user_tags writes
+    user_count = db.Column(
+        db.Integer, nullable=False, default=0, server_default="0", index=True
+    )
 
     # Relationship attributes
     tags_users = db.relationship(
@@ -20,3 +25,36 @@ class Tag(db.Model):
 
     def to_dict(self):
         return {"id": self.id, "name": self.name}
+
+    @classmethod
+    def adjust_user_counts(cls, tag_ids, delta):
+        """
+        Shift user_count on the given tags inside the current transaction.
+        Uses an atomic UPDATE so concurrent writers don't lose increments.
+        """
+        tag_ids = list(tag_ids)
+        if tag_ids and delta:
+            db.session.query(cls).filter(cls.id.in_(tag_ids)).update(
+                {cls.user_count: cls.user_count + delta}, synchronize_session=False
+            )
+
+    @classmethod
+    def refresh_user_counts(cls, tag_ids=None, only_drifted=False):
+        """
+        Recompute user_count from user_tags, for the given tags or all of
+        them. For bulk writes where the per-tag change isn't known. With
+        only_drifted, tags whose counter is already right aren't rewritten.
+        Returns the number of tags changed.
+        """
+        user_total = (
+            select(func.count())
+            .select_from(user_tags)
+            .where(user_tags.c.tag_id == cls.id)
+            .scalar_subquery()
+        )
+        query = db.session.query(cls)
+        if tag_ids is not None:
+            query = query.filter(cls.id.in_(list(tag_ids)))
+        if only_drifted:
+            query = query.filter(cls.user_count != user_total)
+        return query.update({cls.user_count: user_total}, synchronize_session=False)
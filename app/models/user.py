@@ -1,5 +1,5 @@
 from .db import db, environment, SCHEMA, add_prefix_for_prod
-from werkzeug.security import generate_password_hash, check_password_hash
+from app.utilities.password_hashing import password_hasher
 from sqlalchemy.ext.associationproxy import association_proxy
 from flask_login import UserMixin
 from datetime import datetime
@@ -27,6 +27,18 @@ class User(db.Model, UserMixin):
     created_at = db.Column(db.DateTime, default=datetime.now, index=True)
     updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
 
+    # Session bootstrap section versions - bumped on profile, membership and
+    # attendance writes so /api/auth/ can serve cached sections
+    profile_version = db.Column(
+        db.Integer, nullable=False, default=0, server_default="0"
+    )
+    groups_version = db.Column(
+        db.Integer, nullable=False, default=0, server_default="0"
+    )
+    events_version = db.Column(
+        db.Integer, nullable=False, default=0, server_default="0"
+    )
+
     # Relationships with lazy loading
     posts = db.relationship("Post", back_populates="user", lazy="select")
     user_likes = db.relationship(
@@ -54,10 +66,14 @@ class User(db.Model, UserMixin):
             self.hashed_password = "OAUTH"
             return
         else:
-            self.hashed_password = generate_password_hash(password)
+            self.hashed_password = password_hasher.hash(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password, password)
+        return password_hasher.verify(self.password, password)
+
+    def password_needs_rehash(self):
+        """Whether the stored hash predates the current hash parameters"""
+        return password_hasher.needs_rehash(self.hashed_password)
 
     def to_dict_auth(self):
         """Ultra-lightweight version for authentication - fastest possible loading"""
@@ -82,11 +98,7 @@ class User(db.Model, UserMixin):
                         "state": membership.group.state,
                         "type": membership.group.type,
                         "organizerId": membership.group.organizer_id,
-                        "numMembers": (
-                            len(membership.group.memberships)
-                            if hasattr(membership.group, "memberships")
-                            else 0
-                        ),
+                        "numMembers": membership.group.member_count,
                     }
                     # Avoid duplicates
                     if not any(g["id"] == group_data["id"] for g in user_groups):
@@ -108,9 +120,7 @@ class User(db.Model, UserMixin):
                     "state": group.state,
                     "type": group.type,
                     "organizerId": group.organizer_id,
-                    "numMembers": (
-                        len(group.memberships) if hasattr(group, "memberships") else 0
-                    ),
+                    "numMembers": group.member_count,
                 }
                 # Avoid duplicates
                 if not any(g["id"] == group_data["id"] for g in user_groups):
@@ -157,11 +167,7 @@ class User(db.Model, UserMixin):
                         "state": membership.group.state,
                         "type": membership.group.type,
                         "organizerId": membership.group.organizer_id,
-                        "numMembers": (
-                            len(membership.group.memberships)
-                            if hasattr(membership.group, "memberships")
-                            else 0
-                        ),
+                        "numMembers": membership.group.member_count,
                     }
                     # Avoid duplicates
                     if not any(g["id"] == group_data["id"] for g in all_user_groups):
@@ -183,9 +189,7 @@ class User(db.Model, UserMixin):
                     "state": group.state,
                     "type": group.type,
                     "organizerId": group.organizer_id,
-                    "numMembers": (
-                        len(group.memberships) if hasattr(group, "memberships") else 0
-                    ),
+                    "numMembers": group.member_count,
                 }
                 # Avoid duplicates
                 if not any(g["id"] == group_data["id"] for g in all_user_groups):
@@ -217,11 +221,7 @@ class User(db.Model, UserMixin):
                             if attendance.event.end_date
                             else None
                         ),
-                        "numAttendees": (
-                            len(attendance.event.attendances)
-                            if hasattr(attendance.event, "attendances")
-                            else 0
-                        ),
+                        "numAttendees": attendance.event.attendee_count,
                         "groupInfo": {
                             "name": (
                                 attendance.event.groups.name
@@ -319,11 +319,7 @@ class User(db.Model, UserMixin):
                         "state": membership.group.state,
                         "type": membership.group.type,
                         "organizerId": membership.group.organizer_id,
-                        "numMembers": (
-                            len(membership.group.memberships)
-                            if hasattr(membership.group, "memberships")
-                            else 0
-                        ),
+                        "numMembers": membership.group.member_count,
                     }
                     # Avoid duplicates
                     if not any(g["id"] == group_data["id"] for g in all_user_groups):
@@ -341,9 +337,7 @@ class User(db.Model, UserMixin):
                     "state": group.state,
                     "type": group.type,
                     "organizerId": group.organizer_id,
-                    "numMembers": (
-                        len(group.memberships) if hasattr(group, "memberships") else 0
-                    ),
+                    "numMembers": group.member_count,
                 }
                 # Avoid duplicates
                 if not any(g["id"] == group_data["id"] for g in all_user_groups):
@@ -371,11 +365,7 @@ class User(db.Model, UserMixin):
                             if attendance.event.end_date
                             else None
                         ),
-                        "numAttendees": (
-                            len(attendance.event.attendances)
-                            if hasattr(attendance.event, "attendances")
-                            else 0
-                        ),
+                        "numAttendees": attendance.event.attendee_count,
                         "groupInfo": {
                             "id": (
                                 attendance.event.groups.id
@@ -417,7 +407,7 @@ class User(db.Model, UserMixin):
             )[:20]
 
             for post in sorted_posts:
-                comment_count = len(post.post_comments) if hasattr(post, "post_comments") else 0
+                comment_count = post.comment_count or 0
 
                 post_data = {
                     "id": post.id,
@@ -425,9 +415,7 @@ class User(db.Model, UserMixin):
                     "caption": post.caption,
                     "image": post.image,
                     "creator": post.creator,
-                    "likes": (
-                        len(post.post_likes) if hasattr(post, "post_likes") else 0
-                    ),
+                    "likes": post.like_count or 0,
                     "comments": comment_count,
                     "numComments": comment_count,
                     "createdAt": (
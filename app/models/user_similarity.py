@@ -0,0 +1,26 @@
+from .db import db, environment, SCHEMA, add_prefix_for_prod
+
+
+# Precomputed pairs of users that share at least one tag. Both directions of
+# a pair are stored so a user's similar users are one primary key range scan.
+user_similarity = db.Table(
+    "user_similarity",
+    db.Model.metadata,
+    db.Column(
+        "user_id",
+        db.Integer,
+        db.ForeignKey(add_prefix_for_prod("users.id")),
+        primary_key=True,
+    ),
+    db.Column(
+        "similar_user_id",
+        db.Integer,
+        db.ForeignKey(add_prefix_for_prod("users.id")),
+        primary_key=True,
+    ),
+    db.Column("shared_tags", db.Integer, nullable=False, default=0),
+    db.Index("ix_user_similarity_similar_user_id", "similar_user_id"),
+)
+
+if environment == "production":
+    user_similarity.schema = SCHEMA
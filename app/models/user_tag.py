@@ -16,6 +16,8 @@ user_tags = db.Table(
         db.ForeignKey(add_prefix_for_prod("tags.id")),
         primary_key=True,
     ),
+    # Lets similarity maintenance find every user holding a tag
+    db.Index("ix_user_tags_tag_id", "tag_id"),
 )
 
 if environment == "production":
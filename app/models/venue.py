@@ -1,5 +1,14 @@
 from .db import db, environment, SCHEMA, add_prefix_for_prod
 from datetime import datetime
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import validates
+from app.utilities.geo import (
+    bounding_box,
+    covering_cells,
+    haversine,
+    location_geohash,
+    prefix_range,
+)
 
 
 class Venue(db.Model):
@@ -18,6 +27,8 @@ class Venue(db.Model):
     zip_code = db.Column(db.String(5), nullable=False)
     latitude = db.Column(db.Numeric(scale=10, asdecimal=False), nullable=True)
     longitude = db.Column(db.Numeric(scale=10, asdecimal=False), nullable=True)
+    # Kept in sync with latitude/longitude by validate_location
+    geohash = db.Column(db.String(12), nullable=True, index=True)
     created_at = db.Column(db.DateTime, default=datetime.now)
     updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
 
@@ -25,6 +36,46 @@ class Venue(db.Model):
     events = db.relationship("Event", back_populates="venues")
     groups = db.relationship("Group", back_populates="venues")
 
+    @validates("latitude", "longitude")
+    def validate_location(self, key, value):
+        latitude = value if key == "latitude" else self.latitude
+        longitude = value if key == "longitude" else self.longitude
+        self.geohash = location_geohash(latitude, longitude)
+        return value
+
+    @classmethod
+    def within(cls, latitude, longitude, radius, limit=2000):
+        """
+        The nearest venues within radius miles of a point, nearest first, as
+        (venue id, group id, distance) rows - at most limit of them.
+
+        The geohash cells covering the bounding box and its latitude band
+        are prefiltered in SQL (geohash index), then exact haversine
+        distances are computed for those candidates only.
+        """
+        south, north, west, east = bounding_box(latitude, longitude, radius)
+        cells = []
+        for cell in covering_cells(south, north, west, east):
+            low, high = prefix_range(cell)
+            if high is None:
+                cells.append(cls.geohash >= low)
+            else:
+                cells.append(and_(cls.geohash >= low, cls.geohash < high))
+
+        candidates = (
+            db.session.query(cls.id, cls.group_id, cls.latitude, cls.longitude)
+            .filter(or_(*cells), cls.latitude.between(south, north))
+            .all()
+        )
+
+        hits = []
+        for venue_id, group_id, venue_lat, venue_lng in candidates:
+            distance = haversine(latitude, longitude, venue_lat, venue_lng)
+            if distance <= radius:
+                hits.append((venue_id, group_id, distance))
+        hits.sort(key=lambda hit: (hit[2], hit[0]))
+        return hits[:limit]
+
     def to_dict(self):
         return {
             "id": self.id,
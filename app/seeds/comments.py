@@ -12,6 +12,10 @@ def seed_comments():
             parent_id=comment_data["parent_id"],
         )
         db.session.add(comment)
+    db.session.flush()
+
+    # Keep the denormalized comment counters on posts in step
+    Post.refresh_counters({comment_data["post_id"] for comment_data in comments})
     db.session.commit()
 
 
@@ -21,6 +25,7 @@ def undo_comments():
             f"TRUNCATE table {SCHEMA}.comments RESTART IDENTITY CASCADE;"
         )
     else:
+        db.session.execute(text("DELETE FROM comment_closure"))
         db.session.execute(text("DELETE FROM comments"))
 
     db.session.commit()
@@ -33,6 +33,8 @@ def seed_events():
                     db.session.add(attendance)
             else:
                 print(f"User with username {username} not found")
+    db.session.flush()
+    Event.refresh_attendee_counts()
     db.session.commit()
 
 
@@ -47,6 +49,7 @@ def undo_events():
     if environment == "production":
         db.session.execute(f"TRUNCATE table {SCHEMA}.events RESTART IDENTITY CASCADE;")
     else:
+        db.session.execute(text("DELETE FROM event_waitlist"))
         db.session.execute(text("DELETE FROM events"))
     db.session.commit()
 
@@ -41,6 +41,8 @@ def seed_groups():
     #       else:
     #           print(f"User with username {username} not found")
 
+    db.session.flush()
+    Group.refresh_member_counts()
     db.session.commit()
 
 
@@ -75,6 +77,8 @@ def seed_groups_minimal():
                 membership = Membership(group_id=group.id, user_id=user.id)
                 db.session.add(membership)
 
+    db.session.flush()
+    Group.refresh_member_counts()
     db.session.commit()
 
 
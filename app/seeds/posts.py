@@ -24,6 +24,7 @@ def seed_posts():
                 post.post_likes.append(user)
             else:
                 print(f"User with username {username} not found")
+        post.like_count = len(post.post_likes)
         print(f"Post: {post.title}, Likes: {len(post.post_likes)}")  # Debugging line
         db.session.add(post)
     db.session.commit()
@@ -54,6 +55,7 @@ def seed_posts_minimal():
             user = user_map.get(username)
             if user:
                 post.post_likes.append(user)
+        post.like_count = len(post.post_likes)
 
         db.session.add(post)
     db.session.commit()
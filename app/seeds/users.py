@@ -2,6 +2,8 @@ from app.models import db, User, Tag, environment, SCHEMA
 from sqlalchemy.sql import text
 from app.seeds.data.users import users
 from app.seeds.data.tags import tags
+from app.utilities.user_similarity import rebuild_user_similarity
+from app.utilities.tag_catalog import bump_tag_catalog_version
 
 
 # Adds a demo user, you can add other users here if you want
@@ -26,6 +28,7 @@ def seed_tags():
     for tag_data in tags:
         tag = Tag(**tag_data)
         db.session.add(tag)
+    bump_tag_catalog_version()
     db.session.commit()
 
 
@@ -51,6 +54,9 @@ def seed_user_tags():
             tag = Tag.query.filter_by(name=tag_name).first()
             if user and tag:
                 user.users_tags.append(tag)
+    db.session.flush()
+    rebuild_user_similarity()
+    Tag.refresh_user_counts()
     db.session.commit()
 
 
@@ -73,14 +79,20 @@ def undo_tags():
         db.session.execute(f"TRUNCATE table {SCHEMA}.tags RESTART IDENTITY CASCADE;")
     else:
         db.session.execute(text("DELETE FROM tags"))
+    bump_tag_catalog_version()
     db.session.commit()
 
 
 def undo_user_tags():
     if environment == "production":
+        db.session.execute(
+            f"TRUNCATE table {SCHEMA}.user_similarity RESTART IDENTITY CASCADE;"
+        )
         db.session.execute(
             f"TRUNCATE table {SCHEMA}.user_tags RESTART IDENTITY CASCADE;"
         )
     else:
+        db.session.execute(text("DELETE FROM user_similarity"))
         db.session.execute(text("DELETE FROM user_tags"))
+    Tag.refresh_user_counts()
     db.session.commit()
@@ -0,0 +1,121 @@
+from app.models import db, Comment
+from app.utilities.pagination import encode_cursor
+from sqlalchemy import func, select
+from sqlalchemy.orm import joinedload
+from sqlalchemy.orm.attributes import set_committed_value
+
+
+def comment_load_options():
+    """Loader options shared by every comment query in a thread page"""
+    return (
+        joinedload(Comment.commenter).load_only(
+            "id", "username", "first_name", "last_name", "profile_image_url"
+        ),
+    )
+
+
+def _reply_window(parent_ids, per_parent):
+    """
+    The oldest per_parent replies of each parent in one windowed query,
+    along with each parent's total number of direct replies.
+    """
+    ranked = (
+        select(
+            Comment.id.label("id"),
+            func.row_number()
+            .over(
+                partition_by=Comment.parent_id,
+                order_by=(Comment.created_at, Comment.id),
+            )
+            .label("position"),
+            func.count().over(partition_by=Comment.parent_id).label("total"),
+        )
+        .where(Comment.parent_id.in_(parent_ids))
+        .subquery()
+    )
+
+    return (
+        db.session.query(Comment, ranked.c.total)
+        .options(*comment_load_options())
+        .join(ranked, ranked.c.id == Comment.id)
+        .filter(ranked.c.position <= per_parent)
+        .order_by(Comment.created_at, Comment.id)
+        .all()
+    )
+
+
+def load_reply_windows(roots, per_parent, max_depth=5):
+    """
+    Load bounded reply windows under a page of root comments.
+
+    Replies are fetched one thread level at a time, at most per_parent per
+    comment, so a page costs the same however large the thread is. Each
+    comment's replies collection is set to its window, and the returned dict
+    maps comment id to its replyCount and moreRepliesCursor. The cursor
+    continues the list through /api/comments/<id>/replies?cursor=. It is
+    "" when the window is empty because the comment sits at max_depth.
+    """
+    threads = {}
+    level = list(roots)
+
+    for _ in range(max_depth):
+        if not level:
+            break
+
+        children = {comment.id: [] for comment in level}
+        totals = {}
+        for reply, total in _reply_window(list(children), per_parent):
+            children[reply.parent_id].append(reply)
+            totals[reply.parent_id] = total
+
+        for comment in level:
+            replies = children[comment.id]
+            set_committed_value(comment, "replies", replies)
+
+            more_cursor = None
+            if totals.get(comment.id, 0) > len(replies):
+                more_cursor = encode_cursor(replies[-1].created_at, replies[-1].id)
+
+            threads[comment.id] = {
+                "replyCount": totals.get(comment.id, 0),
+                "moreRepliesCursor": more_cursor,
+            }
+
+        level = [reply for replies in children.values() for reply in replies]
+
+    # Deepest level: counts only, replies are left for the replies endpoint
+    if level:
+        counts = dict(
+            db.session.query(Comment.parent_id, func.count(Comment.id))
+            .filter(Comment.parent_id.in_([comment.id for comment in level]))
+            .group_by(Comment.parent_id)
+            .all()
+        )
+        for comment in level:
+            set_committed_value(comment, "replies", [])
+            reply_count = counts.get(comment.id, 0)
+            threads[comment.id] = {
+                "replyCount": reply_count,
+                "moreRepliesCursor": "" if reply_count else None,
+            }
+
+    return threads
+
+
+def serialize_comment_thread(comment, threads, liked_comment_ids):
+    """
+    Comment dictionary with its loaded reply window, recursively.
+    liked_comment_ids is the current user's liked set for every comment
+    in threads, from CommentLike.liked_comment_ids.
+    """
+    data = comment.to_dict_with_likes(liked_comment_ids=liked_comment_ids)
+
+    thread = threads.get(comment.id)
+    if thread:
+        data["replies"] = [
+            serialize_comment_thread(reply, threads, liked_comment_ids)
+            for reply in comment.replies
+        ]
+        data.update(thread)
+
+    return data
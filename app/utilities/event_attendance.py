@@ -0,0 +1,147 @@
+from app.models import db, Event, Attendance, EventWaitlist
+from app.utilities.session_bootstrap import bump_attendee_versions
+from sqlalchemy import exists, func
+
+# What attend() did for the user
+ATTENDING = "attending"
+ALREADY_ATTENDING = "already_attending"
+WAITLISTED = "waitlisted"
+ALREADY_WAITLISTED = "already_waitlisted"
+FULL = "full"
+
+
+def _take_seat(event_id, respect_queue=True):
+    """
+    Claim one seat with a single conditional UPDATE - the row only changes
+    while attendee_count is under capacity, so concurrent callers can never
+    push it past. With respect_queue, a seat isn't handed out while anyone
+    is waiting for one. True if a seat was claimed. updated_at is pinned,
+    as in Event.adjust_attendee_counts.
+
+    It runs before any other write so SQLite takes its write lock up front,
+    and on Postgres the event row stays locked until commit.
+    """
+    conditions = [Event.id == event_id, Event.attendee_count < Event.capacity]
+    if respect_queue:
+        conditions.append(~exists().where(EventWaitlist.event_id == event_id))
+    claimed = (
+        db.session.query(Event)
+        .filter(*conditions)
+        .update(
+            {
+                Event.attendee_count: Event.attendee_count + 1,
+                Event.updated_at: Event.updated_at,
+            },
+            synchronize_session=False,
+        )
+    )
+    return claimed == 1
+
+
+def _is_attending(event_id, user_id):
+    return db.session.query(
+        exists().where(Attendance.event_id == event_id, Attendance.user_id == user_id)
+    ).scalar()
+
+
+def waitlist_position(event_id, user_id):
+    """The user's 1-based place in the event's waitlist, or None"""
+    entry_id = (
+        db.session.query(EventWaitlist.id)
+        .filter(EventWaitlist.event_id == event_id, EventWaitlist.user_id == user_id)
+        .scalar()
+    )
+    if entry_id is None:
+        return None
+    return (
+        db.session.query(func.count(EventWaitlist.id))
+        .filter(EventWaitlist.event_id == event_id, EventWaitlist.id <= entry_id)
+        .scalar()
+    )
+
+
+def promote(event_id):
+    """
+    Move waitlisted users into open seats, first come first served, and
+    bump their events section. Returns the ids of the promoted users.
+    """
+    promoted = []
+    while _take_seat(event_id, respect_queue=False):
+        entry = (
+            db.session.query(EventWaitlist)
+            .filter(EventWaitlist.event_id == event_id)
+            .order_by(EventWaitlist.id)
+            .with_for_update()
+            .first()
+        )
+        if entry is None:
+            Event.adjust_attendee_counts([event_id], -1)
+            break
+        db.session.add(Attendance(event_id=event_id, user_id=entry.user_id))
+        db.session.delete(entry)
+        db.session.flush()
+        promoted.append(entry.user_id)
+    bump_attendee_versions(promoted)
+    return promoted
+
+
+def attend(event_id, user_id, waitlist=True):
+    """
+    Admit the user to the event inside the current transaction.
+
+    Returns (status, position): ATTENDING or ALREADY_ATTENDING, WAITLISTED
+    or ALREADY_WAITLISTED with the user's place in line, or FULL when the
+    event has no seat and waitlist is False. Two concurrent requests for
+    the same user can both claim a seat; the second fails on the unique
+    attendance on flush or commit and its rollback hands the seat back.
+    """
+    if _take_seat(event_id):
+        if _is_attending(event_id, user_id):
+            Event.adjust_attendee_counts([event_id], -1)
+            return ALREADY_ATTENDING, None
+        db.session.add(Attendance(event_id=event_id, user_id=user_id))
+        db.session.flush()
+        return ATTENDING, None
+
+    if _is_attending(event_id, user_id):
+        return ALREADY_ATTENDING, None
+
+    position = waitlist_position(event_id, user_id)
+    if position is not None:
+        return ALREADY_WAITLISTED, position
+    if not waitlist:
+        return FULL, None
+
+    db.session.add(EventWaitlist(event_id=event_id, user_id=user_id))
+    db.session.flush()
+
+    # A seat may have opened after the claim above failed; fill it from
+    # the front of the line, which could be this user
+    if user_id in promote(event_id):
+        return ATTENDING, None
+    return WAITLISTED, waitlist_position(event_id, user_id)
+
+
+def leave(event_id, user_id):
+    """
+    Take the user out of the event or its waitlist, inside the current
+    transaction. A freed seat goes to the front of the waitlist.
+
+    Returns (status, promoted): ATTENDING or WAITLISTED for where the user
+    was, None if neither, and the ids of users promoted into the seat.
+    """
+    removed = (
+        db.session.query(Attendance)
+        .filter(Attendance.event_id == event_id, Attendance.user_id == user_id)
+        .delete(synchronize_session=False)
+    )
+    if removed:
+        Event.adjust_attendee_counts([event_id], -removed)
+        return ATTENDING, promote(event_id)
+
+    removed = (
+        db.session.query(EventWaitlist)
+        .filter(EventWaitlist.event_id == event_id, EventWaitlist.user_id == user_id)
+        .delete(synchronize_session=False)
+    )
+    return (WAITLISTED if removed else None), []
@@ -0,0 +1,177 @@
+from app.models import db, Post, UserSimilarity
+from app.utilities.feed_hydration import hydrate_feed, serialize_feed_post
+from app.utilities.pagination import cursor_paginate
+from sqlalchemy import desc, func
+from sqlalchemy.orm import lazyload
+
+NO_TAGS_MESSAGE = "Add tags to your profile to discover posts from similar users!"
+NO_SIMILAR_POSTS_MESSAGE = "No posts found from users with similar interests."
+
+
+def all_posts_query():
+    """Base query for the all posts feed"""
+    return Post.query.options(lazyload(Post.user))
+
+
+def similar_posts_query(user_id):
+    """Posts by users sharing a tag, via the precomputed similarity pairs"""
+    return (
+        all_posts_query()
+        .join(UserSimilarity, UserSimilarity.c.similar_user_id == Post.creator)
+        .filter(UserSimilarity.c.user_id == user_id)
+    )
+
+
+def similar_users_count(user_id):
+    return (
+        db.session.query(func.count())
+        .select_from(UserSimilarity)
+        .filter(UserSimilarity.c.user_id == user_id)
+        .scalar()
+        or 0
+    )
+
+
+def empty_page_pagination(page, per_page):
+    return {
+        "page": page,
+        "pages": 0,
+        "per_page": per_page,
+        "total": 0,
+        "has_next": False,
+        "has_prev": False,
+    }
+
+
+def page_pagination(posts, page, per_page):
+    return {
+        "page": page,
+        "pages": posts.pages,
+        "per_page": per_page,
+        "total": posts.total,
+        "has_next": posts.has_next,
+        "has_prev": posts.has_prev,
+    }
+
+
+class FeedBatch:
+    """
+    Plans the /feed/batch response in a single pass.
+
+    The all and similar pages are fetched once each, their creators are
+    hydrated together in one query, and the stats reuse the page totals
+    instead of counting again. Counts are only run separately in cursor
+    mode, where the pages do not carry a total.
+    """
+
+    def __init__(self, user, page, per_page, cursor=None, include_total=False):
+        self.user = user
+        self.page = page
+        self.per_page = per_page
+        self.cursor = cursor
+        self.use_cursor = cursor is not None
+        self.include_total = include_total
+
+    def _paginate(self, query):
+        if self.use_cursor:
+            return cursor_paginate(
+                query, Post, self.cursor, self.per_page, self.include_total
+            )
+        return query.order_by(desc(Post.created_at)).paginate(
+            page=self.page, per_page=self.per_page, error_out=False
+        )
+
+    def _pagination(self, posts):
+        if self.use_cursor:
+            return posts.pagination()
+        return page_pagination(posts, self.page, self.per_page)
+
+    def _total(self, posts, query):
+        """Total rows for a feed, counted only when the page lacks one"""
+        if posts is not None and posts.total is not None:
+            return posts.total
+        return query.order_by(None).count()
+
+    def build(self):
+        tag_count = len(self.user.users_tags)
+
+        all_query = all_posts_query()
+        similar_query = similar_posts_query(self.user.id)
+
+        # An invalid cursor leaves both feeds empty but still returns stats
+        try:
+            all_posts = self._paginate(all_query)
+            similar_posts = self._paginate(similar_query) if tag_count else None
+            cursor_error = False
+        except ValueError:
+            all_posts = similar_posts = None
+            cursor_error = True
+
+        page_posts = list(all_posts.items) if all_posts else []
+        if similar_posts:
+            page_posts.extend(similar_posts.items)
+
+        # Creators for both pages in one query
+        hydration = hydrate_feed([post.creator for post in page_posts])
+
+        similar_users = similar_users_count(self.user.id) if tag_count else 0
+
+        stats = {
+            "totalPosts": self._total(all_posts, all_query),
+            "similarUsers": similar_users,
+            "similarPosts": (
+                self._total(similar_posts, similar_query) if similar_users else 0
+            ),
+            "userTags": tag_count,
+        }
+
+        if cursor_error:
+            all_data = {"posts": [], "pagination": {}}
+            similar_data = (
+                {
+                    "posts": [],
+                    "pagination": {},
+                    "message": "Error loading similar posts",
+                }
+                if tag_count
+                else self._similar_data(None, hydration)
+            )
+        else:
+            all_data = self._feed_data(all_posts, hydration)
+            similar_data = self._similar_data(similar_posts, hydration)
+
+        return {
+            "allPosts": all_data["posts"],
+            "similarPosts": similar_data["posts"],
+            "allPostsPagination": all_data["pagination"],
+            "similarPostsPagination": similar_data["pagination"],
+            "stats": stats,
+            "message": similar_data.get("message"),
+            "activeTab": "all",
+        }
+
+    def _feed_data(self, posts, hydration):
+        if not posts.items and not self.use_cursor:
+            return {
+                "posts": [],
+                "pagination": empty_page_pagination(self.page, self.per_page),
+            }
+
+        return {
+            "posts": [serialize_feed_post(post, hydration) for post in posts.items],
+            "pagination": self._pagination(posts),
+        }
+
+    def _similar_data(self, posts, hydration):
+        if posts is None:
+            pagination = (
+                {"per_page": self.per_page, "next_cursor": None, "has_next": False}
+                if self.use_cursor
+                else empty_page_pagination(1, self.per_page)
+            )
+            return {"posts": [], "pagination": pagination, "message": NO_TAGS_MESSAGE}
+
+        data = self._feed_data(posts, hydration)
+        if not data["posts"]:
+            data["message"] = NO_SIMILAR_POSTS_MESSAGE
+        return data
@@ -0,0 +1,62 @@
+from app.models import db, User
+from sqlalchemy.orm import load_only
+
+
+def hydrate_feed(creator_ids):
+    """
+    Load creators for a page of posts.
+
+    Runs a single query no matter how many posts are on the page. Like and
+    comment counts come from the denormalized counters on the posts rows.
+    """
+    creator_ids = {creator_id for creator_id in creator_ids if creator_id}
+
+    creators = {}
+    if creator_ids:
+        users = (
+            db.session.query(User)
+            .options(
+                load_only(
+                    "id", "username", "first_name", "last_name", "profile_image_url"
+                )
+            )
+            .filter(User.id.in_(creator_ids))
+            .all()
+        )
+        creators = {
+            user.id: {
+                "id": user.id,
+                "username": user.username,
+                "firstName": user.first_name or "",
+                "lastName": user.last_name or "",
+                "profileImage": user.profile_image_url or "",
+            }
+            for user in users
+        }
+
+    return {"creators": creators}
+
+
+def serialize_feed_post(post, hydration):
+    """Feed dictionary for a single post using data from hydrate_feed"""
+    return {
+        "id": post.id,
+        "title": post.title or "",
+        "caption": post.caption or "",
+        "creator": post.creator,
+        "image": post.image or "",
+        "likes": post.like_count or 0,
+        "comments": post.comment_count or 0,
+        "createdAt": post.created_at.isoformat() if post.created_at else None,
+        "updatedAt": post.updated_at.isoformat() if post.updated_at else None,
+        "user": hydration["creators"].get(post.creator),
+    }
+
+
+def serialize_feed_posts(posts):
+    """Hydrate and serialize a page of posts for the feed endpoints"""
+    if not posts:
+        return []
+
+    hydration = hydrate_feed([post.creator for post in posts])
+    return [serialize_feed_post(post, hydration) for post in posts]
@@ -0,0 +1,165 @@
+import math
+from sqlalchemy import case, false
+
+EARTH_RADIUS_MILES = 3958.8
+
+# Geohashes stored on venues: 9 characters is a cell of about 5 x 5 meters
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+PRECISION = 9
+
+# ?near=lat,lng&radius= in miles
+NEAR_PARAMS = ("near", "radius")
+DEFAULT_RADIUS = 25
+MAX_RADIUS = 500
+
+# A bounding box is covered by at most this many geohash prefixes
+MAX_CELLS = 16
+
+
+def encode(latitude, longitude, precision=PRECISION):
+    """The geohash of a point: lng/lat bits interleaved, 5 bits a character"""
+    latitude = min(max(latitude, -90.0), 90.0)
+    longitude = (longitude + 180.0) % 360.0 - 180.0
+    ranges = ([-180.0, 180.0], [-90.0, 90.0])
+    values = (longitude, latitude)
+
+    chars = []
+    index = 0
+    bit = 0
+    while len(chars) < precision:
+        low_high = ranges[bit % 2]
+        middle = (low_high[0] + low_high[1]) / 2
+        if values[bit % 2] >= middle:
+            index = index * 2 + 1
+            low_high[0] = middle
+        else:
+            index = index * 2
+            low_high[1] = middle
+        bit += 1
+        if bit % 5 == 0:
+            chars.append(BASE32[index])
+            index = 0
+    return "".join(chars)
+
+
+def location_geohash(latitude, longitude):
+    """The geohash of a venue's coordinates, or None without a valid pair"""
+    try:
+        latitude, longitude = float(latitude), float(longitude)
+    except (TypeError, ValueError):
+        return None
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        return None
+    return encode(latitude, longitude)
+
+
+def cell_size(precision):
+    """(height, width) in degrees of a geohash cell of this precision"""
+    bits = precision * 5
+    return 180.0 / 2 ** (bits // 2), 360.0 / 2 ** ((bits + 1) // 2)
+
+
+def bounding_box(latitude, longitude, radius):
+    """(south, north, west, east) of the box around a circle of radius miles"""
+    delta_lat = math.degrees(radius / EARTH_RADIUS_MILES)
+    south, north = max(latitude - delta_lat, -90.0), min(latitude + delta_lat, 90.0)
+
+    # Near the poles the circle spans every longitude
+    widest = max(abs(south), abs(north))
+    if widest >= 90.0:
+        return south, north, -180.0, 180.0
+    delta_lng = math.degrees(
+        radius / (EARTH_RADIUS_MILES * math.cos(math.radians(widest)))
+    )
+    if delta_lng >= 180.0:
+        return south, north, -180.0, 180.0
+    return south, north, longitude - delta_lng, longitude + delta_lng
+
+
+def covering_cells(south, north, west, east):
+    """
+    The geohash prefixes whose cells cover a bounding box, at the finest
+    precision that needs no more than MAX_CELLS of them. The box may
+    cross the antimeridian (west < -180 or east > 180).
+    """
+    for precision in range(PRECISION, 0, -1):
+        height, width = cell_size(precision)
+        rows = math.floor(north / height) - math.floor(south / height) + 1
+        columns = math.floor(east / width) - math.floor(west / width) + 1
+        if rows * columns <= MAX_CELLS:
+            break
+
+    # Stepping by whole cells from the corner hits every row and column
+    latitudes = [min(south + row * height, north) for row in range(rows)] + [north]
+    longitudes = [min(west + column * width, east) for column in range(columns)]
+    cells = {
+        encode(latitude, longitude, precision)
+        for latitude in latitudes
+        for longitude in longitudes + [east]
+    }
+    return sorted(cells)
+
+
+def prefix_range(cell):
+    """
+    (low, high) bounds of the geohashes starting with cell: low <= geohash
+    < high, with high None past the last cell. high is the next cell of
+    the same length, so only base32 characters are compared and the range
+    holds under any collation, not just byte order.
+    """
+    chars = list(cell)
+    for position in range(len(chars) - 1, -1, -1):
+        index = BASE32.index(chars[position])
+        if index + 1 < len(BASE32):
+            chars[position] = BASE32[index + 1]
+            return cell, "".join(chars[: position + 1])
+    return cell, None
+
+
+def haversine(lat1, lng1, lat2, lng2):
+    """Great-circle distance in miles"""
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_MILES * math.asin(min(1.0, math.sqrt(a)))
+
+
+def parse_near(args):
+    """
+    The (latitude, longitude, radius) of a ?near=lat,lng&radius= request,
+    or None without near. Raises ValueError for a bad location or radius.
+    """
+    near = args.get("near", "").strip()
+    if not near:
+        return None
+
+    try:
+        latitude, longitude = (float(part) for part in near.split(","))
+    except ValueError:
+        raise ValueError("near must be latitude,longitude")
+    if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        raise ValueError("near is not a valid latitude,longitude")
+
+    radius = args.get("radius", DEFAULT_RADIUS, type=float)
+    if radius is None or not 0 < radius <= MAX_RADIUS:
+        raise ValueError(f"radius must be between 0 and {MAX_RADIUS} miles")
+    return latitude, longitude, radius
+
+
+def order_by_distance(query, column, distances):
+    """
+    Narrow query to rows whose column is a key of distances (ordered
+    nearest first, as built from Venue.within) and sort them that way.
+    """
+    if not distances:
+        return query.filter(false())
+    rank = case({key: position for position, key in enumerate(distances)}, value=column)
+    return query.filter(column.in_(list(distances))).order_by(rank)
+
+
+def near_info(near):
+    """The near search echoed back in list responses"""
+    latitude, longitude, radius = near
+    return {"latitude": latitude, "longitude": longitude, "radius": radius}
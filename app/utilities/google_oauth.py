@@ -0,0 +1,175 @@
+import json
+import os
+import re
+import threading
+import time
+from functools import lru_cache
+from flask import current_app
+
+GOOGLE_AUTH_URI = "https://accounts.google.com/o/oauth2/auth"
+GOOGLE_TOKEN_URI = "https://oauth2.googleapis.com/token"
+GOOGLE_CERTS_URL = "https://www.googleapis.com/oauth2/v1/certs"
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+SCOPES = [
+    "openid",
+    "https://www.googleapis.com/auth/userinfo.email",
+    "https://www.googleapis.com/auth/userinfo.profile",
+]
+
+
+class OAuthNotConfigured(Exception):
+    """Raised when Google sign-in is used without a client id and secret"""
+
+
+def oauth_enabled():
+    config = current_app.config
+    return bool(config.get("GOOGLE_OAUTH_CLIENT_ID")) and bool(
+        config.get("GOOGLE_OAUTH_CLIENT_SECRET")
+    )
+
+
+@lru_cache(maxsize=None)
+def _client_config(client_id, client_secret, redirect_uri, auth_uri, token_uri):
+    return {
+        "web": {
+            "client_id": client_id,
+            "client_secret": client_secret,
+            "auth_uri": auth_uri,
+            "token_uri": token_uri,
+            "redirect_uris": [redirect_uri],
+        }
+    }
+
+
+def client_config():
+    """The OAuth client config, built once per process from app config"""
+    if not oauth_enabled():
+        raise OAuthNotConfigured("Google sign-in is not configured")
+    config = current_app.config
+    return _client_config(
+        config["GOOGLE_OAUTH_CLIENT_ID"],
+        config["GOOGLE_OAUTH_CLIENT_SECRET"],
+        config["GOOGLE_OAUTH_REDIRECT_URI"],
+        config.get("GOOGLE_AUTH_URI") or GOOGLE_AUTH_URI,
+        config.get("GOOGLE_TOKEN_URI") or GOOGLE_TOKEN_URI,
+    )
+
+
+def make_flow(state=None):
+    """
+    A fresh OAuth flow. Flows carry per-login state, so one is made per
+    request, but from the shared in-memory client config.
+    """
+    config = client_config()
+
+    # Imported here so workers that never see a Google login don't pay for it
+    from google_auth_oauthlib.flow import Flow
+
+    return Flow.from_client_config(
+        config,
+        scopes=SCOPES,
+        state=state,
+        redirect_uri=config["web"]["redirect_uris"][0],
+    )
+
+
+class CertificateCache:
+    """
+    Google's ID token signing certificates, cached until they expire.
+
+    Expiry comes from the certs response's Cache-Control max-age (less its
+    Age). Fetched certs are kept in memory and written to a JSON file, so
+    a restarted worker can reuse them instead of fetching before its first
+    callback.
+    """
+
+    def __init__(self):
+        self._certs = None
+        self._expires_at = 0
+        self._source = None
+        self._lock = threading.Lock()
+
+    def _path(self):
+        return current_app.config.get("GOOGLE_CERTS_CACHE") or os.path.join(
+            current_app.instance_path, "google-certs.json"
+        )
+
+    def _url(self):
+        return current_app.config.get("GOOGLE_CERTS_URL") or GOOGLE_CERTS_URL
+
+    def _read_file(self, path, url):
+        try:
+            with open(path) as cache_file:
+                cached = json.load(cache_file)
+        except (OSError, ValueError):
+            return False
+        if cached.get("url") != url or cached.get("expires_at", 0) <= time.time():
+            return False
+        self._certs = cached["certs"]
+        self._expires_at = cached["expires_at"]
+        self._source = url
+        return True
+
+    def _fetch(self, path, url):
+        import requests
+
+        response = requests.get(url, timeout=10)
+        response.raise_for_status()
+
+        max_age = 0
+        match = re.search(r"max-age=(\d+)", response.headers.get("Cache-Control", ""))
+        if match:
+            max_age = int(match.group(1)) - int(response.headers.get("Age", 0) or 0)
+
+        self._certs = response.json()
+        self._expires_at = time.time() + max(max_age, 0)
+        self._source = url
+
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, "w") as cache_file:
+                json.dump(
+                    {"url": url, "expires_at": self._expires_at, "certs": self._certs},
+                    cache_file,
+                )
+            os.replace(temp_path, path)
+        except OSError:
+            # The in-memory copy is still good for this process
+            pass
+
+    def get(self, refresh=False):
+        url = self._url()
+        with self._lock:
+            fresh = self._source == url and self._expires_at > time.time()
+            if refresh or not fresh:
+                path = self._path()
+                if refresh or not self._read_file(path, url):
+                    self._fetch(path, url)
+            return self._certs
+
+
+certificate_cache = CertificateCache()
+
+
+def verify_id_token(token):
+    """
+    Verify a Google ID token against the cached certificates and return
+    its claims. Certificates are refetched once if the token was signed
+    by a key we haven't seen, which is how Google's key rotation shows up.
+    """
+    from google.auth import jwt
+
+    config = current_app.config
+    audience = config["GOOGLE_OAUTH_CLIENT_ID"]
+    issuers = config.get("GOOGLE_ISSUERS") or GOOGLE_ISSUERS
+
+    key_id = jwt.decode_header(token).get("kid")
+    certs = certificate_cache.get()
+    if key_id not in certs:
+        certs = certificate_cache.get(refresh=True)
+
+    claims = jwt.decode(token, certs=certs, audience=audience, clock_skew_in_seconds=10)
+    if claims.get("iss") not in issuers:
+        raise ValueError(f"Wrong issuer: {claims.get('iss')}")
+    return claims
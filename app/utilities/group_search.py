@@ -0,0 +1,98 @@
+import re
+from app.models import db, Group
+from sqlalchemy import column, func, literal_column, or_, table
+
+# Words in the search box. Each one is matched as a prefix, so results
+# show up while the last word is still being typed.
+TERM = re.compile(r"[^\W_]+")
+MAX_TERMS = 8
+
+ENGLISH = literal_column("'english'::regconfig")
+
+# SQLite FTS5 mirror of groups(name, about), kept in sync by triggers
+groups_fts = table("groups_fts", column("rowid"))
+
+# Which optional search indexes each database has, checked once per URL
+_features = {}
+FEATURE_CHECKS = {
+    "fts5": "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'groups_fts'",
+    "pg_trgm": "SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'",
+    "search_vector": "SELECT 1 FROM information_schema.columns "
+    "WHERE table_name = 'groups' AND column_name = 'search_vector'",
+}
+
+
+def search_terms(search):
+    return TERM.findall(search.lower())[:MAX_TERMS]
+
+
+def pg_search_document():
+    """
+    The weighted tsvector of a group (name A, about B). The migration
+    stores it in the generated, GIN indexed groups.search_vector column;
+    without that column it is computed per row.
+    """
+    if _has_feature("search_vector"):
+        return literal_column(f"{Group.__table__.fullname}.search_vector")
+
+    name = func.setweight(func.to_tsvector(ENGLISH, Group.name), literal_column("'A'"))
+    about = func.setweight(func.to_tsvector(ENGLISH, Group.about), literal_column("'B'"))
+    return name.op("||")(about)
+
+
+def _has_feature(feature):
+    key = (str(db.engine.url), feature)
+    if key not in _features:
+        row = db.session.execute(FEATURE_CHECKS[feature]).first()
+        _features[key] = row is not None
+    return _features[key]
+
+
+def _search_postgres(query, search, terms):
+    tsquery = func.to_tsquery(ENGLISH, " & ".join(f"{term}:*" for term in terms))
+    document = pg_search_document()
+    matches = document.op("@@")(tsquery)
+    rank = func.ts_rank_cd(document, tsquery)
+
+    # Name substrings too, when the trigram index can serve them
+    if _has_feature("pg_trgm"):
+        matches = or_(matches, Group.name.ilike(f"%{search}%"))
+        rank = rank + func.similarity(Group.name, search)
+
+    return query.filter(matches).order_by(rank.desc(), Group.created_at.desc())
+
+
+def _search_sqlite(query, terms):
+    match = " ".join(f'"{term}"*' for term in terms)
+    fts = literal_column("groups_fts")
+    return (
+        query.join(groups_fts, groups_fts.c.rowid == Group.id)
+        .filter(fts.op("MATCH")(match))
+        # bm25 is lower for better matches; name hits weigh 10x about hits
+        .order_by(func.bm25(fts, 10.0, 1.0), Group.created_at.desc())
+    )
+
+
+def search_groups(query, search):
+    """
+    Narrow a Group query to groups matching search, best match first.
+
+    Postgres matches the stored search_vector (GIN index) or, with pg_trgm,
+    a name substring (trigram index), ranked by ts_rank_cd plus name
+    similarity. SQLite uses the groups_fts FTS5 table and bm25. Without
+    either index (a database made by create_all) it falls back to ILIKE,
+    newest first.
+    """
+    terms = search_terms(search)
+    if not terms:
+        return query.order_by(Group.created_at.desc())
+
+    dialect = db.engine.dialect.name
+    if dialect == "postgresql":
+        return _search_postgres(query, search, terms)
+    if dialect == "sqlite" and _has_feature("fts5"):
+        return _search_sqlite(query, terms)
+
+    return query.filter(
+        or_(Group.name.ilike(f"%{search}%"), Group.about.ilike(f"%{search}%"))
+    ).order_by(Group.created_at.desc())
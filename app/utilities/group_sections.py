@@ -0,0 +1,194 @@
+from datetime import datetime
+from app.models import db, Group, Membership, Event, Venue, GroupImage, User
+from sqlalchemy import case, func, select
+from sqlalchemy.orm import contains_eager
+
+# Sections of a group, each served by /api/groups/<id>/<section>, and the
+# key the full detail response has always used for it
+SECTION_KEYS = {
+    "members": "members",
+    "events": "events",
+    "venues": "venues",
+    "images": "groupImage",
+}
+
+# How many items of each section the group detail embeds by default
+PREVIEW_SIZE = 10
+MAX_PAGE_SIZE = 50
+
+
+def parse_include(include):
+    """
+    The sections named by ?include=a,b (all of them when absent, none when
+    empty). Raises ValueError for an unknown section.
+    """
+    if include is None:
+        return list(SECTION_KEYS)
+    sections = [name.strip() for name in include.split(",") if name.strip()]
+    unknown = [name for name in sections if name not in SECTION_KEYS]
+    if unknown:
+        raise ValueError(f"Unknown section(s): {', '.join(unknown)}")
+    return list(dict.fromkeys(sections))
+
+
+def group_header(group_id):
+    """
+    The group with its organizer and the size of every section, or None.
+    Members come from the member_count column, the rest from one query.
+    """
+    now = datetime.now()
+
+    def count(column, *conditions):
+        return select(func.count(column)).where(*conditions).scalar_subquery()
+
+    row = (
+        db.session.query(
+            Group,
+            count(Event.id, Event.group_id == Group.id),
+            count(Event.id, Event.group_id == Group.id, Event.end_date >= now),
+            count(Venue.id, Venue.group_id == Group.id),
+            count(GroupImage.id, GroupImage.group_id == Group.id),
+        )
+        .filter(Group.id == group_id)
+        .first()
+    )
+    if row is None:
+        return None, None
+
+    group, events, upcoming, venues, images = row
+    counts = {
+        "members": group.member_count,
+        "events": events,
+        "upcomingEvents": upcoming,
+        "venues": venues,
+        "images": images,
+    }
+    return group, counts
+
+
+def member_query(group):
+    """Memberships with their users, organizer first then by first name"""
+    return (
+        db.session.query(Membership)
+        .join(User, Membership.user)
+        .options(
+            contains_eager(Membership.user).load_only(
+                "id", "username", "first_name", "last_name", "profile_image_url"
+            )
+        )
+        .filter(Membership.group_id == group.id)
+        .order_by(
+            case((Membership.user_id == group.organizer_id, 0), else_=1),
+            User.first_name,
+            Membership.id,
+        )
+    )
+
+
+def serialize_members(group, memberships):
+    # Only membership rows are listed, so pages and totals agree; an
+    # organizer without one is still in the header's "organizer"
+    return [
+        {
+            "id": membership.id,
+            "groupId": membership.group_id,
+            "userId": membership.user_id,
+            "user": {
+                "id": membership.user.id,
+                "username": membership.user.username,
+                "firstName": membership.user.first_name,
+                "lastName": membership.user.last_name,
+                "profileImage": membership.user.profile_image_url,
+            },
+            "isOrganizer": membership.user_id == group.organizer_id,
+        }
+        for membership in memberships
+    ]
+
+
+def event_query(group, upcoming=None):
+    """
+    A group's events. upcoming=True keeps the ones that haven't ended,
+    soonest first; upcoming=False the past ones, latest first.
+    """
+    query = db.session.query(Event).filter(Event.group_id == group.id)
+    now = datetime.now()
+    if upcoming is True:
+        return query.filter(Event.end_date >= now).order_by(Event.start_date, Event.id)
+    if upcoming is False:
+        return query.filter(Event.end_date < now).order_by(
+            Event.start_date.desc(), Event.id.desc()
+        )
+    return query.order_by(Event.start_date, Event.id)
+
+
+def serialize_events(group, events):
+    return [
+        {
+            "id": event.id,
+            "name": event.name,
+            "description": (
+                event.description[:100] + "..."
+                if len(event.description) > 100
+                else event.description
+            ),
+            "type": event.type,
+            "capacity": event.capacity,
+            "image": event.image,
+            "startDate": event.start_date.isoformat(),
+            "endDate": event.end_date.isoformat(),
+            "numAttendees": event.attendee_count,
+        }
+        for event in events
+    ]
+
+
+def venue_query(group):
+    return db.session.query(Venue).filter(Venue.group_id == group.id).order_by(Venue.id)
+
+
+def serialize_venues(group, venues):
+    return [venue.to_dict() for venue in venues]
+
+
+def image_query(group):
+    return (
+        db.session.query(GroupImage)
+        .filter(GroupImage.group_id == group.id)
+        .order_by(GroupImage.id)
+    )
+
+
+def serialize_images(group, images):
+    return [image.to_dict() for image in images]
+
+
+SECTIONS = {
+    "members": (member_query, serialize_members),
+    "events": (event_query, serialize_events),
+    "venues": (venue_query, serialize_venues),
+    "images": (image_query, serialize_images),
+}
+
+
+def section_preview(group, section, limit):
+    """The first limit items of a section, for embedding in the detail"""
+    query, serialize = SECTIONS[section]
+    return serialize(group, query(group).limit(limit).all())
+
+
+def section_page(group, section, page, per_page, **filters):
+    """One page of a section as (items, pagination)"""
+    query, serialize = SECTIONS[section]
+    items = query(group, **filters).paginate(
+        page=page, per_page=per_page, error_out=False
+    )
+    pagination = {
+        "page": page,
+        "pages": items.pages,
+        "per_page": per_page,
+        "total": items.total,
+        "has_next": items.has_next,
+        "has_prev": items.has_prev,
+    }
+    return serialize(group, items.items), pagination
@@ -0,0 +1,76 @@
+import importlib
+import click
+
+# Imports deferred until first use when LAZY_IMPORTS is on. With it off,
+# warm_imports() loads them all in create_app, so the first upload, Google
+# login or seed run doesn't pay for them.
+DEFERRED_MODULES = (
+    "boto3",
+    "requests",
+    "google_auth_oauthlib.flow",
+    "google.auth.jwt",
+    "flask_migrate",
+    "app.seeds",
+    "app.benchmarks",
+)
+
+
+class LazyGroup(click.Group):
+    """
+    A CLI group that stands in for one defined elsewhere, importing it only
+    when one of its commands is listed or run. target is "module:attribute".
+    on_load, if given, is called once just before the import, inside the
+    app context the flask CLI pushes.
+    """
+
+    def __init__(self, name, target, help=None, on_load=None, **kwargs):
+        super().__init__(name, help=help, **kwargs)
+        self.target = target
+        self.on_load = on_load
+        self._group = None
+
+    def load(self):
+        if self._group is None:
+            if self.on_load is not None:
+                self.on_load()
+            module_name, attribute = self.target.split(":", 1)
+            self._group = getattr(importlib.import_module(module_name), attribute)
+        return self._group
+
+    def list_commands(self, ctx):
+        return self.load().list_commands(ctx)
+
+    def get_command(self, ctx, name):
+        return self.load().get_command(ctx, name)
+
+
+class LazyCommand(click.Command):
+    """
+    A CLI command that stands in for one defined elsewhere, importing it
+    only when it runs. Listing it just shows help, so that needs passing
+    in. target is "module:attribute".
+    """
+
+    def __init__(self, name, target, help=None, **kwargs):
+        super().__init__(name, help=help, **kwargs)
+        self.target = target
+        self._command = None
+
+    def load(self):
+        if self._command is None:
+            module_name, attribute = self.target.split(":", 1)
+            self._command = getattr(importlib.import_module(module_name), attribute)
+        return self._command
+
+    def make_context(self, info_name, args, parent=None, **extra):
+        # The context belongs to the real command, so it parses and runs it
+        return self.load().make_context(info_name, args, parent=parent, **extra)
+
+
+def warm_imports():
+    """Import everything in DEFERRED_MODULES and build the S3 client"""
+    from app.aws import get_s3_client
+
+    for module_name in DEFERRED_MODULES:
+        importlib.import_module(module_name)
+    get_s3_client()
@@ -0,0 +1,89 @@
+import base64
+import binascii
+from datetime import datetime
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(created_at, row_id):
+    """Opaque cursor for the row a keyset page ended on"""
+    raw = f"{created_at.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor made by encode_cursor into (created_at, id).
+    Raises ValueError for anything that is not a valid cursor.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        created_at, row_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+class CursorPage:
+    """One page of a keyset-paginated query"""
+
+    def __init__(self, items, per_page, next_cursor, total=None):
+        self.items = items
+        self.per_page = per_page
+        self.next_cursor = next_cursor
+        self.has_next = next_cursor is not None
+        self.total = total
+
+    def pagination(self):
+        data = {
+            "per_page": self.per_page,
+            "next_cursor": self.next_cursor,
+            "has_next": self.has_next,
+        }
+        if self.total is not None:
+            data["total"] = self.total
+        return data
+
+
+def cursor_paginate(query, model, cursor, per_page, with_total=False, descending=True):
+    """
+    Keyset pagination on (created_at, id), newest first unless descending
+    is False.
+
+    Each page seeks past the last row of the previous one, so deep pages
+    cost the same as the first one. The total is only counted on request.
+    """
+    total = query.order_by(None).count() if with_total else None
+
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        if descending:
+            query = query.filter(
+                or_(
+                    model.created_at < created_at,
+                    and_(model.created_at == created_at, model.id < row_id),
+                )
+            )
+        else:
+            query = query.filter(
+                or_(
+                    model.created_at > created_at,
+                    and_(model.created_at == created_at, model.id > row_id),
+                )
+            )
+
+    if descending:
+        ordering = (model.created_at.desc(), model.id.desc())
+    else:
+        ordering = (model.created_at.asc(), model.id.asc())
+
+    # Fetch one extra row to know whether another page exists
+    rows = query.order_by(*ordering).limit(per_page + 1).all()
+    items = rows[:per_page]
+
+    next_cursor = None
+    if len(rows) > per_page:
+        last = items[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+
+    return CursorPage(items, per_page, next_cursor, total)
@@ -0,0 +1,108 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from werkzeug.security import (
+    DEFAULT_PBKDF2_ITERATIONS,
+    check_password_hash,
+    generate_password_hash,
+)
+
+# The hash parameters new and upgraded passwords get
+CURRENT_METHOD = f"pbkdf2:sha256:{DEFAULT_PBKDF2_ITERATIONS}"
+
+
+class HashingBusy(Exception):
+    """Raised when the hashing queue is full or a hash took too long"""
+
+
+class PasswordHasher:
+    """
+    Runs password hashing and verification in a fixed-size process pool.
+
+    Request threads wait on the result instead of burning the worker's CPU,
+    and at most max_pending hashes may be queued or running at once. Past
+    that, HashingBusy is raised straight away so the caller can answer 503
+    instead of piling up behind the pool. With workers=0 everything runs
+    inline, which is what seeds and one-off scripts want.
+
+    The pool is created on first use in each process, so it survives
+    gunicorn forking workers after import.
+    """
+
+    def __init__(self, workers=2, max_pending=8, timeout=10, method=CURRENT_METHOD):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.method = method
+        self.rejected = 0
+        self._pool = None
+        self._pid = None
+        self._slots = None
+        self._lock = threading.Lock()
+
+    def configure(self, workers, max_pending, timeout, method):
+        with self._lock:
+            self.workers = workers
+            self.max_pending = max_pending
+            self.timeout = timeout
+            self.method = method
+            self._shutdown()
+
+    def _shutdown(self):
+        if self._pool is not None and self._pid == os.getpid():
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = None
+        self._pid = None
+        self._slots = None
+
+    def _executor(self):
+        with self._lock:
+            if self._pool is None or self._pid != os.getpid():
+                # forkserver children only import werkzeug, never the app
+                context = multiprocessing.get_context("forkserver")
+                context.set_forkserver_preload(["werkzeug.security"])
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=context
+                )
+                self._pid = os.getpid()
+                self._slots = threading.BoundedSemaphore(self.max_pending)
+            return self._pool, self._slots
+
+    def _run(self, func, *args):
+        if not self.workers:
+            return func(*args)
+
+        pool, slots = self._executor()
+        if not slots.acquire(blocking=False):
+            self.rejected += 1
+            raise HashingBusy("Password hashing queue is full")
+
+        try:
+            future = pool.submit(func, *args)
+        except Exception:
+            slots.release()
+            raise
+        future.add_done_callback(lambda _: slots.release())
+
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            future.cancel()
+            self.rejected += 1
+            raise HashingBusy("Password hashing timed out")
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, pwhash, password):
+        return self._run(check_password_hash, pwhash, password)
+
+    def needs_rehash(self, pwhash):
+        """Whether a stored hash was made with other parameters than method"""
+        if not pwhash or pwhash == "OAUTH":
+            return False
+        return pwhash.split("$", 1)[0] != self.method
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,309 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import current_app, request
+from urllib.parse import urlencode
+
+
+class MemoryBackend:
+    """
+    Per-process LRU of cache entries with expiry and a tag -> keys index.
+
+    Invalidation only reaches this process, so under several gunicorn
+    workers the others serve their copy until it expires. Use the SQLite
+    backend there.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._tags = {}
+        self._lock = threading.Lock()
+
+    def _drop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            for tag in entry[2]:
+                keys = self._tags.get(tag)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self._tags[tag]
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.time():
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key, value, tags, ttl):
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = (value, time.time() + ttl, frozenset(tags))
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate(self, tags):
+        with self._lock:
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._drop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def size(self):
+        return len(self._entries)
+
+
+class SQLiteBackend:
+    """
+    Cache entries in a SQLite file shared by every worker on the host, a
+    local stand-in for Redis. Tag invalidation deletes the tagged entries
+    for all workers at once. Expired rows are purged on a fraction of
+    writes.
+    """
+
+    name = "sqlite"
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS entries ("
+        "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS entry_tags ("
+        "tag TEXT NOT NULL, key TEXT NOT NULL, PRIMARY KEY (tag, key))",
+        "CREATE INDEX IF NOT EXISTS ix_entry_tags_key ON entry_tags (key)",
+    )
+
+    def __init__(self, path, purge_every=100):
+        self.path = path
+        self.purge_every = purge_every
+        self._local = threading.local()
+        self._writes = 0
+
+    def _connection(self):
+        # One connection per thread, reopened after a fork
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            for statement in self.SCHEMA:
+                connection.execute(statement)
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def get(self, key):
+        row = (
+            self._connection()
+            .execute(
+                "SELECT value FROM entries WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            )
+            .fetchone()
+        )
+        return row[0] if row else None
+
+    def set(self, key, value, tags, ttl):
+        connection = self._connection()
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            connection.execute("DELETE FROM entry_tags WHERE key = ?", (key,))
+            connection.execute(
+                "INSERT OR REPLACE INTO entries (key, value, expires_at) "
+                "VALUES (?, ?, ?)",
+                (key, value, time.time() + ttl),
+            )
+            connection.executemany(
+                "INSERT OR IGNORE INTO entry_tags (tag, key) VALUES (?, ?)",
+                [(tag, key) for tag in tags],
+            )
+
+        self._writes += 1
+        if self._writes % self.purge_every == 0:
+            self.purge()
+
+    def invalidate(self, tags):
+        tags = list(tags)
+        if not tags:
+            return
+        marks = ", ".join("?" for _ in tags)
+        connection = self._connection()
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            connection.execute(
+                "DELETE FROM entries WHERE key IN "
+                f"(SELECT key FROM entry_tags WHERE tag IN ({marks}))",
+                tags,
+            )
+            connection.execute(
+                "DELETE FROM entry_tags WHERE key NOT IN (SELECT key FROM entries)"
+            )
+
+    def purge(self):
+        connection = self._connection()
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            connection.execute(
+                "DELETE FROM entries WHERE expires_at <= ?", (time.time(),)
+            )
+            connection.execute(
+                "DELETE FROM entry_tags WHERE key NOT IN (SELECT key FROM entries)"
+            )
+
+    def clear(self):
+        connection = self._connection()
+        with connection:
+            connection.execute("BEGIN IMMEDIATE")
+            connection.execute("DELETE FROM entries")
+            connection.execute("DELETE FROM entry_tags")
+
+    def size(self):
+        return self._connection().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+
+class ResponseCache:
+    """
+    Server-side cache of serialized responses for public GET endpoints.
+
+    Entries carry dependency tags such as "groups:list" or "group:12", and
+    write routes call invalidate() with the tags they touched after they
+    commit. A response built while a write commits can still be stored
+    stale, which the entry's ttl bounds. Hit and miss counts are kept per
+    endpoint (per process).
+    """
+
+    def __init__(self, backend=None, default_ttl=60):
+        self.backend = backend
+        self.default_ttl = default_ttl
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def configure(self, backend, default_ttl):
+        self.backend = backend
+        self.default_ttl = default_ttl
+
+    def _count(self, endpoint, hit):
+        with self._lock:
+            counts = self._counts.setdefault(endpoint, [0, 0])
+            counts[0 if hit else 1] += 1
+
+    def get(self, endpoint, key):
+        if self.backend is None:
+            return None
+        value = self.backend.get(key)
+        self._count(endpoint, value is not None)
+        return value
+
+    def set(self, key, value, tags, ttl=None):
+        if self.backend is not None:
+            self.backend.set(key, value, tags, ttl or self.default_ttl)
+
+    def invalidate(self, *tags):
+        if self.backend is not None and tags:
+            self.backend.invalidate(tags)
+
+    def clear(self):
+        if self.backend is not None:
+            self.backend.clear()
+
+    def stats(self):
+        with self._lock:
+            endpoints = {
+                endpoint: {
+                    "hits": hits,
+                    "misses": misses,
+                    "hitRatio": round(hits / (hits + misses), 3),
+                }
+                for endpoint, (hits, misses) in self._counts.items()
+            }
+        return {
+            "backend": self.backend.name if self.backend else None,
+            "size": self.backend.size() if self.backend else 0,
+            "endpoints": endpoints,
+        }
+
+
+response_cache = ResponseCache()
+
+
+def make_backend(config, instance_path):
+    """The backend named by CACHE_BACKEND: "memory", "sqlite" or "none"."""
+    backend = (config.get("CACHE_BACKEND") or "memory").lower()
+    if backend == "none":
+        return None
+    if backend == "sqlite":
+        return SQLiteBackend(
+            config.get("CACHE_SQLITE_PATH")
+            or os.path.join(instance_path, "response-cache.sqlite")
+        )
+    if backend == "memory":
+        return MemoryBackend(config.get("CACHE_MAX_ENTRIES", 1024))
+    raise ValueError(f"Unknown CACHE_BACKEND: {backend}")
+
+
+def view_key(view_args, params):
+    """
+    The current request as a key: endpoint, view args and the sorted query
+    arguments named in params. Only arguments the view reads count, so
+    cache-busters like the frontend's ?_t= share the view's key.
+    """
+    query = urlencode(
+        sorted(
+            (name, value)
+            for name, value in request.args.items(multi=True)
+            if name in params
+        )
+    )
+    path_args = urlencode(sorted(view_args.items()))
+    return f"{request.endpoint}:{path_args}?{query}"
+
+
+def cached(tags, params, ttl=None):
+    """
+    Cache a public GET view's 200 JSON responses, keyed by endpoint, view
+    arguments and the query arguments named in params - every argument
+    the view reads. tags(body) returns the dependency tags for a freshly
+    built response body.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            endpoint = request.endpoint
+            key = view_key(kwargs, params)
+            body = response_cache.get(endpoint, key)
+            if body is not None:
+                response = current_app.response_class(
+                    body, mimetype="application/json"
+                )
+                response.headers["X-Cache"] = "HIT"
+                return response
+
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code == 200 and response.is_json:
+                response_cache.set(
+                    key, response.get_data(), set(tags(response.get_json())), ttl
+                )
+            response.headers["X-Cache"] = "MISS"
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,138 @@
+import json
+import time
+from flask import current_app, request, session
+from itsdangerous.encoding import base64_decode, bytes_to_int
+
+SECURITY_HEADERS = {
+    "X-Content-Type-Options": "nosniff",
+    "X-Frame-Options": "DENY",
+    "X-XSS-Protection": "1; mode=block",
+    "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
+}
+
+
+class ResponsePolicy:
+    """
+    What after_request does to a response.
+
+    cache_control: Cache-Control value to set, or None to leave the header
+        to the view.
+    csrf: refresh the csrf_token cookie when it's missing or near expiry.
+    compress: whether Flask-Compress may compress the body.
+    security_headers: add SECURITY_HEADERS (production only).
+    """
+
+    FIELDS = ("cache_control", "csrf", "compress", "security_headers")
+
+    def __init__(
+        self, cache_control=None, csrf=True, compress=True, security_headers=True
+    ):
+        self.cache_control = cache_control
+        self.csrf = csrf
+        self.compress = compress
+        self.security_headers = security_headers
+
+    def replace(self, **changes):
+        """Copy of this policy with some fields overridden"""
+        unknown = set(changes) - set(self.FIELDS)
+        if unknown:
+            raise TypeError(f"Unknown response policy fields: {sorted(unknown)}")
+        values = {field: getattr(self, field) for field in self.FIELDS}
+        values.update(changes)
+        return ResponsePolicy(**values)
+
+    def __repr__(self):
+        fields = ", ".join(f"{f}={getattr(self, f)!r}" for f in self.FIELDS)
+        return f"<ResponsePolicy {fields}>"
+
+
+class ResponsePolicyRegistry:
+    """
+    Response policies by endpoint, falling back to the endpoint's blueprint
+    and then to the default. Lookups are memoized per endpoint name.
+    """
+
+    def __init__(self, default=None):
+        self.default = default or ResponsePolicy()
+        self._blueprints = {}
+        self._endpoints = {}
+        self._resolved = {}
+
+    def blueprint(self, name, **fields):
+        self._blueprints[name] = fields
+        self._resolved.clear()
+
+    def endpoint(self, name, **fields):
+        self._endpoints[name] = fields
+        self._resolved.clear()
+
+    def for_endpoint(self, endpoint):
+        policy = self._resolved.get(endpoint)
+        if policy is None:
+            policy = self.default
+            if endpoint and "." in endpoint:
+                blueprint = endpoint.rsplit(".", 1)[0]
+                policy = policy.replace(**self._blueprints.get(blueprint, {}))
+            policy = policy.replace(**self._endpoints.get(endpoint, {}))
+            self._resolved[endpoint] = policy
+        return policy
+
+
+response_policies = ResponsePolicyRegistry()
+
+# Built assets are fingerprinted, so they can be cached for a year
+response_policies.endpoint(
+    "static", cache_control="public, max-age=31536000", csrf=False
+)
+response_policies.endpoint("health_check", csrf=False, compress=False)
+response_policies.endpoint("api_help", cache_control="private, max-age=60")
+
+# Session state must never be served from a cache
+response_policies.blueprint("auth", cache_control="private, no-cache")
+
+# Served with an ETag, so clients revalidate and mostly get a 304
+response_policies.endpoint("tags.tags", cache_control="no-cache")
+
+
+def csrf_cookie_needs_refresh(cookie, time_limit, margin):
+    """
+    Whether the csrf_token cookie should be reissued.
+
+    The cookie holds flask_wtf's signed token: payload.timestamp.signature.
+    Only the payload and timestamp are read here. The signature is checked
+    by the form on submit, so a forged cookie can skip a refresh but can
+    never pass validation.
+    """
+    raw_token = session.get("csrf_token")
+    if not cookie or not raw_token:
+        return True
+
+    try:
+        payload, timestamp, _ = cookie.rsplit(".", 2)
+        issued_at = bytes_to_int(base64_decode(timestamp))
+        if json.loads(base64_decode(payload)) != raw_token:
+            return True
+    except Exception:
+        return True
+
+    if time_limit is None:
+        return False
+    return time.time() - issued_at > time_limit - margin
+
+
+def etag_response(body, etag, mimetype="application/json"):
+    """
+    A response for a prebuilt body with a strong ETag, or a 304 when the
+    request's If-None-Match already has it. Flask-Compress appends the
+    encoding to the ETag (etag:gzip), so those values match too and the
+    body isn't compressed again just to be thrown away.
+    """
+    for value in request.if_none_match.as_set():
+        if value == etag or value.startswith(f"{etag}:"):
+            response = current_app.response_class(status=304)
+            response.set_etag(value)
+            return response
+
+    response = current_app.response_class(body, mimetype=mimetype)
+    response.set_etag(etag)
+    return response
@@ -0,0 +1,256 @@
+import threading
+from collections import OrderedDict
+from app.models import db, User, Group, Membership, Event, Attendance, Venue
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import aliased, selectinload
+
+# Bootstrap sections and the user column holding each one's version
+SECTIONS = {
+    "profile": User.profile_version,
+    "groups": User.groups_version,
+    "events": User.events_version,
+}
+
+
+def _bump(column, user_ids):
+    """
+    Bump one section version for every user in user_ids (list or select).
+    updated_at is pinned so a version bump doesn't look like a profile edit.
+    """
+    db.session.query(User).filter(User.id.in_(user_ids)).update(
+        {column: column + 1, User.updated_at: User.updated_at},
+        synchronize_session=False,
+    )
+
+
+def bump_profile_version(user_id):
+    _bump(User.profile_version, [user_id])
+
+
+def bump_group_versions(group_ids, events=False):
+    """
+    Bump the groups section of every member and organizer of the groups.
+    Run it before deleting memberships so the leaving users are included.
+    With events=True, attendees of the groups' events are bumped too, for
+    writes that change what the events section shows about the group.
+    """
+    members = select(Membership.user_id).where(Membership.group_id.in_(group_ids))
+    organizers = select(Group.organizer_id).where(Group.id.in_(group_ids))
+    _bump(User.groups_version, members.union(organizers))
+
+    if events:
+        bump_event_versions(select(Event.id).where(Event.group_id.in_(group_ids)))
+
+
+def bump_event_versions(event_ids):
+    """
+    Bump the events section of every attendee of the events.
+    Run it before deleting attendances so the leaving users are included.
+    """
+    _bump(
+        User.events_version,
+        select(Attendance.user_id).where(Attendance.event_id.in_(event_ids)),
+    )
+
+
+def bump_attendee_versions(user_ids):
+    """Bump the events section of users who just became attendees"""
+    if user_ids:
+        _bump(User.events_version, user_ids)
+
+
+def bump_venue_versions(venue_ids):
+    bump_event_versions(select(Event.id).where(Event.venue_id.in_(venue_ids)))
+
+
+def current_versions(user_id):
+    """The user's section versions, or None if the user doesn't exist"""
+    row = db.session.query(*SECTIONS.values()).filter(User.id == user_id).first()
+    if row is None:
+        return None
+    return dict(zip(SECTIONS, row))
+
+
+def version_token(versions):
+    return ".".join(str(versions[section]) for section in SECTIONS)
+
+
+def parse_version_token(token):
+    """Section versions from a ?since= token, or None if it's malformed"""
+    if not token:
+        return None
+    parts = token.split(".")
+    if len(parts) != len(SECTIONS) or not all(part.isdigit() for part in parts):
+        return None
+    return dict(zip(SECTIONS, (int(part) for part in parts)))
+
+
+def _truncate(text):
+    return text[:100] + "..." if len(text) > 100 else text
+
+
+def _profile_section(user_id):
+    user = (
+        User.query.options(selectinload(User.users_tags).load_only("id", "name"))
+        .filter(User.id == user_id)
+        .first()
+    )
+    return user.to_dict_feed() if user else {}
+
+
+def _groups_section(user_id):
+    """Groups the user belongs to or organizes, member groups first"""
+    own = aliased(Membership)
+    groups = (
+        db.session.query(Group)
+        .outerjoin(own, and_(own.group_id == Group.id, own.user_id == user_id))
+        .filter(or_(own.id.isnot(None), Group.organizer_id == user_id))
+        .order_by(own.id.is_(None), own.id, Group.id)
+        .all()
+    )
+
+    return {
+        "group": [
+            {
+                "id": group.id,
+                "name": group.name,
+                "about": _truncate(group.about),
+                "image": group.image,
+                "city": group.city,
+                "state": group.state,
+                "type": group.type,
+                "organizerId": group.organizer_id,
+                "numMembers": group.member_count,
+            }
+            for group in groups
+        ]
+    }
+
+
+def _events_section(user_id):
+    """Events the user is attending, with their group name and venue"""
+    rows = (
+        db.session.query(
+            Event,
+            Group.name,
+            Venue.address,
+            Venue.city,
+            Venue.state,
+            Venue.id,
+        )
+        .join(Attendance, Attendance.event_id == Event.id)
+        .outerjoin(Group, Group.id == Event.group_id)
+        .outerjoin(Venue, Venue.id == Event.venue_id)
+        .filter(Attendance.user_id == user_id)
+        .order_by(Attendance.id)
+        .all()
+    )
+
+    return {
+        "events": [
+            {
+                "id": event.id,
+                "name": event.name,
+                "description": _truncate(event.description),
+                "type": event.type,
+                "capacity": event.capacity,
+                "image": event.image,
+                "startDate": event.start_date.isoformat() if event.start_date else None,
+                "endDate": event.end_date.isoformat() if event.end_date else None,
+                "numAttendees": event.attendee_count,
+                "groupInfo": {"name": group_name or "Unknown Group"},
+                "venueInfo": (
+                    {"address": address, "city": city, "state": state}
+                    if venue_id
+                    else None
+                ),
+            }
+            for event, group_name, address, city, state, venue_id in rows
+        ]
+    }
+
+
+_BUILDERS = {
+    "profile": _profile_section,
+    "groups": _groups_section,
+    "events": _events_section,
+}
+
+
+class BootstrapCache:
+    """
+    Per-process LRU of bootstrap sections keyed by (user id, section).
+
+    An entry is only served while its version matches the user's current
+    section version, so writes never have to reach into other workers'
+    caches: bumping the version in the database is enough.
+    """
+
+    def __init__(self, max_size=4096):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def section(self, user_id, section, version):
+        key = (user_id, section)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        payload = _BUILDERS[section](user_id)
+        with self._lock:
+            self._entries[key] = (version, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+        return payload
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+bootstrap_cache = BootstrapCache()
+
+
+def build_bootstrap(user_id, since=None):
+    """
+    The /api/auth/ payload for a user.
+
+    Returns (status, body). With a ?since= token that matches the current
+    versions the status is 304. With an older token only the sections whose
+    version moved are included, listed under "changed".
+    """
+    versions = current_versions(user_id)
+    if versions is None:
+        return 200, {"user": None, "authenticated": False}
+
+    token = version_token(versions)
+    previous = parse_version_token(since)
+
+    if previous is None:
+        changed = list(SECTIONS)
+    else:
+        changed = [s for s in SECTIONS if previous[s] != versions[s]]
+        if not changed:
+            return 304, None
+
+    user = {"id": user_id}
+    for section in changed:
+        user.update(bootstrap_cache.section(user_id, section, versions[section]))
+
+    body = {"user": user, "authenticated": True, "version": token}
+    if previous is not None:
+        body["changed"] = changed
+    return 200, body
@@ -0,0 +1,116 @@
+import threading
+import time
+from functools import wraps
+from flask import current_app
+from app.utilities.response_cache import view_key
+
+
+class _Flight:
+    __slots__ = ("done", "result", "failed", "expires_at")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.failed = False
+        self.expires_at = None
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent work inside one process.
+
+    The first caller for a key (the leader) runs the function. Callers
+    arriving while it runs wait for it and share its result instead of
+    running it again. With grace > 0 the result is also handed to callers
+    arriving up to grace seconds after it finished.
+
+    If the leader fails, or takes longer than wait_timeout, waiting callers
+    run the function themselves, so an error is never shared.
+    """
+
+    def __init__(self, grace=0, wait_timeout=30, max_keys=1024):
+        self.grace = grace
+        self.wait_timeout = wait_timeout
+        self.max_keys = max_keys
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.shared = 0
+
+    def _sweep(self, now):
+        for key, flight in list(self._flights.items()):
+            if flight.expires_at is not None and flight.expires_at <= now:
+                del self._flights[key]
+
+    def do(self, key, func):
+        now = time.monotonic()
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None and flight.expires_at is not None:
+                if flight.failed or flight.expires_at <= now:
+                    flight = None
+            leader = flight is None
+            if leader:
+                if len(self._flights) >= self.max_keys:
+                    self._sweep(now)
+                flight = _Flight()
+                self._flights[key] = flight
+                self.leaders += 1
+
+        if not leader:
+            if flight.done.wait(self.wait_timeout) and not flight.failed:
+                with self._lock:
+                    self.shared += 1
+                return flight.result
+            return func()
+
+        try:
+            flight.result = func()
+        except BaseException:
+            flight.failed = True
+            raise
+        finally:
+            flight.expires_at = time.monotonic() + (0 if flight.failed else self.grace)
+            flight.done.set()
+            if flight.failed or self.grace <= 0:
+                with self._lock:
+                    if self._flights.get(key) is flight:
+                        del self._flights[key]
+        return flight.result
+
+    def stats(self):
+        with self._lock:
+            return {
+                "inFlight": len(self._flights),
+                "leaders": self.leaders,
+                "shared": self.shared,
+            }
+
+
+single_flight = SingleFlight()
+
+
+def coalesced(params=()):
+    """
+    Serve concurrent identical requests to a public GET view from one run
+    of it. Followers get a copy of the leader's serialized response and
+    never touch the database. Requests are identical when they share the
+    view args and the query arguments named in params - every argument
+    the view reads.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            def render():
+                response = current_app.make_response(view(*args, **kwargs))
+                return response.get_data(), response.status_code, response.mimetype
+
+            body, status, mimetype = single_flight.do(
+                view_key(kwargs, params), render
+            )
+            return current_app.response_class(body, status=status, mimetype=mimetype)
+
+        return wrapper
+
+    return decorator
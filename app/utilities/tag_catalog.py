@@ -0,0 +1,209 @@
+import bisect
+import hashlib
+import json
+import threading
+import time
+from app.models import db, Tag, CacheVersions
+from sqlalchemy import select
+
+CATALOG = "tags"
+
+# Substring lookups go through an index of every 1, 2 and 3 character
+# slice of each name. Longer queries intersect their trigrams.
+NGRAM = 3
+
+
+def cache_version(name):
+    """The stored version of a cached catalog (0 if it was never bumped)"""
+    version = db.session.execute(
+        select(CacheVersions.c.version).where(CacheVersions.c.name == name)
+    ).scalar()
+    return version or 0
+
+
+def bump_cache_version(name):
+    """Bump a catalog version so every worker reloads it. The caller commits."""
+    result = db.session.execute(
+        CacheVersions.update()
+        .where(CacheVersions.c.name == name)
+        .values(version=CacheVersions.c.version + 1)
+    )
+    if not result.rowcount:
+        db.session.execute(CacheVersions.insert().values(name=name, version=1))
+
+
+def _grams(text, size):
+    return {text[i : i + size] for i in range(len(text) - size + 1)}
+
+
+class TagIndex:
+    """
+    An immutable snapshot of every tag, ordered by name, with:
+
+    - a sorted list of lowercased names for prefix lookups (bisect)
+    - an n-gram -> positions index for substring lookups
+    - the /api/tags body and its ETag, so that endpoint is a byte copy
+    """
+
+    def __init__(self, tags, version):
+        self.version = version
+        self.tags = sorted(tags, key=lambda tag: (tag["name"], tag["id"]))
+        self.by_id = {tag["id"]: tag for tag in self.tags}
+
+        self._keys = sorted(
+            (tag["name"].lower(), position) for position, tag in enumerate(self.tags)
+        )
+        self._grams = {}
+        for position, tag in enumerate(self.tags):
+            name = tag["name"].lower()
+            for size in range(1, NGRAM + 1):
+                for gram in _grams(name, size):
+                    self._grams.setdefault(gram, set()).add(position)
+
+        self.body = json.dumps({"tags": self.tags}, separators=(",", ":"))
+        self.etag = hashlib.sha1(self.body.encode()).hexdigest()
+
+    def prefix(self, query):
+        """Positions of tags whose name starts with query, in name order"""
+        start = bisect.bisect_left(self._keys, (query,))
+        positions = []
+        for key, position in self._keys[start:]:
+            if not key.startswith(query):
+                break
+            positions.append(position)
+        return sorted(positions)
+
+    def substring(self, query):
+        """Positions of tags whose name contains query, in name order"""
+        if len(query) <= NGRAM:
+            return sorted(self._grams.get(query, ()))
+
+        candidates = None
+        for gram in _grams(query, NGRAM):
+            positions = self._grams.get(gram)
+            if not positions:
+                return []
+            candidates = positions if candidates is None else candidates & positions
+        return sorted(
+            p for p in candidates if query in self.tags[p]["name"].lower()
+        )
+
+    def search(self, query, limit):
+        """
+        Case-insensitive search: names starting with query first, then the
+        other names containing it, each in name order.
+        """
+        query = query.lower()
+        prefix = self.prefix(query)
+        seen = set(prefix)
+        positions = prefix + [p for p in self.substring(query) if p not in seen]
+        return [self.tags[p] for p in positions[:limit]]
+
+
+class TagCatalog:
+    """
+    Per-process copy of the tag catalog.
+
+    Loaded on first use, then reused until this process writes a tag
+    (invalidate) or another process bumps the "tags" cache version. The
+    version is checked at most once every check_interval seconds, so
+    between checks requests never touch the database.
+    """
+
+    def __init__(self, check_interval=5):
+        self.check_interval = check_interval
+        self._index = None
+        self._checked_at = 0
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    def _load(self, version):
+        rows = db.session.query(Tag.id, Tag.name).all()
+        self.loads += 1
+        return TagIndex([{"id": id, "name": name} for id, name in rows], version)
+
+    def get(self):
+        now = time.monotonic()
+        index = self._index
+        if index is not None and now - self._checked_at < self.check_interval:
+            return index
+
+        with self._lock:
+            index = self._index
+            if index is not None and now - self._checked_at < self.check_interval:
+                return index
+
+            version = cache_version(CATALOG)
+            if index is None or index.version != version:
+                index = self._load(version)
+                self._index = index
+            self._checked_at = now
+            return index
+
+    def invalidate(self):
+        with self._lock:
+            self._index = None
+
+    def stats(self):
+        index = self._index
+        return {
+            "loaded": index is not None,
+            "version": index.version if index else None,
+            "size": len(index.tags) if index else 0,
+            "loads": self.loads,
+        }
+
+
+tag_catalog = TagCatalog()
+
+
+class PopularTags:
+    """
+    The top k tags by user_count, kept in memory and refreshed from the
+    tags table every ttl seconds. The refresh reads k rows off the
+    user_count index, and a request only slices the list.
+    """
+
+    def __init__(self, k=50, ttl=30):
+        self.k = k
+        self.ttl = ttl
+        self._top = None
+        self._loaded_at = 0
+        self._lock = threading.Lock()
+
+    def _load(self):
+        rows = (
+            db.session.query(Tag.id, Tag.name, Tag.user_count)
+            .filter(Tag.user_count > 0)
+            .order_by(Tag.user_count.desc(), Tag.id)
+            .limit(self.k)
+            .all()
+        )
+        return [
+            {"id": id, "name": name, "user_count": user_count}
+            for id, name, user_count in rows
+        ]
+
+    def top(self, limit):
+        now = time.monotonic()
+        if self._top is None or now - self._loaded_at >= self.ttl:
+            with self._lock:
+                if self._top is None or now - self._loaded_at >= self.ttl:
+                    self._top = self._load()
+                    self._loaded_at = now
+        return self._top[:limit]
+
+    def invalidate(self):
+        with self._lock:
+            self._top = None
+
+
+top_tags = PopularTags()
+
+
+def bump_tag_catalog_version():
+    """
+    Call in the transaction that adds, renames or removes tags, then call
+    tag_catalog.invalidate() after the commit.
+    """
+    bump_cache_version(CATALOG)
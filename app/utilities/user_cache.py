@@ -0,0 +1,122 @@
+import threading
+import time
+from collections import OrderedDict
+from flask_login import UserMixin
+from app.models import db, User
+
+# Columns copied into a snapshot. Anything else on current_user loads the row.
+SNAPSHOT_FIELDS = (
+    "id",
+    "first_name",
+    "last_name",
+    "username",
+    "email",
+    "profile_image_url",
+)
+
+
+class CachedUser(UserMixin):
+    """
+    Detached stand-in for the logged in User, built from a cached snapshot.
+
+    The snapshot columns are plain attributes, so routes that only need
+    current_user.id never touch the database. Any other attribute (tags,
+    memberships, bio, ...) loads the full ORM row once per request and is
+    read from it.
+    """
+
+    def __init__(self, snapshot):
+        self.__dict__.update(snapshot)
+        self._row = None
+
+    def get_row(self):
+        """The full User row in the current session"""
+        if self._row is None:
+            self._row = db.session.get(User, self.id)
+        return self._row
+
+    def __getattr__(self, name):
+        # Only called for attributes missing from the snapshot
+        if name.startswith("_"):
+            raise AttributeError(name)
+        row = self.get_row()
+        if row is None:
+            raise AttributeError(name)
+        return getattr(row, name)
+
+    def __repr__(self):
+        return f"<CachedUser id: {self.id} username: {self.username}>"
+
+
+class UserCache:
+    """
+    Bounded per-process cache of user snapshots with a TTL and LRU eviction.
+
+    Each worker keeps its own copy, so writes must call invalidate() in the
+    worker that handled them; other workers pick the change up once their
+    entry expires.
+    """
+
+    def __init__(self, max_size=1024, ttl=60):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, user_id):
+        """A CachedUser for user_id, or None if the user doesn't exist"""
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return CachedUser(entry[1])
+            self.misses += 1
+
+        row = (
+            db.session.query(*[getattr(User, field) for field in SNAPSHOT_FIELDS])
+            .filter(User.id == user_id)
+            .first()
+        )
+        if row is None:
+            self.invalidate(user_id)
+            return None
+
+        snapshot = dict(zip(SNAPSHOT_FIELDS, row))
+        with self._lock:
+            self._entries[user_id] = (now + self.ttl, snapshot)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+        return CachedUser(snapshot)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxSize": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hitRatio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+user_cache = UserCache()
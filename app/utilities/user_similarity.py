@@ -0,0 +1,64 @@
+from app.models import db, UserSimilarity, UserTags
+from sqlalchemy import and_, func, or_, select
+
+
+def _shared_tag_pairs(user_id=None):
+    """
+    (user_id, similar_user_id, shared_tags) rows computed from user_tags.
+    Limited to pairs involving user_id when one is given.
+    """
+    mine = UserTags.alias("mine")
+    theirs = UserTags.alias("theirs")
+
+    query = select(
+        mine.c.user_id, theirs.c.user_id, func.count()
+    ).select_from(
+        mine.join(
+            theirs,
+            and_(
+                mine.c.tag_id == theirs.c.tag_id,
+                mine.c.user_id != theirs.c.user_id,
+            ),
+        )
+    )
+    if user_id is not None:
+        query = query.where(
+            or_(mine.c.user_id == user_id, theirs.c.user_id == user_id)
+        )
+
+    return query.group_by(mine.c.user_id, theirs.c.user_id)
+
+
+def refresh_user_similarity(user_id):
+    """
+    Recompute the similarity rows for one user after their tags change.
+
+    Only pairs that include this user are touched, so the cost depends on how
+    many users share their tags rather than on the size of the table. Call
+    after the user_tags changes are flushed; the caller commits.
+    """
+    db.session.execute(
+        UserSimilarity.delete().where(
+            or_(
+                UserSimilarity.c.user_id == user_id,
+                UserSimilarity.c.similar_user_id == user_id,
+            )
+        )
+    )
+    db.session.execute(
+        UserSimilarity.insert().from_select(
+            ["user_id", "similar_user_id", "shared_tags"],
+            _shared_tag_pairs(user_id),
+        )
+    )
+
+
+def rebuild_user_similarity():
+    """Rebuild the whole similarity table from user_tags. The caller commits."""
+    db.session.execute(UserSimilarity.delete())
+    db.session.execute(
+        UserSimilarity.insert().from_select(
+            ["user_id", "similar_user_id", "shared_tags"],
+            _shared_tag_pairs(),
+        )
+    )
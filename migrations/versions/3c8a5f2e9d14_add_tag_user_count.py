@@ -0,0 +1,34 @@
+"""Add denormalized user counter to tags
+
+Revision ID: 3c8a5f2e9d14
+Revises: 7b2d9e4c1f60
+Create Date: 2026-10-18 10:02:19.731845
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c8a5f2e9d14'
+down_revision = '7b2d9e4c1f60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('tags', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('user_count', sa.Integer(), server_default='0', nullable=False))
+        batch_op.create_index(batch_op.f('ix_tags_user_count'), ['user_count'], unique=False)
+
+    # Backfill from user_tags
+    op.execute(
+        "UPDATE tags SET "
+        "user_count = (SELECT COUNT(*) FROM user_tags WHERE user_tags.tag_id = tags.id)"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('tags', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_tags_user_count'))
+        batch_op.drop_column('user_count')
@@ -0,0 +1,26 @@
+"""Add composite posts index for keyset feed pagination
+
+Revision ID: 4b7e2a9c1d03
+Revises: 1d9930cfb000
+Create Date: 2026-10-17 20:40:12.518204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4b7e2a9c1d03'
+down_revision = '1d9930cfb000'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.create_index('ix_posts_created_at_id', ['created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('posts', schema=None) as batch_op:
+        batch_op.drop_index('ix_posts_created_at_id')
@@ -0,0 +1,51 @@
+"""Add precomputed user_similarity table
+
+Revision ID: 5e9d0b7a3f16
+Revises: 8c31f5d2e7a4
+Create Date: 2026-10-17 22:18:09.461375
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e9d0b7a3f16'
+down_revision = '8c31f5d2e7a4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('user_similarity',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('similar_user_id', sa.Integer(), nullable=False),
+    sa.Column('shared_tags', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['similar_user_id'], ['users.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'similar_user_id')
+    )
+    with op.batch_alter_table('user_similarity', schema=None) as batch_op:
+        batch_op.create_index('ix_user_similarity_similar_user_id', ['similar_user_id'], unique=False)
+
+    with op.batch_alter_table('user_tags', schema=None) as batch_op:
+        batch_op.create_index('ix_user_tags_tag_id', ['tag_id'], unique=False)
+
+    # Backfill every pair of users sharing at least one tag
+    op.execute(
+        "INSERT INTO user_similarity (user_id, similar_user_id, shared_tags) "
+        "SELECT mine.user_id, theirs.user_id, COUNT(*) "
+        "FROM user_tags AS mine JOIN user_tags AS theirs "
+        "ON mine.tag_id = theirs.tag_id AND mine.user_id != theirs.user_id "
+        "GROUP BY mine.user_id, theirs.user_id"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('user_tags', schema=None) as batch_op:
+        batch_op.drop_index('ix_user_tags_tag_id')
+
+    with op.batch_alter_table('user_similarity', schema=None) as batch_op:
+        batch_op.drop_index('ix_user_similarity_similar_user_id')
+
+    op.drop_table('user_similarity')
@@ -0,0 +1,40 @@
+"""Add geohash to venues for near searches
+
+Revision ID: 6f2c8b4d1e37
+Revises: 9e4f1a7c3b82
+Create Date: 2026-10-18 14:12:45.207316
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.utilities.geo import location_geohash
+
+
+# revision identifiers, used by Alembic.
+revision = '6f2c8b4d1e37'
+down_revision = '9e4f1a7c3b82'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('venues', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('geohash', sa.String(length=12), nullable=True))
+        batch_op.create_index(batch_op.f('ix_venues_geohash'), ['geohash'], unique=False)
+
+    # Backfill from the stored coordinates
+    bind = op.get_bind()
+    venues = bind.execute(sa.text("SELECT id, latitude, longitude FROM venues")).fetchall()
+    updates = [
+        {'id': venue_id, 'geohash': location_geohash(latitude, longitude)}
+        for venue_id, latitude, longitude in venues
+    ]
+    if updates:
+        bind.execute(sa.text("UPDATE venues SET geohash = :geohash WHERE id = :id"), updates)
+
+
+def downgrade():
+    with op.batch_alter_table('venues', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_venues_geohash'))
+        batch_op.drop_column('geohash')
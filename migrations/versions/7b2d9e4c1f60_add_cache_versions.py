@@ -0,0 +1,30 @@
+"""Add cache_versions table
+
+Revision ID: 7b2d9e4c1f60
+Revises: e4b18f6a2d75
+Create Date: 2026-10-18 09:14:37.502118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b2d9e4c1f60'
+down_revision = 'e4b18f6a2d75'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('cache_versions',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+    op.execute("INSERT INTO cache_versions (name, version) VALUES ('tags', 0)")
+
+
+def downgrade():
+    op.drop_table('cache_versions')
@@ -0,0 +1,82 @@
+"""Add full-text search indexes for groups
+
+Revision ID: 9e4f1a7c3b82
+Revises: 3c8a5f2e9d14
+Create Date: 2026-10-18 11:26:03.418902
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9e4f1a7c3b82'
+down_revision = '3c8a5f2e9d14'
+branch_labels = None
+depends_on = None
+
+# Same document as pg_search_document() in app/utilities/group_search.py
+SEARCH_DOCUMENT = (
+    "(setweight(to_tsvector('english'::regconfig, name), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, about), 'B'))"
+)
+
+
+def upgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        # Stored, so ranking reads the vector instead of re-parsing every match
+        op.execute(
+            "ALTER TABLE groups ADD COLUMN search_vector tsvector "
+            f"GENERATED ALWAYS AS {SEARCH_DOCUMENT} STORED"
+        )
+        op.execute("CREATE INDEX ix_groups_search ON groups USING gin (search_vector)")
+
+        # Trigram indexes for name substrings and the city filter, where available
+        trgm = bind.execute(
+            sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        ).first()
+        if trgm:
+            op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            op.execute("CREATE INDEX ix_groups_name_trgm ON groups USING gin (name gin_trgm_ops)")
+            op.execute("CREATE INDEX ix_groups_city_trgm ON groups USING gin (city gin_trgm_ops)")
+        return
+
+    # SQLite: an external content FTS5 table over groups, kept in sync by triggers
+    op.execute(
+        "CREATE VIRTUAL TABLE groups_fts USING fts5("
+        "name, about, content='groups', content_rowid='id', tokenize='porter unicode61')"
+    )
+    op.execute(
+        "CREATE TRIGGER groups_fts_insert AFTER INSERT ON groups BEGIN "
+        "INSERT INTO groups_fts (rowid, name, about) VALUES (new.id, new.name, new.about); "
+        "END"
+    )
+    op.execute(
+        "CREATE TRIGGER groups_fts_delete AFTER DELETE ON groups BEGIN "
+        "INSERT INTO groups_fts (groups_fts, rowid, name, about) "
+        "VALUES ('delete', old.id, old.name, old.about); "
+        "END"
+    )
+    op.execute(
+        "CREATE TRIGGER groups_fts_update AFTER UPDATE OF name, about ON groups BEGIN "
+        "INSERT INTO groups_fts (groups_fts, rowid, name, about) "
+        "VALUES ('delete', old.id, old.name, old.about); "
+        "INSERT INTO groups_fts (rowid, name, about) VALUES (new.id, new.name, new.about); "
+        "END"
+    )
+    op.execute("INSERT INTO groups_fts (groups_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_groups_city_trgm")
+        op.execute("DROP INDEX IF EXISTS ix_groups_name_trgm")
+        op.execute("DROP INDEX ix_groups_search")
+        op.execute("ALTER TABLE groups DROP COLUMN search_vector")
+        return
+
+    op.execute("DROP TRIGGER groups_fts_update")
+    op.execute("DROP TRIGGER groups_fts_delete")
+    op.execute("DROP TRIGGER groups_fts_insert")
+    op.execute("DROP TABLE groups_fts")
@@ -0,0 +1,48 @@
+"""Add comment_closure thread index
+
+Revision ID: a3f6c8e1b249
+Revises: 5e9d0b7a3f16
+Create Date: 2026-10-17 23:02:51.208377
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3f6c8e1b249'
+down_revision = '5e9d0b7a3f16'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('comment_closure',
+    sa.Column('ancestor_id', sa.Integer(), nullable=False),
+    sa.Column('descendant_id', sa.Integer(), nullable=False),
+    sa.Column('depth', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['ancestor_id'], ['comments.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['descendant_id'], ['comments.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('ancestor_id', 'descendant_id')
+    )
+    with op.batch_alter_table('comment_closure', schema=None) as batch_op:
+        batch_op.create_index('ix_comment_closure_descendant_depth', ['descendant_id', 'depth'], unique=False)
+
+    # Backfill every (ancestor, descendant) pair by walking down from each comment
+    op.execute(
+        "WITH RECURSIVE tree (ancestor_id, descendant_id, depth) AS ("
+        "SELECT id, id, 0 FROM comments "
+        "UNION ALL "
+        "SELECT tree.ancestor_id, comments.id, tree.depth + 1 "
+        "FROM tree JOIN comments ON comments.parent_id = tree.descendant_id"
+        ") "
+        "INSERT INTO comment_closure (ancestor_id, descendant_id, depth) "
+        "SELECT ancestor_id, descendant_id, depth FROM tree"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('comment_closure', schema=None) as batch_op:
+        batch_op.drop_index('ix_comment_closure_descendant_depth')
+
+    op.drop_table('comment_closure')
@@ -0,0 +1,32 @@
+"""Add denormalized like counter to comments
+
+Revision ID: c71e4d2a9b58
+Revises: a3f6c8e1b249
+Create Date: 2026-10-17 23:41:17.583920
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c71e4d2a9b58'
+down_revision = 'a3f6c8e1b249'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('like_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill from comment_likes
+    op.execute(
+        "UPDATE comments SET "
+        "like_count = (SELECT COUNT(*) FROM comment_likes WHERE comment_likes.comment_id = comments.id)"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('comments', schema=None) as batch_op:
+        batch_op.drop_column('like_count')
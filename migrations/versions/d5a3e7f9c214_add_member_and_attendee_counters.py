@@ -0,0 +1,43 @@
+"""Add denormalized member/attendee counters to groups and events
+
+Revision ID: d5a3e7f9c214
+Revises: 6f2c8b4d1e37
+Create Date: 2026-10-18 16:48:31.552907
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5a3e7f9c214'
+down_revision = '6f2c8b4d1e37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('groups', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('member_count', sa.Integer(), server_default='0', nullable=False))
+
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('attendee_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill from memberships / attendances
+    op.execute(
+        "UPDATE groups SET "
+        "member_count = (SELECT COUNT(*) FROM memberships WHERE memberships.group_id = groups.id)"
+    )
+    op.execute(
+        "UPDATE events SET "
+        "attendee_count = (SELECT COUNT(*) FROM attendances WHERE attendances.event_id = events.id)"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('events', schema=None) as batch_op:
+        batch_op.drop_column('attendee_count')
+
+    # Drop in place: copying groups on SQLite would lose the groups_fts triggers
+    with op.batch_alter_table('groups', schema=None, recreate='never') as batch_op:
+        batch_op.drop_column('member_count')
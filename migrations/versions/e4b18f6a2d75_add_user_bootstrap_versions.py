@@ -0,0 +1,30 @@
+"""Add session bootstrap section versions to users
+
+Revision ID: e4b18f6a2d75
+Revises: c71e4d2a9b58
+Create Date: 2026-10-18 01:12:44.209317
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4b18f6a2d75'
+down_revision = 'c71e4d2a9b58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('profile_version', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('groups_version', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('events_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('events_version')
+        batch_op.drop_column('groups_version')
+        batch_op.drop_column('profile_version')
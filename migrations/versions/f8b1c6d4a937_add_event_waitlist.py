@@ -0,0 +1,55 @@
+"""Add event waitlist and one attendance per user and event
+
+Revision ID: f8b1c6d4a937
+Revises: d5a3e7f9c214
+Create Date: 2026-10-18 18:20:07.864193
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f8b1c6d4a937'
+down_revision = 'd5a3e7f9c214'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('event_waitlist',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('event_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['event_id'], ['events.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('event_id', 'user_id', name='uq_event_waitlist_event_user')
+    )
+    with op.batch_alter_table('event_waitlist', schema=None) as batch_op:
+        batch_op.create_index('ix_event_waitlist_event_id_id', ['event_id', 'id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_event_waitlist_user_id'), ['user_id'], unique=False)
+
+    # Keep the first of any duplicate attendances, then recount
+    op.execute(
+        "DELETE FROM attendances WHERE id NOT IN "
+        "(SELECT MIN(id) FROM attendances GROUP BY event_id, user_id)"
+    )
+    op.execute(
+        "UPDATE events SET "
+        "attendee_count = (SELECT COUNT(*) FROM attendances WHERE attendances.event_id = events.id)"
+    )
+    with op.batch_alter_table('attendances', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_attendances_event_user', ['event_id', 'user_id'])
+
+
+def downgrade():
+    with op.batch_alter_table('attendances', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_attendances_event_user', type_='unique')
+
+    with op.batch_alter_table('event_waitlist', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_event_waitlist_user_id'))
+        batch_op.drop_index('ix_event_waitlist_event_id_id')
+
+    op.drop_table('event_waitlist')
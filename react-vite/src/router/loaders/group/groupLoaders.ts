@@ -59,6 +59,39 @@ export const groupsLoader = async ({ request }: LoaderFunctionArgs) => {
 	}
 };
 
+// The group detail only embeds the first few items of each section, so
+// page through the section routes for the full lists
+const fetchSection = async (
+	groupId: string,
+	section: "members" | "events" | "images",
+	timestamp: number,
+) => {
+	const items: unknown[] = [];
+	for (let page = 1; ; page++) {
+		const response = await fetch(
+			`/api/groups/${groupId}/${section}?page=${page}&per_page=50&_t=${timestamp}`,
+			{
+				credentials: "include",
+				headers: {
+					"Cache-Control": "no-cache, no-store, must-revalidate",
+					Pragma: "no-cache",
+					Expires: "0",
+				},
+			},
+		);
+
+		if (!response.ok) {
+			throw new Error(`Failed to fetch group ${section}: ${response.status}`);
+		}
+
+		const data = await response.json();
+		items.push(...data[section]);
+		if (!data.pagination.has_next) {
+			return items;
+		}
+	}
+};
+
 // Group details loader with better error handling
 export const groupDetailsLoader = async ({ params }: LoaderFunctionArgs) => {
 	const { groupId } = params;
@@ -70,14 +103,17 @@ export const groupDetailsLoader = async ({ params }: LoaderFunctionArgs) => {
 	try {
 		// Add cache busting for fresh data
 		const timestamp = Date.now();
-		const response = await fetch(`/api/groups/${groupId}?_t=${timestamp}`, {
-			credentials: "include",
-			headers: {
-				"Cache-Control": "no-cache, no-store, must-revalidate",
-				Pragma: "no-cache",
-				Expires: "0",
+		const response = await fetch(
+			`/api/groups/${groupId}?include=&_t=${timestamp}`,
+			{
+				credentials: "include",
+				headers: {
+					"Cache-Control": "no-cache, no-store, must-revalidate",
+					Pragma: "no-cache",
+					Expires: "0",
+				},
 			},
-		});
+		);
 
 		if (!response.ok) {
 			if (response.status === 404) {
@@ -86,7 +122,13 @@ export const groupDetailsLoader = async ({ params }: LoaderFunctionArgs) => {
 			throw new Error(`Failed to fetch group: ${response.status}`);
 		}
 
-		const group = (await response.json()) as GroupData;
+		const header = await response.json();
+		const [members, events, groupImage] = await Promise.all([
+			fetchSection(groupId, "members", timestamp),
+			fetchSection(groupId, "events", timestamp),
+			fetchSection(groupId, "images", timestamp),
+		]);
+		const group = { ...header, members, events, groupImage } as GroupData;
 
 		// Ensure members array exists and is properly formatted
 		if (!group.members) {
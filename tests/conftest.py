@@ -0,0 +1,66 @@
+import os
+import random
+import tempfile
+from contextlib import contextmanager
+
+# Config reads the environment when app is imported, so set it up first.
+# TEST_DATABASE_URL runs the suite against an empty scratch database
+# (e.g. Postgres) instead of a temporary SQLite file.
+_db_dir = tempfile.mkdtemp(prefix="mencrytoo-tests-")
+os.environ["DATABASE_URL"] = os.environ.get(
+    "TEST_DATABASE_URL", f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+)
+os.environ.setdefault("SECRET_KEY", "test")
+os.environ["PASSWORD_HASH_WORKERS"] = "0"
+
+import pytest
+from sqlalchemy import event
+
+from app import app as flask_app
+from app.models import db
+
+
+@pytest.fixture(scope="session")
+def app():
+    """The app on a freshly created and seeded SQLite database"""
+    flask_app.config.update(TESTING=True, WTF_CSRF_ENABLED=False)
+    with flask_app.app_context():
+        db.engine.echo = False
+        db.create_all()
+    # The seed data samples memberships and likes at random; fix the draw
+    # so every run tests against the same database
+    random.seed(1)
+    result = flask_app.test_cli_runner().invoke(args=["seed", "all"])
+    assert result.exit_code == 0, result.output
+    return flask_app
+
+
+@pytest.fixture
+def login(app):
+    """Returns a test client logged in as the given user id"""
+
+    def make_client(user_id=1):
+        client = app.test_client()
+        with client.session_transaction() as session:
+            session["_user_id"] = str(user_id)
+            session["_fresh"] = True
+        return client
+
+    return make_client
+
+
+@contextmanager
+def count_queries(app):
+    """Counts the SQL statements run inside the block: `with ... as queries`"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
@@ -0,0 +1,139 @@
+from app.models import db, Post, Comment, Tag, User, Group, Event, Membership
+from app.counters.posts import repair_post_counters
+from app.counters.groups import repair_group_counters, repair_event_counters
+from app.counters.comments import repair_comment_counters
+from app.counters.tags import repair_tag_counters
+
+
+def test_comment_keeps_post_updated_at(app, login):
+    with app.app_context():
+        post = db.session.get(Post, 1)
+        updated_at, comments = post.updated_at, post.comment_count
+
+    response = login(2).post(
+        "/api/comments/posts/1/comments", data={"comment": "Counting on you"}
+    )
+    assert response.status_code in (200, 201)
+
+    with app.app_context():
+        post = db.session.get(Post, 1)
+        assert post.comment_count == comments + 1
+        assert post.updated_at == updated_at
+
+
+def test_post_repair_rewrites_only_drifted_posts(app):
+    with app.app_context():
+        post = db.session.get(Post, 2)
+        likes, updated_at = post.like_count, post.updated_at
+        db.session.query(Post).filter(Post.id == 2).update(
+            {Post.like_count: likes + 7, Post.updated_at: Post.updated_at},
+            synchronize_session=False,
+        )
+        db.session.commit()
+
+        checked, repaired = repair_post_counters(batch_size=7)
+        assert checked == db.session.query(Post).count()
+        assert repaired == 1
+
+        db.session.expire_all()
+        post = db.session.get(Post, 2)
+        assert post.like_count == likes
+        assert post.updated_at == updated_at
+        assert repair_post_counters()[1] == 0
+
+
+def test_comment_repair_rewrites_only_drifted_comments(app):
+    with app.app_context():
+        comment = db.session.query(Comment).order_by(Comment.id).first()
+        likes, updated_at = comment.like_count, comment.updated_at
+        db.session.query(Comment).filter(Comment.id == comment.id).update(
+            {Comment.like_count: likes + 3, Comment.updated_at: Comment.updated_at},
+            synchronize_session=False,
+        )
+        db.session.commit()
+
+        checked, repaired = repair_comment_counters(batch_size=50)
+        assert checked == db.session.query(Comment).count()
+        assert repaired == 1
+
+        db.session.expire_all()
+        comment = db.session.get(Comment, comment.id)
+        assert comment.like_count == likes
+        assert comment.updated_at == updated_at
+
+
+def test_tag_repair_rewrites_only_drifted_tags(app):
+    with app.app_context():
+        tag = db.session.query(Tag).order_by(Tag.id).first()
+        users = tag.user_count
+        db.session.query(Tag).filter(Tag.id == tag.id).update(
+            {Tag.user_count: users + 5}, synchronize_session=False
+        )
+        db.session.commit()
+
+        checked, repaired = repair_tag_counters(batch_size=10)
+        assert checked == db.session.query(Tag).count()
+        assert repaired == 1
+
+        db.session.expire_all()
+        assert db.session.get(Tag, tag.id).user_count == users
+
+
+def test_join_keeps_group_updated_at(app, login):
+    with app.app_context():
+        group = db.session.query(Group).order_by(Group.id).first()
+        members = {
+            user_id
+            for (user_id,) in db.session.query(Membership.user_id).filter(
+                Membership.group_id == group.id
+            )
+        }
+        outsider = (
+            db.session.query(User.id)
+            .filter(User.id.notin_(members | {group.organizer_id}))
+            .order_by(User.id)
+            .first()[0]
+        )
+        group_id, count, updated_at = group.id, group.member_count, group.updated_at
+
+    response = login(outsider).post(f"/api/groups/{group_id}/join-group")
+    assert response.status_code == 200
+
+    with app.app_context():
+        group = db.session.get(Group, group_id)
+        assert group.member_count == count + 1
+        assert group.updated_at == updated_at
+
+
+def test_group_repair_rewrites_only_drifted_groups(app):
+    with app.app_context():
+        group = db.session.query(Group).order_by(Group.id.desc()).first()
+        members, updated_at = group.member_count, group.updated_at
+        Group.adjust_member_counts([group.id], 4)
+        db.session.commit()
+
+        checked, repaired = repair_group_counters(batch_size=3)
+        assert checked == db.session.query(Group).count()
+        assert repaired == 1
+
+        db.session.expire_all()
+        group = db.session.get(Group, group.id)
+        assert group.member_count == members
+        assert group.updated_at == updated_at
+
+
+def test_event_repair_rewrites_only_drifted_events(app):
+    with app.app_context():
+        event = db.session.query(Event).order_by(Event.id.desc()).first()
+        attendees, updated_at = event.attendee_count, event.updated_at
+        Event.adjust_attendee_counts([event.id], -1)
+        db.session.commit()
+
+        checked, repaired = repair_event_counters(batch_size=3)
+        assert checked == db.session.query(Event).count()
+        assert repaired == 1
+
+        db.session.expire_all()
+        event = db.session.get(Event, event.id)
+        assert event.attendee_count == attendees
+        assert event.updated_at == updated_at
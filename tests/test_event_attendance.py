@@ -0,0 +1,41 @@
+from app.models import db, User, Event, EventWaitlist
+from app.utilities import event_attendance as attendance
+
+
+def test_attending_keeps_event_updated_at(app):
+    with app.app_context():
+        event = (
+            db.session.query(Event)
+            .filter(
+                Event.attendee_count < Event.capacity,
+                ~Event.id.in_(db.session.query(EventWaitlist.event_id)),
+            )
+            .order_by(Event.id)
+            .first()
+        )
+        user = User(
+            first_name="Seat",
+            last_name="Taker",
+            username="seat_taker",
+            email="seat_taker@attendance.test",
+            password="OAUTH",
+            profile_image_url="",
+        )
+        db.session.add(user)
+        db.session.commit()
+        user_id = user.id
+        event_id, count, updated_at = event.id, event.attendee_count, event.updated_at
+
+        assert attendance.attend(event_id, user_id) == (attendance.ATTENDING, None)
+        db.session.commit()
+        # A repeat claims a seat and hands it back
+        assert attendance.attend(event_id, user_id) == (
+            attendance.ALREADY_ATTENDING,
+            None,
+        )
+        db.session.commit()
+
+        db.session.expire_all()
+        event = db.session.get(Event, event_id)
+        assert event.attendee_count == count + 1
+        assert event.updated_at == updated_at
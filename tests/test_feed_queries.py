@@ -0,0 +1,38 @@
+import pytest
+
+from conftest import count_queries
+
+PAGE_SIZES = (5, 20, 50)
+
+
+@pytest.mark.parametrize("feed", ["/api/posts/feed/all", "/api/posts/feed/similar"])
+def test_feed_query_count_is_constant(app, login, feed):
+    client = login(1)
+    # The first request loads the user snapshot; count the ones after it
+    assert client.get(f"{feed}?per_page=1").status_code == 200
+
+    counts = {}
+    for per_page in PAGE_SIZES:
+        with count_queries(app) as statements:
+            response = client.get(f"{feed}?per_page={per_page}")
+        assert response.status_code == 200
+        counts[per_page] = len(statements)
+
+    assert len(set(counts.values())) == 1, counts
+
+
+def test_feed_query_count_with_full_pages(app, login):
+    """The seeded feed has more than 20 posts, so the pages differ in size"""
+    client = login(1)
+    client.get("/api/posts/feed/all?per_page=1")
+
+    sizes = {}
+    counts = {}
+    for per_page in PAGE_SIZES:
+        with count_queries(app) as statements:
+            response = client.get(f"/api/posts/feed/all?per_page={per_page}")
+        sizes[per_page] = len(response.get_json()["posts"])
+        counts[per_page] = len(statements)
+
+    assert sizes[5] < sizes[20]
+    assert len(set(counts.values())) == 1, counts
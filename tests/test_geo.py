@@ -0,0 +1,27 @@
+from app.models import Venue
+from app.utilities.geo import haversine, prefix_range
+
+
+def test_prefix_range_carries_into_the_next_cell():
+    assert prefix_range("9q8") == ("9q8", "9q9")
+    assert prefix_range("9qz") == ("9qz", "9r")
+    assert prefix_range("9zz") == ("9zz", "b")
+    assert prefix_range("zzz") == ("zzz", None)
+
+
+def test_within_matches_a_full_scan(app):
+    with app.app_context():
+        venues = Venue.query.all()
+        origin = venues[0]
+        radius = 50
+        expected = {
+            venue.id
+            for venue in venues
+            if haversine(origin.latitude, origin.longitude, venue.latitude, venue.longitude)
+            <= radius
+        }
+
+        hits = Venue.within(origin.latitude, origin.longitude, radius)
+
+    assert {venue_id for venue_id, _, _ in hits} == expected
+    assert len(expected) > 1
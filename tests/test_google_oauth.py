@@ -0,0 +1,203 @@
+import datetime
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from google.auth import crypt, jwt
+
+from app.models import User
+from app.utilities import google_oauth
+
+CLIENT_ID = "test-client.apps.googleusercontent.com"
+ISSUER = "https://issuer.test"
+
+
+def _key_pair():
+    """A signing key and the PEM certificate Google would publish for it"""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "issuer.test")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    private_pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    return private_pem, cert.public_bytes(serialization.Encoding.PEM).decode()
+
+
+class FakeIssuer:
+    """
+    A local stand-in for Google's token endpoint and certs URL. The token
+    endpoint answers every code with an ID token for self.claims, signed
+    by the current key.
+    """
+
+    def __init__(self):
+        self.certs_fetches = 0
+        self.claims = {}
+        self.rotate()
+
+        issuer = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _send(self, body, headers=()):
+                payload = json.dumps(body).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                issuer.certs_fetches += 1
+                self._send(
+                    {issuer.key_id: issuer.cert},
+                    [("Cache-Control", "public, max-age=3600")],
+                )
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                self._send(
+                    {
+                        "access_token": "access",
+                        "token_type": "Bearer",
+                        "expires_in": 3600,
+                        "id_token": issuer.id_token(),
+                    }
+                )
+
+            def log_message(self, *args):
+                pass
+
+        self.server = HTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def rotate(self):
+        """Sign with a new key under a new kid, as Google does on rotation"""
+        self.private_pem, self.cert = _key_pair()
+        self.key_id = f"key-{time.monotonic_ns()}"
+
+    def id_token(self):
+        now = int(time.time())
+        payload = {
+            "iss": ISSUER,
+            "aud": CLIENT_ID,
+            "iat": now,
+            "exp": now + 3600,
+            **self.claims,
+        }
+        signer = crypt.RSASigner.from_string(self.private_pem, self.key_id)
+        return jwt.encode(signer, payload, key_id=self.key_id).decode()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def issuer(app, monkeypatch, tmp_path):
+    fake = FakeIssuer()
+    # oauthlib refuses plain http for the callback URL and token endpoint
+    monkeypatch.setenv("OAUTHLIB_INSECURE_TRANSPORT", "1")
+    for key, value in {
+        "GOOGLE_OAUTH_CLIENT_ID": CLIENT_ID,
+        "GOOGLE_OAUTH_CLIENT_SECRET": "secret",
+        "GOOGLE_OAUTH_REDIRECT_URI": "http://localhost/api/auth/oauth/callback",
+        "GOOGLE_TOKEN_URI": f"{fake.url}/token",
+        "GOOGLE_CERTS_URL": f"{fake.url}/certs",
+        "GOOGLE_CERTS_CACHE": str(tmp_path / "google-certs.json"),
+        "GOOGLE_ISSUERS": (ISSUER,),
+    }.items():
+        monkeypatch.setitem(app.config, key, value)
+    monkeypatch.setattr(
+        google_oauth, "certificate_cache", google_oauth.CertificateCache()
+    )
+    yield fake
+    fake.close()
+
+
+def _callback(app, state="state", returned_state="state"):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["oauth_state"] = state
+    response = client.get(
+        f"/api/auth/oauth/callback?state={returned_state}&code=code"
+    )
+    return client, response
+
+
+def _claims(email, verified=True):
+    return {
+        "sub": email,
+        "email": email,
+        "email_verified": verified,
+        "given_name": "Oauth",
+        "family_name": "Tester",
+    }
+
+
+def test_state_mismatch_is_rejected(app, issuer):
+    issuer.claims = _claims("mismatch@oauth.test")
+    _, response = _callback(app, returned_state="forged")
+
+    assert response.status_code == 401
+    assert issuer.certs_fetches == 0
+
+
+def test_unverified_email_is_rejected(app, issuer):
+    issuer.claims = _claims("unverified@oauth.test", verified=False)
+    _, response = _callback(app)
+
+    assert response.status_code == 401
+    with app.app_context():
+        assert User.query.filter(User.email == "unverified@oauth.test").first() is None
+
+
+def test_first_visit_creates_an_oauth_user(app, issuer):
+    issuer.claims = _claims("first@oauth.test")
+    client, response = _callback(app)
+
+    assert response.status_code == 302
+    with app.app_context():
+        user = User.query.filter(User.email == "first@oauth.test").one()
+        assert user.hashed_password == "OAUTH"
+        assert user.username == "first"
+    with client.session_transaction() as session:
+        assert session["_user_id"] == str(user.id)
+
+
+def test_second_callback_reuses_cached_certs(app, issuer):
+    issuer.claims = _claims("cached@oauth.test")
+
+    assert _callback(app)[1].status_code == 302
+    assert _callback(app)[1].status_code == 302
+    assert issuer.certs_fetches == 1
+
+
+def test_unknown_key_id_refetches_certs_once(app, issuer):
+    issuer.claims = _claims("rotated@oauth.test")
+    assert _callback(app)[1].status_code == 302
+
+    issuer.rotate()
+    assert _callback(app)[1].status_code == 302
+    assert issuer.certs_fetches == 2
@@ -0,0 +1,53 @@
+from sqlalchemy import and_
+from app.models import db, Group, Membership
+
+
+def _group_without_organizer_membership(app):
+    """A group with members whose organizer has no membership row"""
+    with app.app_context():
+        return (
+            db.session.query(Group.id)
+            .outerjoin(
+                Membership,
+                and_(
+                    Membership.group_id == Group.id,
+                    Membership.user_id == Group.organizer_id,
+                ),
+            )
+            .filter(Membership.id.is_(None), Group.member_count >= 3)
+            .order_by(Group.id)
+            .first()[0]
+        )
+
+
+def test_member_pages_add_up_to_the_total(app):
+    group_id = _group_without_organizer_membership(app)
+    client = app.test_client()
+    per_page = 2
+    members = []
+    page = 1
+    while True:
+        body = client.get(
+            f"/api/groups/{group_id}/members?page={page}&per_page={per_page}"
+        ).get_json()
+        assert len(body["members"]) <= per_page
+        members.extend(body["members"])
+        if not body["pagination"]["has_next"]:
+            break
+        page += 1
+
+    assert len(members) == body["pagination"]["total"]
+    assert len({member["id"] for member in members}) == len(members)
+    assert page == body["pagination"]["pages"] > 1
+
+
+def test_detail_preview_respects_the_limit(app):
+    group_id = _group_without_organizer_membership(app)
+    body = (
+        app.test_client()
+        .get(f"/api/groups/{group_id}?include=members&limit=2")
+        .get_json()
+    )
+
+    assert len(body["members"]) == 2
+    assert body["organizer"]["id"] == body["organizerId"]
@@ -0,0 +1,43 @@
+import threading
+
+from sqlalchemy import func
+
+from app.models import db, Post, Likes
+
+POST_ID = 3
+USERS = range(1, 9)
+THREADS_PER_USER = 2
+TOGGLES = 15
+
+
+def test_concurrent_toggles_keep_like_count_in_step(app, login):
+    clients = [login(user_id) for user_id in USERS for _ in range(THREADS_PER_USER)]
+    statuses = []
+    lock = threading.Lock()
+    start = threading.Barrier(len(clients))
+
+    def toggle(client):
+        start.wait()
+        for _ in range(TOGGLES):
+            response = client.post(f"/api/posts/{POST_ID}/like")
+            with lock:
+                statuses.append(response.status_code)
+
+    threads = [threading.Thread(target=toggle, args=(client,)) for client in clients]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert statuses == [200] * len(clients) * TOGGLES
+
+    with app.app_context():
+        like_count = db.session.get(Post, POST_ID).like_count
+        rows = (
+            db.session.query(func.count())
+            .select_from(Likes)
+            .filter(Likes.c.post_id == POST_ID)
+            .scalar()
+        )
+    assert like_count == rows
+    assert like_count >= 0
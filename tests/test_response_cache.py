@@ -0,0 +1,27 @@
+from app.utilities.response_cache import view_key
+from app.api.group_routes import GROUP_LIST_PARAMS
+
+
+def test_cache_busters_do_not_change_the_key(app):
+    with app.test_request_context("/api/groups?per_page=20&page=1&_t=1"):
+        first = view_key({}, GROUP_LIST_PARAMS)
+    with app.test_request_context("/api/groups?page=1&_t=2&per_page=20"):
+        second = view_key({}, GROUP_LIST_PARAMS)
+    with app.test_request_context("/api/groups?page=2&per_page=20&_t=2"):
+        other_page = view_key({}, GROUP_LIST_PARAMS)
+
+    assert first == second
+    assert first != other_page
+
+
+def test_list_with_cache_buster_is_served_from_cache(app):
+    client = app.test_client()
+    url = "/api/groups?page=1&per_page=20&search=support"
+
+    first = client.get(f"{url}&_t=1")
+    second = client.get(f"{url}&_t=2")
+
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.get_json() == first.get_json()
+    assert client.get(f"{url}&type=online&_t=3").headers["X-Cache"] == "MISS"
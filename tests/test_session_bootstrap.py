@@ -0,0 +1,36 @@
+from app.models import db, User, Group, Membership
+
+
+def _outsider_and_group():
+    """A group and a user who neither organizes nor belongs to it"""
+    for group in db.session.query(Group).order_by(Group.id):
+        members = {
+            user_id
+            for (user_id,) in db.session.query(Membership.user_id).filter(
+                Membership.group_id == group.id
+            )
+        } | {group.organizer_id}
+        outsider = (
+            db.session.query(User.id).filter(User.id.notin_(members)).first()
+        )
+        if outsider and len(members) > 1:
+            return outsider[0], group.id, members
+    raise AssertionError("Seed data has no group with an outsider")
+
+
+def test_version_bumps_keep_users_updated_at(app, login):
+    with app.app_context():
+        user_id, group_id, members = _outsider_and_group()
+        before = {
+            user.id: (user.updated_at, user.groups_version)
+            for user in db.session.query(User).filter(User.id.in_(members))
+        }
+
+    response = login(user_id).post(f"/api/groups/{group_id}/join-group", json={})
+    assert response.status_code == 200, response.get_json()
+
+    with app.app_context():
+        for user in db.session.query(User).filter(User.id.in_(members)):
+            updated_at, groups_version = before[user.id]
+            assert user.groups_version > groups_version
+            assert user.updated_at == updated_at
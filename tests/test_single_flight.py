@@ -0,0 +1,44 @@
+import threading
+import time
+
+from sqlalchemy import event
+
+from app.models import db
+from app.utilities.single_flight import single_flight
+
+THREADS = 8
+
+
+def test_cache_busted_detail_requests_share_one_run(app):
+    with app.app_context():
+        engine = db.engine
+
+    # Slow every statement down so the requests overlap
+    def slow(*args):
+        time.sleep(0.02)
+
+    before = single_flight.stats()
+    bodies = []
+    start = threading.Barrier(THREADS)
+
+    def fetch(number):
+        client = app.test_client()
+        start.wait()
+        response = client.get(f"/api/groups/1?_t={number}")
+        bodies.append((response.status_code, response.get_data()))
+
+    threads = [threading.Thread(target=fetch, args=(n,)) for n in range(THREADS)]
+    event.listen(engine, "before_cursor_execute", slow)
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        event.remove(engine, "before_cursor_execute", slow)
+
+    after = single_flight.stats()
+    assert {status for status, _ in bodies} == {200}
+    assert len({body for _, body in bodies}) == 1
+    assert after["shared"] > before["shared"]
+    assert after["leaders"] - before["leaders"] < THREADS
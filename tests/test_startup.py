@@ -0,0 +1,18 @@
+import os
+
+from app.benchmarks.startup import profile_startup
+from app.utilities.lazy_imports import DEFERRED_MODULES
+
+# Generous for a cold CI runner; `import app` takes 500-700 ms locally
+BUDGET_MS = float(os.environ.get("STARTUP_BUDGET_MS", 2500))
+
+
+def test_startup_within_budget():
+    timings = profile_startup(lazy=True)
+
+    import_ms = timings["import"] * 1000
+    assert import_ms <= BUDGET_MS, f"import app took {import_ms:.0f} ms"
+
+    # Deferred modules must stay out of a web worker's import
+    loaded = [name for name in DEFERRED_MODULES if name in timings["modules"]]
+    assert loaded == []